@@ -18,6 +18,9 @@ from src.scraper_basico import ScraperBasico
 from src.procesador_datos import ProcesadorDatos
 from src.analizador_tendencias import AnalizadorTendencias
 from src.dashboard_simple import DashboardSimple
+from src.pipeline_multicategoria import PipelineMulticategoria
+from src.demonio_clario import DemonioClario
+from src.lago_datos import LagoDatos
 
 def mostrar_bienvenida():
     """
@@ -62,11 +65,14 @@ def ejecutar_sistema_completo():
         scraper.mostrar_info()
         print()
         
-        # Simular recolección de datos
+        # Simular recolección de datos (lo crudo queda guardado en el lago de datos)
         datos_recolectados = []
-        for fuente in scraper.fuentes_disponibles:
-            datos = scraper.simular_recoleccion(fuente)
-            datos_recolectados.append(datos)
+        with LagoDatos() as lago:
+            for fuente in scraper.fuentes_disponibles:
+                datos = scraper.simular_recoleccion(fuente)
+                datos_recolectados.append(datos)
+                lago.agregar(fuente, datos)
+        print(f"🏞️ {len(datos_recolectados)} recolecciones guardadas en {lago.directorio}")
         print()
         
         # PASO 2: Procesamiento de datos
@@ -101,6 +107,28 @@ def ejecutar_sistema_completo():
         print(f"❌ Error en el sistema: {e}")
         return False
 
+def ejecutar_sistema_multicategoria():
+    """
+    Función que ejecuta CLARIO para todas las categorías en una sola pasada.
+    """
+    print("🔄 Iniciando sistema CLARIO multicategoría...")
+    print()
+    
+    try:
+        pipeline = PipelineMulticategoria()
+        datos = pipeline.procesador.crear_datos_ejemplo_multicategoria()
+        resultados = pipeline.ejecutar(datos)
+        print()
+        
+        print(f"🎯 ¡CLARIO COMPLETADO PARA {len(resultados)} CATEGORÍAS!")
+        print("📁 Revisa las subcarpetas de 'data' para ver los archivos de cada categoría")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en el sistema: {e}")
+        return False
+
 def main():
     """
     Función principal que ejecuta todo el programa.
@@ -121,8 +149,16 @@ def main():
         print("🎯 CLARIO está listo para funcionar!")
         print()
         
-        # Ejecutar el sistema completo
-        exito = ejecutar_sistema_completo()
+        # Ejecutar el sistema completo (o todas las categorías con --multicategoria,
+        # o de forma continua con --demonio; el dashboard en vivo se abre aparte con
+        # "python -m streamlit run src/dashboard_en_vivo.py")
+        if '--demonio' in sys.argv:
+            DemonioClario(lago=LagoDatos()).ejecutar()
+            return
+        elif '--multicategoria' in sys.argv:
+            exito = ejecutar_sistema_multicategoria()
+        else:
+            exito = ejecutar_sistema_completo()
         
         if exito:
             print()
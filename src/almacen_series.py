@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Almacén de Series de Tiempo
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para guardar el historial de cada tendencia en archivos mapeados en memoria
+"""
+
+# Importar módulos necesarios
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Cada entrada del índice: dónde empieza la serie, cuántos días tiene y su primer día
+TIPO_INDICE = np.dtype([('desplazamiento', '<i8'), ('largo', '<i8'), ('dia_inicio', '<i8')])
+UN_DIA = np.timedelta64(1, 'D')
+
+
+def _a_dia(fecha):
+    """
+    Convierte una fecha en número de días desde 1970-01-01.
+    """
+    return int(np.datetime64(pd.Timestamp(fecha).normalize(), 'D').astype(np.int64))
+
+
+class EscritorAlmacen:
+    """
+    Clase que escribe series de tiempo en un almacén, una tendencia a la vez.
+
+    Los valores se agregan al final del archivo, así nunca hace falta
+    tener todo el historial en memoria para construir el almacén.
+    """
+
+    def __init__(self, directorio):
+        """
+        Constructor de la clase EscritorAlmacen.
+        """
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self._valores = open(os.path.join(directorio, 'valores.f32'), 'wb')
+        self._entradas = {}
+        self._nombres = {}
+        self._desplazamiento = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    def agregar_serie(self, id_tendencia, nombre, fecha_inicio, valores):
+        """
+        Función que agrega la serie diaria completa de una tendencia.
+
+        valores es un arreglo con un dato por día (NaN donde no hay dato).
+        """
+        valores = np.ascontiguousarray(valores, dtype=np.float32)
+        self._valores.write(valores.tobytes())
+        self._entradas[int(id_tendencia)] = (self._desplazamiento, len(valores), _a_dia(fecha_inicio))
+        self._nombres[int(id_tendencia)] = str(nombre)
+        self._desplazamiento += len(valores)
+
+    def cerrar(self):
+        """
+        Función que termina de escribir el archivo de valores y guarda el índice.
+        """
+        self._valores.close()
+        indice = np.zeros(max(self._entradas, default=-1) + 1, dtype=TIPO_INDICE)
+        for id_tendencia, entrada in self._entradas.items():
+            indice[id_tendencia] = entrada
+        np.save(os.path.join(self.directorio, 'indice.npy'), indice)
+        with open(os.path.join(self.directorio, 'nombres.json'), 'w', encoding='utf-8') as f:
+            json.dump(self._nombres, f, ensure_ascii=False)
+
+
+class AlmacenSeries:
+    """
+    Clase que lee series de tiempo de tendencias sin cargarlas en memoria.
+
+    ¿Qué es un archivo "mapeado en memoria"? Es un archivo que el sistema
+    operativo muestra como si fuera un arreglo en memoria: solo se lee
+    del disco la parte que se usa. Por eso abrir un historial de 50 GB
+    es instantáneo.
+
+    Los valores de cada tendencia están juntos (float32, un dato por
+    día) y un índice por ID de tendencia dice dónde empiezan. Pedir la
+    serie de una tendencia es una cuenta y un "recorte" del arreglo,
+    sin copiar datos.
+    """
+
+    def __init__(self, directorio):
+        """
+        Constructor de la clase AlmacenSeries (abre un almacén existente).
+        """
+        self.directorio = directorio
+        self.indice = np.load(os.path.join(directorio, 'indice.npy'), mmap_mode='r')
+        ruta_valores = os.path.join(directorio, 'valores.f32')
+        if os.path.getsize(ruta_valores):
+            self.valores = np.memmap(ruta_valores, dtype=np.float32, mode='r')
+        else:
+            self.valores = np.zeros(0, dtype=np.float32)
+        with open(os.path.join(directorio, 'nombres.json'), encoding='utf-8') as f:
+            self.nombres = {int(id_tendencia): nombre for id_tendencia, nombre in json.load(f).items()}
+        self.ids_por_nombre = {nombre: id_tendencia for id_tendencia, nombre in self.nombres.items()}
+
+    @classmethod
+    def construir(cls, directorio, datos):
+        """
+        Función que crea un almacén a partir de un DataFrame limpio
+        (columnas 'fecha', 'tendencia', 'popularidad' y opcionalmente 'tendencia_id').
+        """
+        clave = 'tendencia_id' if 'tendencia_id' in datos.columns else 'tendencia'
+        diarios = (datos.assign(fecha=pd.to_datetime(datos['fecha']).dt.normalize())
+                   .groupby([clave, 'fecha'], observed=True)
+                   .agg(tendencia=('tendencia', 'first'), popularidad=('popularidad', 'mean')))
+        with EscritorAlmacen(directorio) as escritor:
+            for posicion, (valor_clave, serie) in enumerate(diarios.groupby(level=0, sort=True, observed=True)):
+                fechas = serie.index.get_level_values('fecha')
+                dias = pd.date_range(fechas.min(), fechas.max(), freq='D')
+                valores = serie['popularidad'].droplevel(0).reindex(dias).to_numpy()
+                id_tendencia = valor_clave if clave == 'tendencia_id' else posicion
+                escritor.agregar_serie(id_tendencia, serie['tendencia'].iloc[0], dias[0], valores)
+        return cls(directorio)
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def _id(self, tendencia):
+        if isinstance(tendencia, str):
+            return self.ids_por_nombre[tendencia]
+        return int(tendencia)
+
+    def rango(self, tendencia):
+        """
+        Función que devuelve (primera_fecha, última_fecha) de una tendencia.
+        """
+        entrada = self.indice[self._id(tendencia)]
+        inicio = np.datetime64(int(entrada['dia_inicio']), 'D')
+        return inicio, inicio + (int(entrada['largo']) - 1) * UN_DIA
+
+    def serie(self, tendencia, desde=None, hasta=None):
+        """
+        Función que devuelve los valores diarios de una tendencia (por nombre o ID).
+
+        El resultado es una "vista" del archivo: no copia datos. desde y
+        hasta (inclusive) recortan el rango de fechas.
+        """
+        entrada = self.indice[self._id(tendencia)]
+        desplazamiento, largo, dia_inicio = (int(valor) for valor in entrada)
+        primero = 0 if desde is None else min(max(_a_dia(desde) - dia_inicio, 0), largo)
+        ultimo = largo if hasta is None else min(max(_a_dia(hasta) - dia_inicio + 1, primero), largo)
+        return self.valores[desplazamiento + primero:desplazamiento + ultimo]
+
+    def matriz(self, tendencias=None, desde=None, hasta=None):
+        """
+        Función que arma una matriz tendencia × día alineada por fecha
+        (NaN donde una tendencia no tiene datos), lista para los motores
+        de correlaciones y pronósticos.
+
+        Devuelve (matriz, nombres, fechas).
+        """
+        ids = sorted(self.nombres) if tendencias is None else [self._id(t) for t in tendencias]
+        entradas = self.indice[ids]
+        dia_desde = int(entradas['dia_inicio'].min()) if desde is None else _a_dia(desde)
+        dia_hasta = int((entradas['dia_inicio'] + entradas['largo']).max() - 1) if hasta is None else _a_dia(hasta)
+        matriz = np.full((len(ids), max(dia_hasta - dia_desde + 1, 0)), np.nan, dtype=np.float32)
+        for fila, (id_tendencia, entrada) in enumerate(zip(ids, entradas)):
+            dia_inicio = int(entrada['dia_inicio'])
+            valores = self.serie(id_tendencia, np.datetime64(max(dia_inicio, dia_desde), 'D'),
+                                 np.datetime64(dia_hasta, 'D'))
+            inicio = max(dia_inicio - dia_desde, 0)
+            matriz[fila, inicio:inicio + len(valores)] = valores
+        fechas = pd.date_range(np.datetime64(dia_desde, 'D'), periods=matriz.shape[1], freq='D')
+        return matriz, [self.nombres[id_tendencia] for id_tendencia in ids], fechas
+
+    def tabla_ancha(self, tendencias=None, desde=None, hasta=None):
+        """
+        Función que devuelve un DataFrame con una columna 'fecha' y una
+        columna por tendencia (el formato que usa DashboardSimple).
+        """
+        matriz, nombres, fechas = self.matriz(tendencias, desde, hasta)
+        tabla = pd.DataFrame(matriz.T, columns=nombres)
+        tabla.insert(0, 'fecha', fechas)
+        return tabla
+
+    def datos_largos(self, tendencias=None, desde=None, hasta=None):
+        """
+        Función que devuelve las tendencias pedidas en el formato largo
+        ('fecha', 'tendencia', 'popularidad') que usa AnalizadorTendencias.
+        """
+        tabla = self.tabla_ancha(tendencias, desde, hasta)
+        largos = tabla.melt(id_vars='fecha', var_name='tendencia', value_name='popularidad')
+        return largos.dropna(subset=['popularidad']).reset_index(drop=True)
+
+
+def probar_almacen():
+    """
+    Función para probar el almacén de series de tiempo.
+    """
+    import tempfile
+    import time
+
+    print("🗄️ Probando Almacén de Series de CLARIO...")
+    print("=" * 60)
+
+    fechas = pd.date_range('2024-01-01', periods=90, freq='D')
+    datos = pd.DataFrame({
+        'fecha': np.tile(fechas, 3),
+        'tendencia': np.repeat(['Streetwear', 'Vintage', 'Minimalista'], 90),
+        'popularidad': np.random.default_rng(0).normal(75, 10, 270),
+    })
+
+    directorio = tempfile.mkdtemp()
+    almacen = AlmacenSeries.construir(directorio, datos)
+    print(f"📦 {len(almacen)} tendencias guardadas en {directorio}")
+
+    inicio = time.perf_counter()
+    almacen = AlmacenSeries(directorio)
+    print(f"⚡ Almacén abierto en {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+    enero = almacen.serie('Vintage', '2024-01-01', '2024-01-31')
+    print(f"📈 Vintage en enero: {len(enero)} días, promedio {enero.mean():.2f} "
+          f"(vista sin copia: {enero.base is not None})")
+    print(almacen.tabla_ancha(desde='2024-03-25').to_string(index=False, float_format='%.1f'))
+
+    print("🎯 Almacén de series probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_almacen()
@@ -11,7 +11,16 @@ Descripción: Módulo para analizar tendencias y patrones en los datos
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import json
+
+from src.correlaciones_tendencias import MotorCorrelaciones
+from src.pronosticos_tendencias import PronosticadorTendencias
+from src.serializador_reportes import EscritorReporte, guardar_json
+
+# Crecimiento porcentual a partir del cual una tendencia es "emergente"
+UMBRAL_EMERGENTE = 10
+
+# Valor por defecto que indica "calcularlo acá" (None ya significa "no hay")
+_CALCULAR = object()
 
 class AnalizadorTendencias:
     """
@@ -46,29 +55,53 @@ class AnalizadorTendencias:
         """
         print("📈 Calculando crecimiento de tendencias...")
         
-        # Agrupar datos por tendencia y calcular crecimiento
-        resultados = {}
+        return dict(self.iterar_crecimiento_tendencia(datos))
+    
+    def iterar_crecimiento_tendencia(self, datos):
+        """
+        Función que calcula el crecimiento tendencia por tendencia, de a una.
+        
+        ¿Por qué "de a una"? Porque devuelve un generador: cada resultado
+        se entrega apenas se calcula, sin guardar todos en memoria. Así un
+        reporte con miles de tendencias se puede escribir a medida que avanza.
+        """
+        # Ordenar una sola vez y agrupar (en vez de filtrar la tabla por cada tendencia).
+        # Si los datos ya tienen IDs de IndiceTendencias, se agrupa por esos enteros.
+        clave = 'tendencia_id' if 'tendencia_id' in datos.columns else 'tendencia'
+        datos_ordenados = datos.sort_values('fecha', kind='stable')
+        grupos = datos_ordenados.groupby(clave, sort=False, observed=True)
+        extremos = pd.DataFrame({
+            'nombre': grupos['tendencia'].first(),
+            'primer_valor': grupos['popularidad'].first(),
+            'ultimo_valor': grupos['popularidad'].last(),
+            'cantidad': grupos.size()
+        })
         
-        for tendencia in datos['tendencia'].unique():
-            # Obtener datos de esta tendencia específica
-            datos_tendencia = datos[datos['tendencia'] == tendencia].sort_values('fecha')
-            
-            if len(datos_tendencia) > 1:
-                # Calcular crecimiento (último valor - primer valor)
-                primer_valor = datos_tendencia.iloc[0]['popularidad']
-                ultimo_valor = datos_tendencia.iloc[-1]['popularidad']
-                crecimiento = ultimo_valor - primer_valor
-                porcentaje_crecimiento = (crecimiento / primer_valor) * 100
-                
-                resultados[tendencia] = {
-                    'crecimiento_absoluto': crecimiento,
-                    'crecimiento_porcentual': porcentaje_crecimiento,
-                    'tendencia': 'creciente' if crecimiento > 0 else 'decreciente' if crecimiento < 0 else 'estable'
-                }
-        
-        return resultados
+        for fila in extremos.itertuples(index=False):
+            tendencia = fila.nombre
+            if fila.cantidad > 1:
+                yield tendencia, self.describir_crecimiento(fila.primer_valor, fila.ultimo_valor)
     
-    def identificar_tendencias_emergentes(self, datos, umbral_crecimiento=10):
+    def describir_crecimiento(self, primer_valor, ultimo_valor):
+        """
+        Función que arma el resultado de crecimiento a partir del primer
+        y el último valor de una tendencia.
+        """
+        # Calcular crecimiento (último valor - primer valor)
+        crecimiento = ultimo_valor - primer_valor
+        if primer_valor == 0:
+            # Partir de 0 es crecimiento "infinito" (como da NumPy), no un error
+            porcentaje_crecimiento = np.inf if crecimiento > 0 else -np.inf if crecimiento < 0 else 0.0
+        else:
+            porcentaje_crecimiento = (crecimiento / primer_valor) * 100
+        
+        return {
+            'crecimiento_absoluto': crecimiento,
+            'crecimiento_porcentual': porcentaje_crecimiento,
+            'tendencia': 'creciente' if crecimiento > 0 else 'decreciente' if crecimiento < 0 else 'estable'
+        }
+    
+    def identificar_tendencias_emergentes(self, datos, umbral_crecimiento=UMBRAL_EMERGENTE):
         """
         Función que identifica tendencias que están creciendo rápidamente.
         
@@ -77,13 +110,11 @@ class AnalizadorTendencias:
         """
         print(f"�� Identificando tendencias emergentes (umbral: {umbral_crecimiento}%)...")
         
-        # Calcular crecimiento de todas las tendencias
-        crecimiento_tendencias = self.calcular_crecimiento_tendencia(datos)
-        
-        # Filtrar solo las que crecen más del umbral
+        # Recorrer el crecimiento tendencia por tendencia y quedarse solo
+        # con las que crecen más del umbral (sin guardar todas en memoria)
         tendencias_emergentes = {}
         
-        for tendencia, datos_crecimiento in crecimiento_tendencias.items():
+        for tendencia, datos_crecimiento in self.iterar_crecimiento_tendencia(datos):
             if datos_crecimiento['crecimiento_porcentual'] > umbral_crecimiento:
                 tendencias_emergentes[tendencia] = datos_crecimiento
         
@@ -127,33 +158,115 @@ class AnalizadorTendencias:
             'popularidad_por_mes': popularidad_por_mes.to_dict()
         }
     
-    def generar_insights(self, datos):
+    def analizar_correlaciones(self, datos, top_k=5, retraso_maximo=14):
+        """
+        Función que analiza qué tendencias se mueven juntas y cuáles se adelantan.
+        
+        ¿Para qué sirve? Si 'Vintage' siempre sube una semana antes que
+        'Streetwear', mirar 'Vintage' hoy anticipa lo que pasará después.
+        
+        Devuelve las top_k tendencias más correlacionadas con cada una y,
+        para esos pares, el retraso (en días) con el que una sigue a la otra.
+        """
+        print("🔗 Analizando correlaciones entre tendencias...")
+        
+        motor = MotorCorrelaciones.desde_datos(datos)
+        correlaciones = motor.top_correlaciones(k=top_k)
+        adelantos = motor.adelantos_top(k=top_k, retraso_maximo=retraso_maximo)
+        
+        print(f"📊 Tendencias comparadas: {len(motor.nombres)}")
+        
+        return {
+            'correlaciones': correlaciones.to_dict(orient='records'),
+            'adelantos': adelantos[adelantos['retraso'] > 0].to_dict(orient='records')
+        }
+    
+    def predecir_tendencias(self, datos, dias=7, modelo="holt_winters"):
+        """
+        Función que hace predicciones básicas de popularidad para todas las tendencias.
+        
+        ¿Qué es una "predicción"? Es una estimación de cómo seguirá cada
+        tendencia en los próximos días, con un rango de valores probables.
+        
+        Modelos: "lineal", "holt_winters" o "ingenuo_estacional".
+        """
+        print(f"🔮 Pronosticando {dias} días con el modelo '{modelo}'...")
+        
+        pronosticador = PronosticadorTendencias(horizonte=dias)
+        pronosticos = pronosticador.pronosticar(datos, modelo)
+        
+        print(f"✅ Pronósticos generados para {pronosticos['tendencia'].nunique()} tendencias")
+        return pronosticos
+    
+    def generar_insights(self, datos, contador_menciones=None, tendencia_emergente=_CALCULAR):
         """
         Función que genera insights (conocimientos) útiles de los datos.
         
         ¿Qué es un "insight"? Es como una "revelación" o "descubrimiento"
         que te ayuda a entender mejor lo que está pasando.
+        
+        Si se pasa un ContadorMenciones (ver sketches_tendencias.py), también
+        informa la tendencia más mencionada de todo el flujo recolectado,
+        sin necesidad de tener cada mención en el DataFrame.
+        
+        Si la tendencia emergente ya se conoce (o se sabe que no hay, None),
+        se puede pasar para no volver a calcular el crecimiento.
         """
         print("�� Generando insights de los datos...")
         
-        insights = []
-        
         # Insight 1: Tendencia más popular
         tendencia_mas_popular = datos.loc[datos['popularidad'].idxmax()]
-        insights.append(f"🏆 La tendencia más popular es '{tendencia_mas_popular['tendencia']}' con una popularidad de {tendencia_mas_popular['popularidad']}")
         
-        # Insight 2: Tendencia emergente
-        tendencias_emergentes = self.identificar_tendencias_emergentes(datos)
-        if tendencias_emergentes:
-            tendencia_emergente = list(tendencias_emergentes.keys())[0]
-            insights.append(f"🚀 '{tendencia_emergente}' es una tendencia emergente que está creciendo rápidamente")
+        # Insight 1b: Tendencia más mencionada (conteo aproximado sobre el flujo)
+        mas_mencionada = None
+        if contador_menciones is not None:
+            mas_mencionadas = contador_menciones.top_k(1)
+            if mas_mencionadas:
+                mas_mencionada = mas_mencionadas[0]
+        
+        # Insight 2: Tendencia emergente (la primera alcanza: se corta apenas aparece)
+        if tendencia_emergente is _CALCULAR:
+            tendencia_emergente = self.primera_emergente(self.iterar_crecimiento_tendencia(datos))
         
         # Insight 3: Análisis de fuentes
         fuente_mas_confiable = datos.groupby('fuente')['popularidad'].mean().idxmax()
-        insights.append(f"📱 '{fuente_mas_confiable}' es la fuente de datos más confiable")
         
         # Insight 4: Variabilidad de popularidad
         variabilidad = datos['popularidad'].std()
+        
+        return self.redactar_insights(
+            tendencia_mas_popular['tendencia'], tendencia_mas_popular['popularidad'],
+            tendencia_emergente, fuente_mas_confiable, variabilidad, mas_mencionada
+        )
+    
+    def primera_emergente(self, crecimientos, umbral_crecimiento=UMBRAL_EMERGENTE):
+        """
+        Función que devuelve la primera tendencia emergente de una secuencia
+        de pares (tendencia, crecimiento), o None si no hay ninguna.
+        """
+        return next((tendencia for tendencia, valores in crecimientos
+                     if valores['crecimiento_porcentual'] > umbral_crecimiento), None)
+    
+    def redactar_insights(self, tendencia_mas_popular, popularidad_maxima, tendencia_emergente,
+                          fuente_mas_confiable, variabilidad, mas_mencionada=None):
+        """
+        Función que convierte los valores ya calculados en frases de insight.
+        
+        Está separada del cálculo para poder redactar insights a partir de
+        resúmenes hechos en otro lado (por ejemplo, por categoría).
+        """
+        insights = []
+        insights.append(f"🏆 La tendencia más popular es '{tendencia_mas_popular}' con una popularidad de {popularidad_maxima}")
+        
+        if mas_mencionada is not None:
+            tendencia, menciones, error = mas_mencionada
+            insights.append(f"📣 La tendencia más mencionada es '{tendencia}' con unas {menciones} menciones (±{error})")
+        
+        if tendencia_emergente is not None:
+            insights.append(f"🚀 '{tendencia_emergente}' es una tendencia emergente que está creciendo rápidamente")
+        
+        insights.append(f"📱 '{fuente_mas_confiable}' es la fuente de datos más confiable")
+        
         if variabilidad < 10:
             insights.append("📊 Las tendencias tienen popularidad muy estable")
         elif variabilidad < 20:
@@ -163,37 +276,67 @@ class AnalizadorTendencias:
         
         return insights
     
-    def crear_reporte_tendencias(self, datos):
+    def crear_reporte_tendencias(self, datos, formato="json"):
         """
         Función que crea un reporte completo de tendencias.
         
         ¿Qué es un "reporte"? Es como un "resumen ejecutivo" que
         condensa toda la información importante en pocas páginas.
+        
+        Formatos disponibles:
+        - "json": un único documento JSON con sangría (como siempre)
+        - "jsonl": JSON Lines, escrito tendencia por tendencia
+        - "jsonl.gz": igual que "jsonl" pero comprimido con gzip
+        
+        Con "jsonl" el análisis de crecimiento no se guarda en memoria:
+        el reporte devuelto trae solo el encabezado y la ruta del archivo.
         """
         print("�� Creando reporte de tendencias...")
         
-        # Generar todos los análisis
-        crecimiento = self.calcular_crecimiento_tendencia(datos)
+        # Generar los análisis que no dependen del tamaño del reporte
         estacionalidad = self.analizar_estacionalidad(datos)
-        insights = self.generar_insights(datos)
         
-        # Crear reporte
+        # Crear encabezado del reporte
         reporte = {
             'fecha_generacion': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
             'resumen_ejecutivo': {
                 'total_tendencias': len(datos['tendencia'].unique()),
                 'periodo_analisis': f"{datos['fecha'].min().strftime('%d/%m/%Y')} - {datos['fecha'].max().strftime('%d/%m/%Y')}",
                 'fuentes_analizadas': list(datos['fuente'].unique())
-            },
-            'analisis_crecimiento': crecimiento,
-            'analisis_estacionalidad': estacionalidad,
-            'insights': insights
+            }
         }
         
-        # Guardar reporte en formato JSON
-        nombre_archivo = f"data/reporte_tendencias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(nombre_archivo, 'w', encoding='utf-8') as f:
-            json.dump(reporte, f, indent=2, ensure_ascii=False, default=str)
+        nombre_archivo = f"data/reporte_tendencias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+        
+        if formato == "json":
+            # Guardar reporte completo en formato JSON
+            reporte['analisis_crecimiento'] = self.calcular_crecimiento_tendencia(datos)
+            reporte['analisis_estacionalidad'] = estacionalidad
+            reporte['insights'] = self.generar_insights(
+                datos, tendencia_emergente=self.primera_emergente(reporte['analisis_crecimiento'].items()))
+            guardar_json(reporte, nombre_archivo)
+        elif formato in ("jsonl", "jsonl.gz"):
+            # Escribir el reporte línea por línea, a medida que se calcula.
+            # La primera tendencia emergente se anota al pasar, así el
+            # crecimiento se calcula una sola vez y nunca entero en memoria.
+            emergentes = []
+            
+            def crecimiento_anotado():
+                for tendencia, valores in self.iterar_crecimiento_tendencia(datos):
+                    if not emergentes and valores['crecimiento_porcentual'] > UMBRAL_EMERGENTE:
+                        emergentes.append(tendencia)
+                    yield tendencia, valores
+            
+            with EscritorReporte(nombre_archivo) as escritor:
+                escritor.escribir_valor('fecha_generacion', reporte['fecha_generacion'])
+                escritor.escribir_valor('resumen_ejecutivo', reporte['resumen_ejecutivo'])
+                escritor.escribir_seccion('analisis_crecimiento', crecimiento_anotado())
+                escritor.escribir_valor('analisis_estacionalidad', estacionalidad)
+                escritor.escribir_valor('insights', self.generar_insights(
+                    datos, tendencia_emergente=emergentes[0] if emergentes else None))
+            reporte['archivo'] = nombre_archivo
+        else:
+            raise ValueError(f"Formato de reporte no soportado: {formato}")
         
         print(f"✅ Reporte guardado en: {nombre_archivo}")
         return reporte
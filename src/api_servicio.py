@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Servicio de Consultas (API)
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Servicio HTTP que expone los resultados del analizador de tendencias
+"""
+
+# Importar módulos necesarios
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from src.analizador_tendencias import AnalizadorTendencias
+from src.serializador_reportes import CodificadorReporte
+
+
+def cargar_datos_procesados(ruta_archivo="data/tendencias_moda_procesadas.csv"):
+    """
+    Función que carga los datos procesados guardados por ProcesadorDatos.
+    """
+    datos = pd.read_csv(ruta_archivo)
+    datos['fecha'] = pd.to_datetime(datos['fecha'])
+    return datos
+
+
+class CacheResultados:
+    """
+    Clase que guarda los resultados del análisis ya calculados.
+
+    ¿Qué es una "caché"? Es como tener las respuestas de un examen ya
+    escritas: cuando alguien pregunta, se entrega la respuesta guardada
+    en lugar de volver a resolver el ejercicio.
+
+    Los resultados se calculan una sola vez por versión de los datos.
+    Cada respuesta se guarda ya convertida a JSON junto con su ETag, así
+    que atender una petición no recalcula nada.
+    """
+
+    CONSULTAS = ["crecimiento", "emergentes", "estacionalidad", "insights"]
+
+    def __init__(self, cargar_datos=cargar_datos_procesados, ttl_segundos=60,
+                 umbral_crecimiento=10):
+        """
+        Constructor de la clase CacheResultados.
+
+        cargar_datos es una función sin argumentos que devuelve el DataFrame
+        limpio; se vuelve a llamar cuando vence el TTL para detectar datos nuevos.
+        """
+        self.cargar_datos = cargar_datos
+        self.ttl_segundos = ttl_segundos
+        self.umbral_crecimiento = umbral_crecimiento
+        self.analizador = AnalizadorTendencias()
+        self.huella = None
+        self.respuestas = {}
+        self._vence = 0.0
+        self._bloqueo = asyncio.Lock()
+        self._refresco = None
+
+    def calcular_huella(self, datos):
+        """
+        Función que calcula una huella (hash) del contenido de los datos.
+
+        Si la huella no cambia, los resultados guardados siguen siendo válidos.
+        """
+        valores = pd.util.hash_pandas_object(datos, index=False).values
+        return hashlib.sha1(valores.tobytes()).hexdigest()
+
+    def _serializar(self, resultado):
+        """
+        Convierte un resultado a bytes JSON y calcula su ETag.
+        """
+        cuerpo = json.dumps(resultado, ensure_ascii=False, cls=CodificadorReporte).encode('utf-8')
+        etag = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+        return cuerpo, etag
+
+    def precalcular(self, datos):
+        """
+        Función que calcula todas las consultas de una sola vez.
+        """
+        crecimiento = self.analizador.calcular_crecimiento_tendencia(datos)
+        emergentes = {
+            tendencia: valores for tendencia, valores in crecimiento.items()
+            if valores['crecimiento_porcentual'] > self.umbral_crecimiento
+        }
+        resultados = {
+            'crecimiento': crecimiento,
+            'emergentes': emergentes,
+            'estacionalidad': self.analizador.analizar_estacionalidad(datos),
+            'insights': self.analizador.generar_insights(datos),
+        }
+        return {consulta: self._serializar(valor) for consulta, valor in resultados.items()}
+
+    def actualizar(self, datos=None):
+        """
+        Función que recarga los datos y recalcula solo si cambiaron.
+
+        Devuelve True si los resultados se recalcularon.
+        """
+        if datos is None:
+            datos = self.cargar_datos()
+        huella = self.calcular_huella(datos)
+        self._vence = time.monotonic() + self.ttl_segundos
+        if huella == self.huella:
+            return False
+        self.respuestas = self.precalcular(datos)
+        self.huella = huella
+        return True
+
+    def invalidar(self):
+        """
+        Función que marca la caché como vencida (por ejemplo, cuando llegan datos nuevos).
+        """
+        self._vence = 0.0
+
+    async def obtener(self, consulta):
+        """
+        Función que devuelve (cuerpo, etag) de una consulta ya calculada.
+
+        Si el TTL venció se siguen entregando las respuestas guardadas
+        ("stale-while-revalidate") y un único recálculo corre en segundo
+        plano; ninguna petición espera la recarga de los datos. Solo la
+        primera vez, cuando todavía no hay nada calculado, se espera.
+        """
+        if not self.respuestas:
+            async with self._bloqueo:
+                if not self.respuestas:
+                    await run_in_threadpool(self.actualizar)
+        elif time.monotonic() >= self._vence and (self._refresco is None or self._refresco.done()):
+            self._refresco = asyncio.create_task(self._refrescar_en_segundo_plano())
+        return self.respuestas[consulta]
+
+    async def _refrescar_en_segundo_plano(self):
+        # Evita lanzar otro refresco mientras este corre
+        self._vence = time.monotonic() + self.ttl_segundos
+        try:
+            await run_in_threadpool(self.actualizar)
+        except Exception as e:
+            print(f"❌ Error actualizando la caché (se siguen sirviendo los resultados anteriores): {e}")
+
+
+def etag_coincide(if_none_match, etag):
+    """
+    Función que dice si la cabecera If-None-Match pide un ETag que ya tenemos.
+
+    La cabecera puede traer varios ETags separados por comas, ETags
+    "débiles" (con el prefijo W/) o un asterisco, que coincide con
+    cualquiera. Como pide la norma HTTP (RFC 9110), la comparación es
+    débil: W/"abc" y "abc" cuentan como el mismo.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    buscado = etag.removeprefix('W/')
+    return any(candidato.strip().removeprefix('W/') == buscado for candidato in if_none_match.split(','))
+
+
+def crear_app(cache=None):
+    """
+    Función que crea la aplicación FastAPI del servicio de consultas.
+    """
+    cache = cache or CacheResultados()
+
+    @asynccontextmanager
+    async def ciclo_de_vida(app):
+        # Calcular todo antes de recibir la primera petición
+        await run_in_threadpool(cache.actualizar)
+        yield
+
+    app = FastAPI(title="CLARIO API", version="1.0", lifespan=ciclo_de_vida)
+    app.state.cache = cache
+
+    async def responder(consulta, request):
+        cuerpo, etag = await cache.obtener(consulta)
+        cabeceras = {
+            'ETag': etag,
+            'Cache-Control': f'max-age={cache.ttl_segundos}',
+        }
+        if etag_coincide(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=cabeceras)
+        return Response(content=cuerpo, media_type='application/json', headers=cabeceras)
+
+    @app.get("/crecimiento")
+    async def crecimiento(request: Request):
+        return await responder('crecimiento', request)
+
+    @app.get("/emergentes")
+    async def emergentes(request: Request):
+        return await responder('emergentes', request)
+
+    @app.get("/estacionalidad")
+    async def estacionalidad(request: Request):
+        return await responder('estacionalidad', request)
+
+    @app.get("/insights")
+    async def insights(request: Request):
+        return await responder('insights', request)
+
+    @app.post("/invalidar", status_code=202)
+    async def invalidar():
+        cache.invalidar()
+        return {'estado': 'invalidado'}
+
+    @app.get("/salud")
+    async def salud():
+        if cache.huella is None:
+            raise HTTPException(status_code=503, detail="Resultados aún no calculados")
+        return {'estado': 'ok', 'huella_datos': cache.huella}
+
+    return app
+
+
+def probar_api():
+    """
+    Función para probar el servicio de consultas sin levantar un servidor.
+    """
+    from fastapi.testclient import TestClient
+
+    print("🌐 Probando Servicio de Consultas de CLARIO...")
+    print("=" * 60)
+
+    with TestClient(crear_app()) as cliente:
+        for consulta in CacheResultados.CONSULTAS:
+            respuesta = cliente.get(f"/{consulta}")
+            print(f"   /{consulta}: {respuesta.status_code} ETag={respuesta.headers['etag']}")
+            repetida = cliente.get(f"/{consulta}", headers={'If-None-Match': respuesta.headers['etag']})
+            print(f"   /{consulta} (If-None-Match): {repetida.status_code}")
+
+    print("🎯 Servicio de consultas probado exitosamente!")
+
+
+# Punto de entrada: levantar el servidor
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(crear_app(), host="0.0.0.0", port=8000)
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Cola de Trabajo
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para repartir recolección y análisis entre muchos trabajadores (hilos o procesos de una misma máquina)
+"""
+
+# Importar módulos necesarios
+import atexit
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.analizador_tendencias import AnalizadorTendencias
+
+ESTADOS = ["pendiente", "en_curso", "completada", "fallida"]
+ERROR_ALQUILER_VENCIDO = "El alquiler venció sin que el trabajador terminara la tarea"
+
+
+@dataclass
+class Tarea:
+    """
+    Una unidad de trabajo: qué hay que hacer (tipo) y con qué datos (carga).
+    """
+    id: str
+    tipo: str
+    carga: dict
+    intentos: int
+    token: str
+
+
+class ColaTrabajo(ABC):
+    """
+    Clase base de las colas de trabajo de CLARIO.
+
+    ¿Qué es una "cola de trabajo"? Es una lista de tareas pendientes que
+    varios trabajadores van tomando. Cada trabajador "alquila" una tarea
+    por un tiempo: si se cae sin terminarla, el alquiler vence y otro
+    trabajador la retoma. Las tareas fallidas (o cuyo alquiler venció)
+    se reintentan hasta max_intentos veces; después quedan como 'fallida'.
+
+    Encolar dos veces la misma clave no duplica la tarea, y completar una
+    tarea ya completada no cambia su resultado: todo es idempotente.
+    """
+
+    def __init__(self, max_intentos=3, segundos_espera_reintento=1.0):
+        self.max_intentos = max_intentos
+        self.segundos_espera_reintento = segundos_espera_reintento
+
+    @abstractmethod
+    def encolar(self, tipo, carga, clave=None):
+        """Agrega una tarea y devuelve su ID (la clave, si se indicó)."""
+
+    @abstractmethod
+    def reclamar(self, trabajador, segundos_alquiler=60):
+        """Toma la próxima tarea disponible, o devuelve None si no hay."""
+
+    @abstractmethod
+    def completar(self, tarea, resultado):
+        """Guarda el resultado de una tarea reclamada."""
+
+    @abstractmethod
+    def fallar(self, tarea, error):
+        """Registra un error; la tarea se reintenta o queda como fallida."""
+
+    @abstractmethod
+    def resultados(self, tipo=None):
+        """Devuelve {id: resultado} de las tareas completadas."""
+
+    @abstractmethod
+    def contar(self):
+        """Devuelve cuántas tareas hay en cada estado."""
+
+    def vacia(self):
+        conteo = self.contar()
+        return conteo['pendiente'] == 0 and conteo['en_curso'] == 0
+
+
+class ColaEnMemoria(ColaTrabajo):
+    """
+    Cola de trabajo dentro de un único proceso (para hilos del mismo programa).
+
+    Para que reclamar no recorra todas las tareas, se usan dos montículos
+    (heapq): las pendientes ordenadas por cuándo se pueden tomar, y los
+    alquileres ordenados por cuándo vencen. Cada reclamo mira solo la
+    punta de cada uno. Los alquileres viejos (de una tarea que ya se
+    completó o se volvió a dar) se descartan al llegar a la punta.
+    """
+
+    def __init__(self, max_intentos=3, segundos_espera_reintento=1.0):
+        super().__init__(max_intentos, segundos_espera_reintento)
+        self._tareas = {}
+        self._pendientes = []   # (disponible_desde, orden, id)
+        self._alquileres = []   # (alquilada_hasta, id, token)
+        self._conteo = dict.fromkeys(ESTADOS, 0)
+        self._bloqueo = threading.Lock()
+
+    def _cambiar_estado(self, tarea, estado, **campos):
+        self._conteo[tarea['estado']] -= 1
+        self._conteo[estado] += 1
+        tarea.update(estado=estado, **campos)
+
+    def encolar(self, tipo, carga, clave=None):
+        id_tarea = clave or uuid.uuid4().hex
+        with self._bloqueo:
+            if id_tarea not in self._tareas:
+                orden = len(self._tareas)
+                self._tareas[id_tarea] = {
+                    'tipo': tipo, 'carga': carga, 'estado': 'pendiente', 'intentos': 0,
+                    'orden': orden, 'token': None, 'resultado': None, 'error': None,
+                }
+                self._conteo['pendiente'] += 1
+                heapq.heappush(self._pendientes, (0.0, orden, id_tarea))
+        return id_tarea
+
+    def reclamar(self, trabajador, segundos_alquiler=60):
+        ahora = time.time()
+        with self._bloqueo:
+            # Primero los alquileres vencidos (el trabajador se cayó)
+            while self._alquileres and self._alquileres[0][0] < ahora:
+                _, id_tarea, token = heapq.heappop(self._alquileres)
+                tarea = self._tareas[id_tarea]
+                if tarea['estado'] != 'en_curso' or tarea['token'] != token:
+                    continue
+                if tarea['intentos'] >= self.max_intentos:
+                    # El trabajador se cayó en el último intento: no se vuelve a dar
+                    self._cambiar_estado(tarea, 'fallida', error=ERROR_ALQUILER_VENCIDO, token=None)
+                    continue
+                return self._entregar(id_tarea, trabajador, ahora + segundos_alquiler)
+
+            if self._pendientes and self._pendientes[0][0] <= ahora:
+                _, _, id_tarea = heapq.heappop(self._pendientes)
+                return self._entregar(id_tarea, trabajador, ahora + segundos_alquiler)
+        return None
+
+    def _entregar(self, id_tarea, trabajador, alquilada_hasta):
+        tarea = self._tareas[id_tarea]
+        token = f"{trabajador}:{uuid.uuid4().hex}"
+        self._cambiar_estado(tarea, 'en_curso', token=token, intentos=tarea['intentos'] + 1)
+        heapq.heappush(self._alquileres, (alquilada_hasta, id_tarea, token))
+        return Tarea(id_tarea, tarea['tipo'], tarea['carga'], tarea['intentos'], token)
+
+    def completar(self, tarea, resultado):
+        with self._bloqueo:
+            registro = self._tareas[tarea.id]
+            if registro['estado'] == 'en_curso' and registro['token'] == tarea.token:
+                # Ya no hace falta la carga: solo se guarda el resultado
+                self._cambiar_estado(registro, 'completada', resultado=resultado, token=None, carga=None)
+                return True
+        return False
+
+    def fallar(self, tarea, error):
+        with self._bloqueo:
+            registro = self._tareas[tarea.id]
+            if registro['estado'] != 'en_curso' or registro['token'] != tarea.token:
+                return False
+            if registro['intentos'] >= self.max_intentos:
+                self._cambiar_estado(registro, 'fallida', error=str(error), token=None)
+            else:
+                disponible_desde = time.time() + self.segundos_espera_reintento * 2 ** (registro['intentos'] - 1)
+                self._cambiar_estado(registro, 'pendiente', error=str(error), token=None)
+                heapq.heappush(self._pendientes, (disponible_desde, registro['orden'], tarea.id))
+            return True
+
+    def resultados(self, tipo=None):
+        with self._bloqueo:
+            return {
+                id_tarea: tarea['resultado'] for id_tarea, tarea in self._tareas.items()
+                if tarea['estado'] == 'completada' and (tipo is None or tarea['tipo'] == tipo)
+            }
+
+    def contar(self):
+        with self._bloqueo:
+            return dict(self._conteo)
+
+
+class ColaSQLite(ColaTrabajo):
+    """
+    Cola de trabajo guardada en un archivo SQLite.
+
+    Varios procesos de la misma máquina pueden usar el mismo archivo: el
+    reclamo de una tarea se hace dentro de una transacción exclusiva, así
+    dos trabajadores nunca toman la misma.
+
+    Ojo: el modo WAL de SQLite usa memoria compartida y no funciona en
+    carpetas de red (NFS, SMB). Para repartir entre varias máquinas, el
+    archivo no se puede compartir; hace falta una cola con servidor.
+    """
+
+    def __init__(self, ruta_archivo="data/cola_trabajo.db", max_intentos=3, segundos_espera_reintento=1.0):
+        super().__init__(max_intentos, segundos_espera_reintento)
+        self.ruta_archivo = ruta_archivo
+        self._locales = threading.local()
+        with self._conexion() as conexion:
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS tareas (
+                    id TEXT PRIMARY KEY,
+                    tipo TEXT NOT NULL,
+                    carga TEXT NOT NULL,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    disponible_desde REAL NOT NULL DEFAULT 0,
+                    alquilada_hasta REAL NOT NULL DEFAULT 0,
+                    token TEXT,
+                    resultado TEXT,
+                    error TEXT,
+                    creada REAL NOT NULL
+                )
+            """)
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_tareas_estado ON tareas (estado, disponible_desde)")
+
+    def _conexion(self):
+        # Una conexión por hilo (las conexiones de sqlite3 no se comparten entre hilos)
+        conexion = getattr(self._locales, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta_archivo, timeout=30, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._locales.conexion = conexion
+        return _Transaccion(conexion)
+
+    def encolar(self, tipo, carga, clave=None):
+        id_tarea = clave or uuid.uuid4().hex
+        with self._conexion() as conexion:
+            conexion.execute(
+                "INSERT OR IGNORE INTO tareas (id, tipo, carga, creada) VALUES (?, ?, ?, ?)",
+                (id_tarea, tipo, json.dumps(carga), time.time()),
+            )
+        return id_tarea
+
+    def encolar_lote(self, tipo, cargas_por_clave):
+        """
+        Función que encola muchas tareas en una sola transacción.
+        """
+        ahora = time.time()
+        with self._conexion() as conexion:
+            conexion.executemany(
+                "INSERT OR IGNORE INTO tareas (id, tipo, carga, creada) VALUES (?, ?, ?, ?)",
+                [(clave, tipo, json.dumps(carga), ahora) for clave, carga in cargas_por_clave.items()],
+            )
+        return list(cargas_por_clave)
+
+    def reclamar(self, trabajador, segundos_alquiler=60):
+        ahora = time.time()
+        token = f"{trabajador}:{uuid.uuid4().hex}"
+        with self._conexion() as conexion:
+            # El trabajador se cayó en el último intento: no se vuelve a dar
+            conexion.execute("""
+                UPDATE tareas SET estado = 'fallida', error = ?, token = NULL
+                WHERE estado = 'en_curso' AND alquilada_hasta < ? AND intentos >= ?
+            """, (ERROR_ALQUILER_VENCIDO, ahora, self.max_intentos))
+            fila = conexion.execute("""
+                SELECT id FROM tareas
+                WHERE (estado = 'pendiente' AND disponible_desde <= ?)
+                   OR (estado = 'en_curso' AND alquilada_hasta < ?)
+                ORDER BY creada LIMIT 1
+            """, (ahora, ahora)).fetchone()
+            if fila is None:
+                return None
+            conexion.execute("""
+                UPDATE tareas SET estado = 'en_curso', alquilada_hasta = ?, token = ?, intentos = intentos + 1
+                WHERE id = ?
+            """, (ahora + segundos_alquiler, token, fila[0]))
+            id_tarea, tipo, carga, intentos = conexion.execute(
+                "SELECT id, tipo, carga, intentos FROM tareas WHERE id = ?", (fila[0],)
+            ).fetchone()
+        return Tarea(id_tarea, tipo, json.loads(carga), intentos, token)
+
+    def completar(self, tarea, resultado):
+        with self._conexion() as conexion:
+            cursor = conexion.execute("""
+                UPDATE tareas SET estado = 'completada', resultado = ?, token = NULL
+                WHERE id = ? AND estado = 'en_curso' AND token = ?
+            """, (json.dumps(resultado), tarea.id, tarea.token))
+            return cursor.rowcount == 1
+
+    def fallar(self, tarea, error):
+        with self._conexion() as conexion:
+            fila = conexion.execute(
+                "SELECT intentos FROM tareas WHERE id = ? AND estado = 'en_curso' AND token = ?",
+                (tarea.id, tarea.token),
+            ).fetchone()
+            if fila is None:
+                return False
+            if fila[0] >= self.max_intentos:
+                conexion.execute("UPDATE tareas SET estado = 'fallida', error = ?, token = NULL WHERE id = ?",
+                                 (str(error), tarea.id))
+            else:
+                espera = self.segundos_espera_reintento * 2 ** (fila[0] - 1)
+                conexion.execute("""
+                    UPDATE tareas SET estado = 'pendiente', error = ?, token = NULL, disponible_desde = ?
+                    WHERE id = ?
+                """, (str(error), time.time() + espera, tarea.id))
+            return True
+
+    def resultados(self, tipo=None):
+        with self._conexion() as conexion:
+            consulta = "SELECT id, resultado FROM tareas WHERE estado = 'completada'"
+            parametros = ()
+            if tipo is not None:
+                consulta += " AND tipo = ?"
+                parametros = (tipo,)
+            return {id_tarea: json.loads(resultado) for id_tarea, resultado in conexion.execute(consulta, parametros)}
+
+    def contar(self):
+        with self._conexion() as conexion:
+            conteo = dict.fromkeys(ESTADOS, 0)
+            conteo.update(dict(conexion.execute("SELECT estado, COUNT(*) FROM tareas GROUP BY estado")))
+            return conteo
+
+
+class _Transaccion:
+    """
+    Abre una transacción exclusiva (BEGIN IMMEDIATE) y la confirma al salir.
+    """
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+
+    def __enter__(self):
+        self.conexion.execute("BEGIN IMMEDIATE")
+        return self.conexion
+
+    def __exit__(self, tipo_error, *exc):
+        self.conexion.execute("ROLLBACK" if tipo_error else "COMMIT")
+        return False
+
+
+class Trabajador:
+    """
+    Clase que toma tareas de una cola y las ejecuta con el manejador de su tipo.
+
+    manejadores es un diccionario tipo -> función(carga) -> resultado (JSON).
+    """
+
+    def __init__(self, cola, manejadores, nombre=None, segundos_alquiler=60):
+        self.cola = cola
+        self.manejadores = manejadores
+        self.nombre = nombre or f"trabajador-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.segundos_alquiler = segundos_alquiler
+        self.tareas_hechas = 0
+
+    def ejecutar(self, max_tareas=None, esperar_segundos=0.2, hasta_vaciar=True):
+        """
+        Función que procesa tareas hasta que la cola se vacíe (o hasta max_tareas).
+        """
+        while max_tareas is None or self.tareas_hechas < max_tareas:
+            tarea = self.cola.reclamar(self.nombre, self.segundos_alquiler)
+            if tarea is None:
+                if hasta_vaciar and self.cola.vacia():
+                    break
+                time.sleep(esperar_segundos)
+                continue
+            try:
+                resultado = self.manejadores[tarea.tipo](tarea.carga)
+            except Exception:
+                self.cola.fallar(tarea, traceback.format_exc(limit=3))
+            else:
+                self.cola.completar(tarea, resultado)
+                self.tareas_hechas += 1
+        return self.tareas_hechas
+
+
+# ---------- Manejadores de tareas de CLARIO ----------
+
+_pool_navegadores = None
+_bloqueo_pool = threading.Lock()
+
+
+def _pool_del_proceso():
+    """
+    Devuelve un PoolNavegadores de un solo navegador para este proceso,
+    abierto la primera vez que se lo pide y cerrado al terminar el proceso.
+    """
+    global _pool_navegadores
+    with _bloqueo_pool:
+        if _pool_navegadores is None:
+            from src.pool_navegadores import PoolNavegadores
+            _pool_navegadores = PoolNavegadores(tamano=1).__enter__()
+            atexit.register(_pool_navegadores.cerrar)
+        return _pool_navegadores
+
+
+def tarea_recolectar(carga):
+    """
+    Tarea de recolección: descarga las URLs de una fuente con ScraperBasico.
+
+    Las fuentes que necesitan JavaScript (como Instagram) usan el
+    navegador del proceso, que queda abierto entre tareas.
+    """
+    from src.scraper_basico import ScraperBasico
+    scraper = ScraperBasico()
+    pool = _pool_del_proceso() if carga['fuente'] in scraper.fuentes_con_javascript else None
+    return scraper.recolectar_paginas(carga['fuente'], carga['urls'], pool)
+
+
+def tarea_analizar_particion(carga):
+    """
+    Tarea de análisis: resume una partición de datos (archivo CSV o lista de
+    registros) en agregados pequeños que después se combinan centralmente.
+    """
+    if 'ruta_csv' in carga:
+        datos = pd.read_csv(carga['ruta_csv'])
+    else:
+        datos = pd.DataFrame(carga['registros'])
+    datos['fecha'] = pd.to_datetime(datos['fecha'])
+    datos = datos.sort_values('fecha', kind='stable')
+
+    grupos = datos.groupby('tendencia', sort=False)
+    por_tendencia = pd.DataFrame({
+        'primera_fecha': grupos['fecha'].first().dt.strftime('%Y-%m-%dT%H:%M:%S'),
+        'primer_valor': grupos['popularidad'].first(),
+        'ultima_fecha': grupos['fecha'].last().dt.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ultimo_valor': grupos['popularidad'].last(),
+        'cantidad': grupos.size(),
+    })
+    por_mes = datos.groupby(datos['fecha'].dt.month)['popularidad'].agg(['sum', 'count'])
+    return {
+        'por_tendencia': {tendencia: {clave: valor.item() if hasattr(valor, 'item') else valor
+                                      for clave, valor in fila.items()}
+                          for tendencia, fila in por_tendencia.iterrows()},
+        'por_mes': {str(mes): [float(fila['sum']), int(fila['count'])] for mes, fila in por_mes.iterrows()},
+    }
+
+
+def combinar_particiones(resultados):
+    """
+    Función que junta los resúmenes de todas las particiones en el
+    resultado de crecimiento y estacionalidad global.
+    """
+    extremos = {}
+    por_mes = {}
+    for resultado in resultados:
+        for tendencia, fila in resultado['por_tendencia'].items():
+            actual = extremos.setdefault(tendencia, dict(fila, cantidad=0))
+            if fila['primera_fecha'] < actual['primera_fecha']:
+                actual.update(primera_fecha=fila['primera_fecha'], primer_valor=fila['primer_valor'])
+            if fila['ultima_fecha'] >= actual['ultima_fecha']:
+                actual.update(ultima_fecha=fila['ultima_fecha'], ultimo_valor=fila['ultimo_valor'])
+            actual['cantidad'] += fila['cantidad']
+        for mes, (suma, cantidad) in resultado['por_mes'].items():
+            acumulado = por_mes.setdefault(int(mes), [0.0, 0])
+            acumulado[0] += suma
+            acumulado[1] += cantidad
+
+    analizador = AnalizadorTendencias()
+    crecimiento = {
+        tendencia: analizador.describir_crecimiento(fila['primer_valor'], fila['ultimo_valor'])
+        for tendencia, fila in extremos.items() if fila['cantidad'] > 1
+    }
+    popularidad_por_mes = {mes: suma / cantidad for mes, (suma, cantidad) in sorted(por_mes.items())}
+    return {'analisis_crecimiento': crecimiento, 'popularidad_por_mes': popularidad_por_mes}
+
+
+MANEJADORES_CLARIO = {
+    'recolectar': tarea_recolectar,
+    'analizar_particion': tarea_analizar_particion,
+}
+
+
+def _trabajar_en_proceso(ruta_archivo):
+    return Trabajador(ColaSQLite(ruta_archivo), MANEJADORES_CLARIO).ejecutar()
+
+
+def probar_cola_trabajo():
+    """
+    Función para probar la cola de trabajo con el backend SQLite local.
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+
+    print("📬 Probando Cola de Trabajo de CLARIO...")
+    print("=" * 60)
+
+    generador = np.random.default_rng(1)
+    fechas = pd.date_range('2024-01-01', periods=60, freq='D').strftime('%Y-%m-%d')
+    particiones = {
+        f"particion-{i}": {'registros': [
+            {'fecha': fecha, 'tendencia': f"Tendencia {j}", 'popularidad': int(generador.integers(50, 100))}
+            for fecha in fechas[i * 10:(i + 1) * 10] for j in range(200)
+        ]}
+        for i in range(6)
+    }
+
+    for cantidad_trabajadores in (1, 2):
+        ruta = os.path.join(tempfile.mkdtemp(), 'cola.db')
+        cola = ColaSQLite(ruta)
+        cola.encolar_lote('analizar_particion', particiones)
+        cola.encolar_lote('analizar_particion', particiones)  # repetido a propósito: no se duplica
+
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=cantidad_trabajadores) as ejecutor:
+            hechas = sum(ejecutor.map(_trabajar_en_proceso, [ruta] * cantidad_trabajadores))
+        duracion = time.perf_counter() - inicio
+
+        global_ = combinar_particiones(cola.resultados('analizar_particion').values())
+        print(f"⚡ {cantidad_trabajadores} trabajador(es): {hechas} tareas en {duracion:.2f}s, "
+              f"{len(global_['analisis_crecimiento'])} tendencias combinadas, estados: {cola.contar()}")
+
+    print("🎯 Cola de trabajo probada exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_cola_trabajo()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Correlaciones entre Tendencias
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para medir qué tendencias se mueven juntas y cuáles se adelantan a otras
+"""
+
+# Importar módulos necesarios
+import numpy as np
+import pandas as pd
+
+
+def pivotar_matriz(datos, frecuencia='D'):
+    """
+    Función que convierte los datos en una matriz tendencia × tiempo.
+
+    Cada fila es una tendencia y cada columna un día (o la frecuencia
+    pedida). Los días sin datos quedan como NaN. Se hace una sola vez
+    y todos los cálculos siguientes trabajan sobre esta matriz.
+    """
+    clave = 'tendencia_id' if 'tendencia_id' in datos.columns else 'tendencia'
+    tabla = datos.pivot_table(
+        index=clave,
+        columns=pd.Grouper(key='fecha', freq=frecuencia),
+        values='popularidad',
+        aggfunc='mean',
+        observed=True,
+    )
+    fechas = pd.date_range(tabla.columns.min(), tabla.columns.max(), freq=frecuencia)
+    tabla = tabla.reindex(columns=fechas)
+    if clave == 'tendencia_id':
+        nombres = datos.groupby('tendencia_id', observed=True)['tendencia'].first().reindex(tabla.index)
+    else:
+        nombres = tabla.index.to_series()
+    return tabla.to_numpy(dtype=np.float64), list(nombres), fechas
+
+
+class MotorCorrelaciones:
+    """
+    Clase que calcula correlaciones entre todas las tendencias a la vez.
+
+    ¿Qué es una "correlación"? Es un número entre -1 y 1 que dice si dos
+    tendencias suben y bajan juntas (1), al revés (-1) o sin relación (0).
+
+    Las series se estandarizan una vez; así la matriz de correlaciones
+    completa es un único producto de matrices (que NumPy resuelve con
+    BLAS). Para miles de tendencias se calcula por bloques y se guardan
+    solo las k más parecidas a cada una.
+    """
+
+    def __init__(self, matriz, nombres):
+        """
+        Constructor de la clase MotorCorrelaciones.
+
+        matriz: arreglo (tendencias × tiempo), puede tener NaN.
+        """
+        self.nombres = list(nombres)
+        self.estandarizada = self._estandarizar(np.asarray(matriz, dtype=np.float64))
+
+    @classmethod
+    def desde_datos(cls, datos, frecuencia='D'):
+        matriz, nombres, _ = pivotar_matriz(datos, frecuencia)
+        return cls(matriz, nombres)
+
+    @staticmethod
+    def _estandarizar(matriz):
+        """
+        Centra cada fila en 0 y la escala a largo 1. Los huecos (NaN)
+        quedan en 0, es decir, en el promedio de la serie.
+        """
+        centrada = matriz - np.nanmean(matriz, axis=1, keepdims=True)
+        centrada = np.nan_to_num(centrada, nan=0.0)
+        normas = np.linalg.norm(centrada, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        return centrada / normas
+
+    def matriz_correlacion(self):
+        """
+        Función que devuelve la matriz completa de correlaciones (n × n).
+
+        Solo conviene para cientos o pocos miles de tendencias.
+        """
+        correlaciones = self.estandarizada @ self.estandarizada.T
+        np.clip(correlaciones, -1.0, 1.0, out=correlaciones)
+        return pd.DataFrame(correlaciones, index=self.nombres, columns=self.nombres)
+
+    def top_correlaciones(self, k=5, tamano_bloque=1024):
+        """
+        Función que devuelve, para cada tendencia, las k más correlacionadas.
+
+        Se ordena por el valor absoluto: una correlación de -0.88 (cuando
+        una sube, la otra baja) es tan fuerte como una de +0.88.
+
+        Calcula la matriz de a bloques de filas: la memoria usada es
+        tamano_bloque × n en lugar de n × n.
+        """
+        cantidad = len(self.nombres)
+        k = min(k, cantidad - 1)
+        if k <= 0:
+            return pd.DataFrame(columns=['tendencia', 'relacionada', 'correlacion'])
+
+        filas, columnas, valores = [], [], []
+        for inicio in range(0, cantidad, tamano_bloque):
+            fin = min(inicio + tamano_bloque, cantidad)
+            bloque = self.estandarizada[inicio:fin] @ self.estandarizada.T
+            # Una tendencia no cuenta como relacionada consigo misma
+            bloque[np.arange(fin - inicio), np.arange(inicio, fin)] = 0.0
+            mejores = np.argpartition(-np.abs(bloque), k - 1, axis=1)[:, :k]
+            filas.append(np.repeat(np.arange(inicio, fin), k))
+            columnas.append(mejores.ravel())
+            valores.append(np.take_along_axis(bloque, mejores, axis=1).ravel())
+
+        filas, columnas, valores = np.concatenate(filas), np.concatenate(columnas), np.concatenate(valores)
+        nombres = np.asarray(self.nombres, dtype=object)
+        resultado = pd.DataFrame({
+            'tendencia': nombres[filas],
+            'relacionada': nombres[columnas],
+            'correlacion': np.clip(valores, -1.0, 1.0),
+        })
+        resultado['fuerza'] = resultado['correlacion'].abs()
+        resultado = resultado.sort_values(['tendencia', 'fuerza'], ascending=[True, False], ignore_index=True)
+        return resultado.drop(columns='fuerza')
+
+    def adelantos(self, pares=None, retraso_maximo=14, tamano_lote=4096):
+        """
+        Función que calcula correlaciones con retraso para encontrar qué
+        tendencia se adelanta a otra.
+
+        ¿Qué es un "adelanto"? Si lo que hace 'Vintage' hoy lo hace
+        'Streetwear' 7 días después, 'Vintage' lidera a 'Streetwear' con
+        un retraso de 7.
+
+        Usa la FFT: la correlación para todos los retrasos de un par sale
+        de una multiplicación en frecuencia. pares es una lista de
+        (i, j) de posiciones; por defecto todos los pares (solo para n chico).
+        """
+        cantidad, largo = self.estandarizada.shape
+        if pares is None:
+            i, j = np.triu_indices(cantidad, k=1)
+        else:
+            pares = np.asarray(pares, dtype=np.int64).reshape(-1, 2)
+            i, j = pares[:, 0], pares[:, 1]
+        retraso_maximo = min(retraso_maximo, largo - 1)
+
+        # Rellenar con ceros para que la correlación no "dé la vuelta"
+        tamano_fft = 1 << int(np.ceil(np.log2(2 * largo)))
+        espectro = np.fft.rfft(self.estandarizada, n=tamano_fft, axis=1)
+        retrasos = np.r_[0:retraso_maximo + 1, -retraso_maximo:0]
+        posiciones = retrasos % tamano_fft
+
+        mejores_retrasos, mejores_valores = [], []
+        for inicio in range(0, len(i), tamano_lote):
+            lote_i, lote_j = i[inicio:inicio + tamano_lote], j[inicio:inicio + tamano_lote]
+            # cruzada[l] = suma_t a[t + l] * b[t]
+            cruzada = np.fft.irfft(espectro[lote_i] * np.conj(espectro[lote_j]), n=tamano_fft, axis=1)[:, posiciones]
+            mejor = np.abs(cruzada).argmax(axis=1)
+            mejores_retrasos.append(retrasos[mejor])
+            mejores_valores.append(cruzada[np.arange(len(lote_i)), mejor])
+
+        retraso = np.concatenate(mejores_retrasos) if mejores_retrasos else np.zeros(0, dtype=np.int64)
+        valor = np.concatenate(mejores_valores) if mejores_valores else np.zeros(0)
+        nombres = np.asarray(self.nombres, dtype=object)
+        # retraso > 0: la primera tendencia repite a la segunda (la segunda lidera)
+        lider = np.where(retraso > 0, nombres[j], nombres[i])
+        seguidor = np.where(retraso > 0, nombres[i], nombres[j])
+        resultado = pd.DataFrame({
+            'lider': lider,
+            'seguidor': seguidor,
+            'retraso': np.abs(retraso),
+            'correlacion': np.clip(valor, -1.0, 1.0),
+        })
+        return resultado.sort_values('correlacion', key=np.abs, ascending=False, ignore_index=True)
+
+    def adelantos_top(self, k=5, retraso_maximo=14, tamano_bloque=1024):
+        """
+        Función que calcula adelantos solo para los k vecinos más
+        correlacionados de cada tendencia (apto para 10.000+ tendencias).
+        """
+        posicion = {nombre: indice for indice, nombre in enumerate(self.nombres)}
+        vecinos = self.top_correlaciones(k, tamano_bloque)
+        pares = np.column_stack([vecinos['tendencia'].map(posicion), vecinos['relacionada'].map(posicion)])
+        # Cada par aparece dos veces (a-b y b-a): quedarse con uno
+        pares = np.unique(np.sort(pares, axis=1), axis=0)
+        return self.adelantos(pares, retraso_maximo)
+
+
+def probar_correlaciones():
+    """
+    Función para probar el motor de correlaciones.
+    """
+    print("🔗 Probando Motor de Correlaciones de CLARIO...")
+    print("=" * 60)
+
+    generador = np.random.default_rng(7)
+    fechas = pd.date_range('2024-01-01', periods=120, freq='D')
+    base = np.convolve(generador.normal(0, 1, 130), np.ones(3) / 3, mode='same')
+    series = {
+        'Vintage': base[10:],
+        'Streetwear': base[3:123] + generador.normal(0, 0.3, 120),   # repite a Vintage 7 días después
+        'Minimalista': -base[10:] + generador.normal(0, 0.3, 120),  # opuesta a Vintage
+        'Colorido': generador.normal(0, 1, 120),                     # sin relación
+    }
+    datos = pd.DataFrame([
+        {'fecha': fecha, 'tendencia': nombre, 'popularidad': 70 + 5 * valores[t]}
+        for nombre, valores in series.items() for t, fecha in enumerate(fechas)
+    ])
+
+    motor = MotorCorrelaciones.desde_datos(datos)
+    print(motor.matriz_correlacion().round(2))
+    print()
+    print(motor.top_correlaciones(k=1))
+    print()
+    print(motor.adelantos(retraso_maximo=14).head(3))
+
+    print("🎯 Motor de correlaciones probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_correlaciones()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Dashboard en Vivo
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Dashboard web (Streamlit) que se actualiza solo con los datos que va guardando el demonio
+
+Cómo abrirlo (desde la carpeta del proyecto):
+    python main.py --demonio                         (en una terminal: recolecta y guarda en data/lago)
+    python -m streamlit run src/dashboard_en_vivo.py (en otra terminal: abre el dashboard)
+"""
+
+# Importar módulos necesarios
+import io
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.dashboard_simple import DashboardSimple
+from src.lago_datos import LagoDatos, extraer_registros
+
+DIRECTORIO_LAGO = "data/lago"
+SEGUNDOS_CACHE = 60
+SEGUNDOS_ENTRE_LECTURAS = 5
+MAX_PUNTOS = 500
+# 'W' son semanas de calendario (de lunes a domingo), no bloques de 7 días
+FRECUENCIAS = {'Hora': '60min', 'Día': 'D', 'Semana': 'W'}
+FRECUENCIA_BASE = FRECUENCIAS['Hora']
+HORAS_RETENCION = 24 * 90
+COLUMNAS = ['fecha', 'tendencia', 'popularidad', 'categoria', 'fuente']
+CLAVES_AGREGADO = ['fecha', 'categoria', 'tendencia']
+
+# matplotlib no es seguro entre hilos y Streamlit atiende a cada visitante en un hilo
+_bloqueo_graficos = threading.Lock()
+
+
+class FuenteEnVivo:
+    """
+    Clase que mantiene en memoria los datos del lago y los va completando.
+
+    ¿Por qué no releer todo el lago en cada actualización? Porque el lago
+    solo crece: alcanza con recordar hasta dónde se leyó cada segmento
+    y traer lo nuevo (el "delta"). Además, aunque haya muchos visitantes
+    mirando el dashboard, el lago se lee como mucho una vez cada
+    segundos_entre_lecturas; los demás reciben lo que ya está en memoria.
+
+    No se guardan las filas crudas: cada delta se suma a un "agregado"
+    por hora, categoría y tendencia (suma y cantidad de popularidad). Así
+    la memoria y el trabajo de cada actualización dependen de las horas
+    guardadas, no de cuántas filas llegaron. Las horas más viejas que
+    horas_retencion se descartan (None = guardar todo).
+    """
+
+    def __init__(self, directorio_lago=DIRECTORIO_LAGO, segundos_entre_lecturas=SEGUNDOS_ENTRE_LECTURAS,
+                 horas_retencion=HORAS_RETENCION):
+        """
+        Constructor de la clase FuenteEnVivo.
+        """
+        self.lago = LagoDatos(directorio_lago)
+        self.segundos_entre_lecturas = segundos_entre_lecturas
+        self.horas_retencion = horas_retencion
+        self.posiciones = {}
+        self.agregado = pd.DataFrame(columns=[*CLAVES_AGREGADO, 'suma', 'cantidad'])
+        self.registros = 0
+        self.version = 0
+        # Distingue esta fuente de una anterior (si Streamlit la vuelve a crear,
+        # su contador arranca de nuevo en 0 y no debe reusar claves de caché viejas)
+        self.identificador = uuid.uuid4().hex
+        self.ultima_actualizacion = None
+        self._ultima_lectura = -np.inf
+        self._bloqueo = threading.Lock()
+
+    def actualizar(self):
+        """
+        Función que trae del lago solo lo nuevo desde la última lectura.
+
+        Devuelve (version, agregado). La versión es el par (identificador,
+        contador): cambia solo si llegaron datos, y sirve como clave de caché
+        para todo lo que se calcula encima.
+        """
+        with self._bloqueo:
+            if time.monotonic() - self._ultima_lectura < self.segundos_entre_lecturas:
+                return (self.identificador, self.version), self.agregado
+            self._ultima_lectura = time.monotonic()
+
+            nuevos = pd.DataFrame.from_records(
+                ({columna: registro.get(columna) for columna in COLUMNAS}
+                 for registro in extraer_registros(self.lago.novedades(self.posiciones))),
+                columns=COLUMNAS
+            )
+            if len(nuevos):
+                nuevos['fecha'] = pd.to_datetime(nuevos['fecha'])
+                nuevos['popularidad'] = pd.to_numeric(nuevos['popularidad'], errors='coerce')
+                nuevos = nuevos.dropna(subset=['fecha', 'tendencia', 'popularidad'])
+            if len(nuevos):
+                # Se arma un DataFrame nuevo (no se modifica el anterior): quien
+                # esté usando la versión previa no ve cambios a mitad de camino
+                self.agregado = self._sumar_al_agregado(agregar_por_hora(nuevos))
+                self.registros += len(nuevos)
+                self.version += 1
+                self.ultima_actualizacion = datetime.now()
+            return (self.identificador, self.version), self.agregado
+
+    def _sumar_al_agregado(self, parcial):
+        """
+        Función que suma un agregado parcial (del delta) al agregado guardado
+        y descarta las horas que quedaron fuera de la retención.
+        """
+        if len(self.agregado):
+            agregado = (pd.concat([self.agregado, parcial], ignore_index=True)
+                        .groupby(CLAVES_AGREGADO, as_index=False, dropna=False, observed=True).sum())
+        else:
+            agregado = parcial
+        if self.horas_retencion is not None:
+            limite = agregado['fecha'].max() - pd.Timedelta(hours=self.horas_retencion)
+            agregado = agregado[agregado['fecha'] >= limite].reset_index(drop=True)
+        return agregado
+
+
+def agregar_por_hora(datos):
+    """
+    Función que resume filas sueltas en suma y cantidad de popularidad
+    por hora, categoría y tendencia.
+
+    Se guardan suma y cantidad (no el promedio) para poder sumar agregados
+    de distintos deltas y después calcular el promedio exacto.
+    """
+    grupos = datos.groupby([datos['fecha'].dt.floor(FRECUENCIA_BASE), 'categoria', 'tendencia'],
+                           dropna=False, observed=True)['popularidad']
+    return grupos.agg(suma='sum', cantidad='count').reset_index()
+
+
+def inicio_periodo(fechas, frecuencia):
+    """
+    Función que lleva cada fecha al comienzo de su período (hora, día o semana).
+
+    Las semanas no se pueden "redondear" con floor (contaría bloques de 7
+    días desde 1970, que empiezan en jueves): se usan períodos de calendario.
+    """
+    if frecuencia.startswith('W'):
+        return fechas.dt.to_period(frecuencia).dt.start_time
+    return fechas.dt.floor(frecuencia)
+
+
+def tabla_por_periodo(agregado, frecuencia='D', categoria=None):
+    """
+    Función que pasa el agregado por hora al formato de DashboardSimple:
+    una columna 'fecha' (por hora, día o semana) y una columna por tendencia
+    con la popularidad promedio de ese período.
+    """
+    if categoria is not None:
+        agregado = agregado[agregado['categoria'] == categoria]
+    grupos = agregado.groupby([inicio_periodo(agregado['fecha'], frecuencia), 'tendencia'],
+                              observed=True)[['suma', 'cantidad']].sum()
+    tabla = (grupos['suma'] / grupos['cantidad']).unstack('tendencia')
+    tabla.columns = [str(columna) for columna in tabla.columns]
+    return tabla.rename_axis('fecha').reset_index()
+
+
+def reducir_puntos(tabla, max_puntos=MAX_PUNTOS):
+    """
+    Función que reduce una serie larga a max_puntos promediando grupos
+    de filas consecutivas, antes de mandarla al navegador.
+
+    Una pantalla no muestra más de unos cientos de puntos por línea:
+    mandar 100.000 solo hace más lento el dashboard.
+    """
+    if len(tabla) <= max_puntos:
+        return tabla
+    filas_por_grupo = -(-len(tabla) // max_puntos)
+    grupos = np.arange(len(tabla)) // filas_por_grupo
+    agregaciones = {columna: 'mean' for columna in tabla.columns}
+    agregaciones['fecha'] = 'first'
+    return tabla.groupby(grupos).agg(agregaciones).reset_index(drop=True)
+
+
+def figura_a_png(figura):
+    """
+    Función que convierte una figura de matplotlib en bytes PNG y la libera.
+    """
+    buffer = io.BytesIO()
+    figura.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    plt.close(figura)
+    return buffer.getvalue()
+
+
+# ---------- Consultas compartidas entre todos los visitantes ----------
+# Los argumentos que empiezan con "_" no forman parte de la clave de la
+# caché: la clave es la versión de los datos y las opciones elegidas.
+
+@st.cache_resource(show_spinner=False)
+def obtener_fuente(directorio_lago=DIRECTORIO_LAGO):
+    """Una única FuenteEnVivo para todo el servidor."""
+    return FuenteEnVivo(directorio_lago)
+
+
+@st.cache_data(ttl=SEGUNDOS_CACHE, max_entries=32, show_spinner=False)
+def consultar_tabla(_agregado, version, categoria, frecuencia):
+    return tabla_por_periodo(_agregado, frecuencia, categoria)
+
+
+@st.cache_data(ttl=SEGUNDOS_CACHE, max_entries=32, show_spinner=False)
+def consultar_resumen(_agregado, version, categoria, frecuencia):
+    return DashboardSimple().calcular_resumen(consultar_tabla(_agregado, version, categoria, frecuencia))
+
+
+@st.cache_data(ttl=SEGUNDOS_CACHE, max_entries=32, show_spinner="Dibujando gráficos...")
+def consultar_graficos(_agregado, version, categoria, frecuencia, max_puntos, max_tendencias):
+    """
+    Función que dibuja los gráficos de DashboardSimple una sola vez por
+    versión de datos y opciones, y devuelve las imágenes PNG.
+    """
+    tabla = consultar_tabla(_agregado, version, categoria, frecuencia)
+    resumen = consultar_resumen(_agregado, version, categoria, frecuencia)
+    principales = resumen.nlargest(max_tendencias, 'promedio')
+    titulo = categoria or "todas las categorías"
+
+    dashboard = DashboardSimple()
+    with _bloqueo_graficos:
+        return {
+            'lineas': figura_a_png(dashboard.dibujar_lineas(
+                reducir_puntos(tabla[['fecha', *principales.index]], max_puntos),
+                f"Evolución de Tendencias de {titulo}")),
+            'barras': figura_a_png(dashboard.dibujar_barras(principales, f"Popularidad Promedio de {titulo}")),
+            'circular': figura_a_png(dashboard.dibujar_circular(principales, f"Distribución de {titulo}")),
+        }
+
+
+def mostrar_dashboard():
+    """
+    Función que dibuja la página de Streamlit (se ejecuta al abrirla y cada
+    vez que el visitante cambia una opción).
+    """
+    st.set_page_config(page_title="CLARIO en vivo", page_icon="📊", layout="wide")
+    st.title("📊 CLARIO - Tendencias en vivo")
+
+    fuente = obtener_fuente()
+    _, agregado = fuente.actualizar()
+
+    # Opciones del visitante (no cambian lo que se lee, solo qué se muestra)
+    with st.sidebar:
+        categorias = sorted(agregado['categoria'].dropna().unique()) if len(agregado) else []
+        eleccion = st.selectbox("Categoría", ["Todas", *categorias])
+        categoria = None if eleccion == "Todas" else eleccion
+        frecuencia = FRECUENCIAS[st.selectbox("Agrupar por", list(FRECUENCIAS), index=1)]
+        max_tendencias = st.slider("Tendencias en los gráficos", 3, 20, 8)
+        max_puntos = st.slider("Puntos máximos por línea", 100, 2000, MAX_PUNTOS, step=100)
+        automatico = st.checkbox("Actualizar automáticamente", value=True)
+        segundos_refresco = st.slider("Segundos entre actualizaciones", 5, 120, 15)
+
+    # Solo esta parte se vuelve a ejecutar sola cada segundos_refresco; entre
+    # una vez y otra el hilo del visitante queda libre (nada de sleep)
+    contenido = st.fragment(mostrar_datos, run_every=segundos_refresco if automatico else None)
+    contenido(fuente, categoria, frecuencia, max_puntos, max_tendencias)
+
+
+def mostrar_datos(fuente, categoria, frecuencia, max_puntos, max_tendencias):
+    """
+    Función que dibuja las métricas, los gráficos y la tabla con lo último del lago.
+    """
+    version, agregado = fuente.actualizar()
+    if agregado.empty:
+        st.info(f"⏳ Esperando datos en '{fuente.lago.directorio}'. ¿Está corriendo `python main.py --demonio`?")
+        return
+
+    resumen = consultar_resumen(agregado, version, categoria, frecuencia)
+    graficos = consultar_graficos(agregado, version, categoria, frecuencia, max_puntos, max_tendencias)
+
+    columnas = st.columns(3)
+    columnas[0].metric("Registros", f"{fuente.registros:,}")
+    columnas[1].metric("Tendencias", len(resumen))
+    columnas[2].metric("Última actualización", fuente.ultima_actualizacion.strftime("%H:%M:%S"))
+
+    st.image(graficos['lineas'], use_column_width=True)
+    izquierda, derecha = st.columns(2)
+    izquierda.image(graficos['barras'], use_column_width=True)
+    derecha.image(graficos['circular'], use_column_width=True)
+
+    st.subheader("📋 Tabla resumen")
+    st.dataframe(DashboardSimple().armar_tabla_resumen(resumen), hide_index=True, use_container_width=True)
+
+
+def probar_dashboard_en_vivo():
+    """
+    Función para probar la parte de datos del dashboard en vivo (sin abrir el navegador).
+    """
+    import tempfile
+
+    print("📺 Probando Dashboard en Vivo de CLARIO...")
+    print("=" * 60)
+
+    directorio = tempfile.mkdtemp()
+    generador = np.random.default_rng(0)
+    tendencias = ['Streetwear', 'Vintage', 'Minimalista', 'Colorido', 'Deportivo']
+
+    def recolectar(lago, desde, horas):
+        for hora in range(horas):
+            fecha = desde + pd.Timedelta(hours=hora)
+            lago.agregar('Twitter', [
+                {'fecha': fecha.isoformat(), 'tendencia': tendencia, 'categoria': 'Ropa',
+                 'popularidad': int(generador.integers(50, 100))}
+                for tendencia in tendencias
+            ], fecha)
+        lago.vaciar()
+
+    escritor = LagoDatos(directorio)
+    recolectar(escritor, pd.Timestamp('2024-01-01'), 24 * 60)
+
+    fuente = FuenteEnVivo(directorio, segundos_entre_lecturas=0)
+    inicio = time.perf_counter()
+    version, agregado = fuente.actualizar()
+    print(f"📥 Primera lectura: {fuente.registros} registros -> {len(agregado)} filas agregadas "
+          f"(versión {version[1]}) en {time.perf_counter() - inicio:.3f}s")
+
+    recolectar(escritor, pd.Timestamp('2024-03-01'), 24)
+    inicio = time.perf_counter()
+    version, agregado = fuente.actualizar()
+    print(f"➕ Solo el delta: {fuente.registros} registros -> {len(agregado)} filas agregadas "
+          f"(versión {version[1]}) en {time.perf_counter() - inicio:.3f}s")
+
+    tabla = tabla_por_periodo(agregado, FRECUENCIAS['Hora'])
+    reducida = reducir_puntos(tabla)
+    print(f"📉 Serie por hora: {len(tabla)} puntos -> {len(reducida)} enviados al navegador")
+
+    semanas = tabla_por_periodo(agregado, FRECUENCIAS['Semana'])
+    print(f"📆 Serie por semana: {len(semanas)} puntos, la primera empieza el lunes "
+          f"{semanas['fecha'].iloc[0]:%d/%m/%Y}")
+
+    dashboard = DashboardSimple()
+    png = figura_a_png(dashboard.dibujar_lineas(reducida, "Evolución de Tendencias"))
+    print(f"🖼️ Gráfico de líneas: {len(png) / 1024:.0f} KB")
+
+    print("🎯 Dashboard en vivo probado exitosamente!")
+
+
+# Punto de entrada: con "streamlit run" se muestra la página; con "python -m" se prueba
+if __name__ == "__main__":
+    if st.runtime.exists():
+        mostrar_dashboard()
+    else:
+        probar_dashboard_en_vivo()
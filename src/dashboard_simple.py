@@ -14,8 +14,27 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import hashlib
 import os
 
+def primer_valor_valido(arreglo, desde_el_final=False, tamano_bloque=4096):
+    """
+    Función que devuelve el primer valor no vacío de un arreglo (o el
+    último, con desde_el_final=True), o NaN si están todos vacíos.
+
+    Revisa de a bloques desde la punta y se detiene en el primero que
+    tiene un valor: casi siempre mira solo unas pocas filas, sin copiar
+    ni recorrer toda la columna.
+    """
+    inicios = range(0, len(arreglo), tamano_bloque)
+    for inicio in reversed(inicios) if desde_el_final else inicios:
+        bloque = arreglo[inicio:inicio + tamano_bloque]
+        validos = np.flatnonzero(pd.notna(bloque))
+        if len(validos):
+            return bloque[validos[-1] if desde_el_final else validos[0]]
+    return np.nan
+
+
 class DashboardSimple:
     """
     Clase para crear visualizaciones y dashboards de datos.
@@ -27,9 +46,14 @@ class DashboardSimple:
     4. Permite al usuario explorar los datos fácilmente
     """
     
-    def __init__(self):
+    def __init__(self, carpeta_salida="data", mostrar=True):
         """
         Constructor de la clase DashboardSimple.
+        
+        carpeta_salida es donde se guardan los gráficos y tablas (por
+        ejemplo, una carpeta por categoría). Con mostrar=False los
+        gráficos solo se guardan, sin abrir ventanas (para generar
+        muchos dashboards seguidos).
         """
         self.nombre = "Dashboard Simple CLARIO"
         self.version = "1.0"
@@ -40,6 +64,9 @@ class DashboardSimple:
             "gráfico de dispersión",
             "tabla de datos"
         ]
+        self.carpeta_salida = carpeta_salida
+        self.mostrar = mostrar
+        self.colores = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFB347', '#B39DDB', '#F06292', '#81C784']
         
         # Configurar estilo de matplotlib para gráficos más bonitos
         plt.style.use('default')
@@ -74,7 +101,73 @@ class DashboardSimple:
         print("✅ Datos de ejemplo creados exitosamente")
         return df_moda
     
-    def crear_grafico_barras(self, datos, titulo="Gráfico de Barras"):
+    def columnas_tendencias(self, datos):
+        """
+        Función que devuelve las columnas de tendencias (todas menos 'fecha').
+        """
+        return [columna for columna in datos.columns if columna != 'fecha']
+    
+    def etiqueta(self, columna):
+        """
+        Función que convierte un nombre de columna en una etiqueta para el gráfico.
+        """
+        return columna[:1].upper() + columna[1:]
+    
+    def colores_para(self, cantidad):
+        """
+        Función que devuelve un color por tendencia, repitiendo la paleta si hace falta.
+        """
+        return [self.colores[i % len(self.colores)] for i in range(cantidad)]
+    
+    def ruta_salida(self, prefijo, extension):
+        """
+        Función que arma la ruta de un archivo de salida con fecha y hora.
+        """
+        os.makedirs(self.carpeta_salida, exist_ok=True)
+        return os.path.join(self.carpeta_salida, f"{prefijo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
+    
+    def calcular_resumen(self, datos, carpeta_cache=None, huella=None):
+        """
+        Función que calcula de una sola vez los números que usan todos los
+        gráficos y la tabla: promedio, suma, máximo, mínimo, primer y
+        último valor de cada tendencia (el primero y el último que no
+        están vacíos: una tendencia que aparece tarde no da NaN).
+        
+        ¿Por qué de una sola vez? Antes cada gráfico recorría todas las
+        columnas por su cuenta. Ahora hay un único "agg" vectorizado y
+        todos leen de este resumen (un "cubo" chiquito: una fila por tendencia).
+        
+        Si se indican carpeta_cache y huella (algo que cambie cuando cambian
+        los datos, por ejemplo su versión), el resumen se guarda en disco y
+        se reutiliza mientras la huella y las columnas sean las mismas. Sin
+        huella no se usa la caché: calcularla recorrería todos los datos,
+        que es lo mismo que cuesta calcular el resumen.
+        """
+        columnas = self.columnas_tendencias(datos)
+        
+        ruta_cache = None
+        if carpeta_cache is not None and huella is not None:
+            # Los nombres y tipos de las columnas también forman la clave:
+            # la misma versión con otras tendencias son otros datos
+            esquema = repr([(str(columna), str(tipo)) for columna, tipo in datos.dtypes.items()])
+            clave = hashlib.sha1(f"{huella}\x1f{esquema}".encode('utf-8')).hexdigest()
+            ruta_cache = os.path.join(carpeta_cache, f"resumen_{clave}.pkl")
+            if os.path.exists(ruta_cache):
+                print("♻️ Resumen del dashboard recuperado de la caché")
+                return pd.read_pickle(ruta_cache)
+        
+        valores = datos[columnas]
+        resumen = valores.agg(['mean', 'sum', 'max', 'min']).T
+        resumen.columns = ['promedio', 'suma', 'maximo', 'minimo']
+        resumen['primero'] = [primer_valor_valido(valores[columna].to_numpy()) for columna in columnas]
+        resumen['ultimo'] = [primer_valor_valido(valores[columna].to_numpy(), desde_el_final=True) for columna in columnas]
+        
+        if ruta_cache is not None:
+            os.makedirs(carpeta_cache, exist_ok=True)
+            resumen.to_pickle(ruta_cache)
+        return resumen
+    
+    def crear_grafico_barras(self, datos, titulo="Gráfico de Barras", resumen=None):
         """
         Función que crea un gráfico de barras.
         
@@ -83,25 +176,41 @@ class DashboardSimple:
         """
         print(f"�� Creando gráfico de barras: {titulo}")
         
+        if resumen is None:
+            resumen = self.calcular_resumen(datos)
+        fig = self.dibujar_barras(resumen, titulo)
+        
+        # Guardar el gráfico
+        nombre_archivo = self.ruta_salida("grafico_barras", "png")
+        fig.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
+        print(f"✅ Gráfico guardado en: {nombre_archivo}")
+        
+        # Mostrar el gráfico (si corresponde) y liberar la figura
+        if self.mostrar:
+            plt.show()
+        plt.close(fig)
+        
+        return nombre_archivo
+    
+    def dibujar_barras(self, resumen, titulo="Gráfico de Barras"):
+        """
+        Función que dibuja el gráfico de barras a partir del resumen y
+        devuelve la figura (sin guardarla), para reutilizarla en la web.
+        """
         # Crear figura y ejes
         fig, ax = plt.subplots(figsize=(10, 6))
         
         # Preparar datos para el gráfico
-        categorias = ['Streetwear', 'Vintage', 'Minimalista', 'Deportivo']
-        valores = [
-            datos['streetwear'].mean(),
-            datos['vintage'].mean(),
-            datos['minimalista'].mean(),
-            datos['deportivo'].mean()
-        ]
+        categorias = [self.etiqueta(columna) for columna in resumen.index]
+        valores = resumen['promedio'].tolist()
         
         # Crear el gráfico de barras
-        barras = ax.bar(categorias, valores, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
+        barras = ax.bar(categorias, valores, color=self.colores_para(len(resumen)))
         
         # Personalizar el gráfico
         ax.set_title(titulo, fontsize=16, fontweight='bold', pad=20)
         ax.set_ylabel('Popularidad Promedio', fontsize=12)
-        ax.set_xlabel('Tendencias de Moda', fontsize=12)
+        ax.set_xlabel('Tendencias', fontsize=12)
         
         # Agregar valores en las barras
         for barra, valor in zip(barras, valores):
@@ -113,15 +222,7 @@ class DashboardSimple:
         ax.grid(axis='y', alpha=0.3)
         ax.set_ylim(0, max(valores) * 1.1)
         
-        # Guardar el gráfico
-        nombre_archivo = f"data/grafico_barras_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
-        print(f"✅ Gráfico guardado en: {nombre_archivo}")
-        
-        # Mostrar el gráfico
-        plt.show()
-        
-        return nombre_archivo
+        return fig
     
     def crear_grafico_lineas(self, datos, titulo="Evolución de Tendencias"):
         """
@@ -132,14 +233,31 @@ class DashboardSimple:
         """
         print(f"�� Creando gráfico de líneas: {titulo}")
         
+        fig = self.dibujar_lineas(datos, titulo)
+        
+        # Guardar el gráfico
+        nombre_archivo = self.ruta_salida("grafico_lineas", "png")
+        fig.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
+        print(f"✅ Gráfico guardado en: {nombre_archivo}")
+        
+        # Mostrar el gráfico (si corresponde) y liberar la figura
+        if self.mostrar:
+            plt.show()
+        plt.close(fig)
+        
+        return nombre_archivo
+    
+    def dibujar_lineas(self, datos, titulo="Evolución de Tendencias"):
+        """
+        Función que dibuja el gráfico de líneas y devuelve la figura (sin guardarla).
+        """
         # Crear figura y ejes
         fig, ax = plt.subplots(figsize=(12, 8))
         
         # Crear el gráfico de líneas para cada tendencia
-        ax.plot(datos['fecha'], datos['streetwear'], label='Streetwear', linewidth=2, color='#FF6B6B')
-        ax.plot(datos['fecha'], datos['vintage'], label='Vintage', linewidth=2, color='#4ECDC4')
-        ax.plot(datos['fecha'], datos['minimalista'], label='Minimalista', linewidth=2, color='#45B7D1')
-        ax.plot(datos['fecha'], datos['deportivo'], label='Deportivo', linewidth=2, color='#96CEB4')
+        columnas = self.columnas_tendencias(datos)
+        for columna, color in zip(columnas, self.colores_para(len(columnas))):
+            ax.plot(datos['fecha'], datos[columna], label=self.etiqueta(columna), linewidth=2, color=color)
         
         # Personalizar el gráfico
         ax.set_title(titulo, fontsize=16, fontweight='bold', pad=20)
@@ -152,22 +270,14 @@ class DashboardSimple:
         ax.set_ylim(0, 100)
         
         # Rotar etiquetas del eje X para mejor legibilidad
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Ajustar el diseño
-        plt.tight_layout()
-        
-        # Guardar el gráfico
-        nombre_archivo = f"data/grafico_lineas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
-        print(f"✅ Gráfico guardado en: {nombre_archivo}")
+        fig.tight_layout()
         
-        # Mostrar el gráfico
-        plt.show()
-        
-        return nombre_archivo
+        return fig
     
-    def crear_grafico_circular(self, datos, titulo="Distribución de Tendencias"):
+    def crear_grafico_circular(self, datos, titulo="Distribución de Tendencias", resumen=None):
         """
         Función que crea un gráfico circular.
         
@@ -176,20 +286,36 @@ class DashboardSimple:
         """
         print(f"🥧 Creando gráfico circular: {titulo}")
         
+        if resumen is None:
+            resumen = self.calcular_resumen(datos)
+        fig = self.dibujar_circular(resumen, titulo)
+        
+        # Guardar el gráfico
+        nombre_archivo = self.ruta_salida("grafico_circular", "png")
+        fig.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
+        print(f"✅ Gráfico guardado en: {nombre_archivo}")
+        
+        # Mostrar el gráfico (si corresponde) y liberar la figura
+        if self.mostrar:
+            plt.show()
+        plt.close(fig)
+        
+        return nombre_archivo
+    
+    def dibujar_circular(self, resumen, titulo="Distribución de Tendencias"):
+        """
+        Función que dibuja el gráfico circular a partir del resumen y
+        devuelve la figura (sin guardarla).
+        """
         # Crear figura y ejes
         fig, ax = plt.subplots(figsize=(10, 8))
         
         # Preparar datos para el gráfico
-        categorias = ['Streetwear', 'Vintage', 'Minimalista', 'Deportivo']
-        valores = [
-            datos['streetwear'].sum(),
-            datos['vintage'].sum(),
-            datos['minimalista'].sum(),
-            datos['deportivo'].sum()
-        ]
+        categorias = [self.etiqueta(columna) for columna in resumen.index]
+        valores = resumen['suma'].tolist()
         
         # Colores para cada categoría
-        colores = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+        colores = self.colores_para(len(resumen))
         
         # Crear el gráfico circular
         wedges, texts, autotexts = ax.pie(valores, labels=categorias, colors=colores, 
@@ -207,19 +333,11 @@ class DashboardSimple:
         ax.legend(wedges, categorias, title="Tendencias", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
         
         # Ajustar el diseño
-        plt.tight_layout()
-        
-        # Guardar el gráfico
-        nombre_archivo = f"data/grafico_circular_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(nombre_archivo, dpi=300, bbox_inches='tight')
-        print(f"✅ Gráfico guardado en: {nombre_archivo}")
+        fig.tight_layout()
         
-        # Mostrar el gráfico
-        plt.show()
-        
-        return nombre_archivo
+        return fig
     
-    def crear_tabla_resumen(self, datos):
+    def crear_tabla_resumen(self, datos, resumen=None):
         """
         Función que crea una tabla resumen de los datos.
         
@@ -228,82 +346,75 @@ class DashboardSimple:
         """
         print("📋 Creando tabla resumen de datos...")
         
-        # Calcular estadísticas para cada tendencia
-        resumen = {
-            'Tendencia': ['Streetwear', 'Vintage', 'Minimalista', 'Deportivo'],
-            'Promedio': [
-                datos['streetwear'].mean(),
-                datos['vintage'].mean(),
-                datos['minimalista'].mean(),
-                datos['deportivo'].mean()
-            ],
-            'Máximo': [
-                datos['streetwear'].max(),
-                datos['vintage'].max(),
-                datos['minimalista'].max(),
-                datos['deportivo'].max()
-            ],
-            'Mínimo': [
-                datos['streetwear'].min(),
-                datos['vintage'].min(),
-                datos['minimalista'].min(),
-                datos['deportivo'].min()
-            ],
-            'Tendencia': [
-                'Creciente' if datos['streetwear'].iloc[-1] > datos['streetwear'].iloc[0] else 'Decreciente',
-                'Creciente' if datos['vintage'].iloc[-1] > datos['vintage'].iloc[0] else 'Decreciente',
-                'Creciente' if datos['minimalista'].iloc[-1] > datos['minimalista'].iloc[0] else 'Decreciente',
-                'Creciente' if datos['deportivo'].iloc[-1] > datos['deportivo'].iloc[0] else 'Decreciente'
-            ]
-        }
-        
-        # Crear DataFrame del resumen
-        df_resumen = pd.DataFrame(resumen)
-        
-        # Redondear valores numéricos
-        df_resumen['Promedio'] = df_resumen['Promedio'].round(2)
-        df_resumen['Máximo'] = df_resumen['Máximo'].round(2)
-        df_resumen['Mínimo'] = df_resumen['Mínimo'].round(2)
+        # Tomar las estadísticas de cada tendencia del resumen calculado una sola vez
+        if resumen is None:
+            resumen = self.calcular_resumen(datos)
+        df_resumen = self.armar_tabla_resumen(resumen)
         
         print("📊 Tabla resumen creada:")
         print(df_resumen.to_string(index=False))
         
         # Guardar la tabla como CSV
-        nombre_archivo = f"data/tabla_resumen_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        nombre_archivo = self.ruta_salida("tabla_resumen", "csv")
         df_resumen.to_csv(nombre_archivo, index=False)
         print(f"✅ Tabla resumen guardada en: {nombre_archivo}")
         
         return df_resumen
     
-    def crear_dashboard_completo(self, datos):
+    def armar_tabla_resumen(self, resumen):
+        """
+        Función que arma la tabla resumen (con nombres de columnas para
+        mostrar y valores redondeados) a partir del resumen.
+        """
+        df_resumen = pd.DataFrame({
+            'Tendencia': [self.etiqueta(columna) for columna in resumen.index],
+            'Promedio': resumen['promedio'].to_numpy(),
+            'Máximo': resumen['maximo'].to_numpy(),
+            'Mínimo': resumen['minimo'].to_numpy(),
+            'Dirección': np.where(resumen['ultimo'] > resumen['primero'], 'Creciente', 'Decreciente')
+        })
+        
+        # Redondear valores numéricos
+        df_resumen['Promedio'] = df_resumen['Promedio'].round(2)
+        df_resumen['Máximo'] = df_resumen['Máximo'].round(2)
+        df_resumen['Mínimo'] = df_resumen['Mínimo'].round(2)
+        
+        return df_resumen
+    
+    def crear_dashboard_completo(self, datos, categoria="Moda", carpeta_cache=None, huella=None):
         """
         Función que crea un dashboard completo con todos los gráficos.
         
         ¿Qué es un "dashboard completo"? Es como un "centro de control"
         que muestra toda la información importante en un solo lugar.
+        
+        datos tiene una columna 'fecha' y una columna por tendencia. El
+        resumen se calcula una sola vez y lo comparten todos los gráficos.
         """
         print("��️ Creando dashboard completo...")
         
+        resumen = self.calcular_resumen(datos, carpeta_cache, huella)
+        
         # Crear todos los gráficos
         graficos_creados = []
         
         # 1. Gráfico de barras
-        grafico_barras = self.crear_grafico_barras(datos, "Popularidad Promedio de Tendencias de Moda")
+        grafico_barras = self.crear_grafico_barras(datos, f"Popularidad Promedio de Tendencias de {categoria}", resumen)
         graficos_creados.append(grafico_barras)
         
         # 2. Gráfico de líneas
-        grafico_lineas = self.crear_grafico_lineas(datos, "Evolución Temporal de Tendencias de Moda")
+        grafico_lineas = self.crear_grafico_lineas(datos, f"Evolución Temporal de Tendencias de {categoria}")
         graficos_creados.append(grafico_lineas)
         
         # 3. Gráfico circular
-        grafico_circular = self.crear_grafico_circular(datos, "Distribución Total de Tendencias de Moda")
+        grafico_circular = self.crear_grafico_circular(datos, f"Distribución Total de Tendencias de {categoria}", resumen)
         graficos_creados.append(grafico_circular)
         
         # 4. Tabla resumen
-        tabla_resumen = self.crear_tabla_resumen(datos)
+        tabla_resumen = self.crear_tabla_resumen(datos, resumen)
         
         print(f"�� Dashboard completo creado exitosamente!")
-        print(f"�� Gráficos guardados en la carpeta 'data':")
+        print(f"�� Gráficos guardados en la carpeta '{self.carpeta_salida}':")
         for grafico in graficos_creados:
             print(f"   - {os.path.basename(grafico)}")
         
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Deduplicación
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para descartar registros repetidos antes de procesarlos
+"""
+
+# Importar módulos necesarios
+import hashlib
+import json
+import math
+import os
+import re
+import unicodedata
+from datetime import datetime
+
+import numpy as np
+
+PATRON_ESPACIOS = re.compile(r'\s+')
+
+
+def normalizar_texto(texto):
+    """
+    Función que deja un texto en una forma estándar para compararlo.
+
+    "  Nuevo  DROP #Streetwear " y "nuevo drop #streetwear" quedan iguales:
+    minúsculas, sin tildes y con un solo espacio entre palabras.
+    """
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return PATRON_ESPACIOS.sub(' ', texto).strip()
+
+
+def huella_registro(texto, fuente, fecha, minutos_ventana=60):
+    """
+    Función que calcula la "huella digital" de un registro.
+
+    Dos registros con el mismo texto, de la misma fuente y dentro de la
+    misma ventana de tiempo tienen la misma huella (son duplicados).
+    Con minutos_ventana=None solo coinciden si la fecha es exactamente la misma.
+    """
+    if isinstance(fecha, str):
+        fecha = datetime.fromisoformat(fecha)
+    if minutos_ventana is None:
+        ventana = fecha.isoformat()
+    else:
+        ventana = int(fecha.timestamp() // (minutos_ventana * 60))
+    clave = f"{normalizar_texto(texto)}\x1f{fuente}\x1f{ventana}"
+    return hashlib.blake2b(clave.encode('utf-8'), digest_size=16).digest()
+
+
+class FiltroBloom:
+    """
+    Clase que recuerda qué huellas ya se vieron usando muy poca memoria.
+
+    ¿Qué es un "filtro de Bloom"? Es una tabla de bits que responde
+    "seguro que no lo vi" o "probablemente ya lo vi". Nunca olvida un
+    registro visto, y a cambio se equivoca de vez en cuando diciendo
+    que vio algo nuevo (la "tasa de falsos positivos", configurable).
+
+    Su tamaño depende solo de la capacidad y de la tasa de error, no de
+    cuántos registros pasen. Si se indica una ruta, los bits viven en
+    un archivo mapeado en memoria y persisten entre ejecuciones.
+    """
+
+    def __init__(self, capacidad=10_000_000, tasa_falsos_positivos=0.01, ruta=None):
+        """
+        Constructor de la clase FiltroBloom.
+        """
+        self.ruta = ruta
+        metadatos = self._leer_metadatos()
+        if metadatos:
+            self.capacidad = metadatos['capacidad']
+            self.tasa_falsos_positivos = metadatos['tasa_falsos_positivos']
+            self.cantidad_bits = metadatos['cantidad_bits']
+            self.cantidad_hashes = metadatos['cantidad_hashes']
+            self.elementos = metadatos['elementos']
+        else:
+            self.capacidad = capacidad
+            self.tasa_falsos_positivos = tasa_falsos_positivos
+            # Fórmulas clásicas: m = -n ln(p) / ln(2)^2 y k = (m / n) ln(2)
+            self.cantidad_bits = int(math.ceil(-capacidad * math.log(tasa_falsos_positivos) / math.log(2) ** 2))
+            self.cantidad_hashes = max(1, round(self.cantidad_bits / capacidad * math.log(2)))
+            self.elementos = 0
+        self._capacidad_avisada = False
+
+        cantidad_bytes = (self.cantidad_bits + 7) // 8
+        if ruta:
+            modo = 'r+' if os.path.exists(ruta) else 'w+'
+            self.bits = np.memmap(ruta, dtype=np.uint8, mode=modo, shape=(cantidad_bytes,))
+        else:
+            self.bits = np.zeros(cantidad_bytes, dtype=np.uint8)
+
+        self._multiplicadores = np.arange(self.cantidad_hashes, dtype=np.uint64)
+
+    def _leer_metadatos(self):
+        if self.ruta and os.path.exists(self.ruta + '.json'):
+            with open(self.ruta + '.json', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def _posiciones(self, huellas):
+        """
+        Calcula las k posiciones de bits de cada huella (doble hashing).
+        """
+        valores = np.frombuffer(b''.join(huellas), dtype=np.uint64).reshape(-1, 2)
+        hash_1 = valores[:, 0:1]
+        hash_2 = valores[:, 1:2] | np.uint64(1)
+        posiciones = (hash_1 + self._multiplicadores * hash_2) % np.uint64(self.cantidad_bits)
+        return valores, posiciones
+
+    def agregar_lote(self, huellas):
+        """
+        Función que agrega un lote de huellas y dice cuáles eran nuevas.
+
+        Devuelve un arreglo de booleanos: True si la huella no se había visto
+        (ni antes ni más arriba en el mismo lote).
+        """
+        if not huellas:
+            return np.zeros(0, dtype=bool)
+        valores, posiciones = self._posiciones(huellas)
+        bytes_ = (posiciones >> np.uint64(3)).astype(np.int64)
+        mascaras = (np.uint8(1) << (posiciones & np.uint64(7)).astype(np.uint8))
+        ya_vistas = ((self.bits[bytes_] & mascaras) != 0).all(axis=1)
+
+        # Dentro del mismo lote solo cuenta la primera aparición
+        primeras = np.zeros(len(huellas), dtype=bool)
+        primeras[np.unique(valores, axis=0, return_index=True)[1]] = True
+
+        nuevas = ~ya_vistas & primeras
+        np.bitwise_or.at(self.bits, bytes_[nuevas].ravel(), mascaras[nuevas].ravel())
+        self.elementos += int(nuevas.sum())
+        if self.elementos > self.capacidad and not self._capacidad_avisada:
+            self._capacidad_avisada = True
+            print(f"⚠️ El filtro de Bloom superó su capacidad ({self.elementos} > {self.capacidad}): "
+                  f"la tasa de falsos positivos estimada ya es {self.tasa_estimada():.2%}. "
+                  f"Conviene crear uno con más capacidad.")
+        return nuevas
+
+    def tasa_estimada(self):
+        """
+        Función que estima la tasa de falsos positivos actual según lo cargado.
+        """
+        return (1 - math.exp(-self.cantidad_hashes * self.elementos / self.cantidad_bits)) ** self.cantidad_hashes
+
+    def guardar(self):
+        """
+        Función que guarda el filtro en disco (solo si tiene ruta).
+        """
+        if not self.ruta:
+            return
+        self.bits.flush()
+        with open(self.ruta + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'capacidad': self.capacidad,
+                'tasa_falsos_positivos': self.tasa_falsos_positivos,
+                'cantidad_bits': self.cantidad_bits,
+                'cantidad_hashes': self.cantidad_hashes,
+                'elementos': self.elementos,
+            }, f)
+
+
+class Deduplicador:
+    """
+    Clase que deja pasar solo los registros que no se vieron antes.
+
+    Trabaja como un colador sobre el flujo de registros recolectados:
+    los duplicados se descartan antes de llegar a pandas.
+    """
+
+    def __init__(self, filtro=None, minutos_ventana=60, tamano_lote=10_000):
+        """
+        Constructor de la clase Deduplicador.
+        """
+        self.filtro = filtro or FiltroBloom()
+        self.minutos_ventana = minutos_ventana
+        self.tamano_lote = tamano_lote
+        self.registros_vistos = 0
+        self.duplicados_descartados = 0
+
+    def _huella(self, registro):
+        if registro.get('texto'):
+            # Una publicación: el mismo texto repetido en la ventana es un duplicado
+            return huella_registro(registro['texto'], registro['fuente'], registro['fecha'], self.minutos_ventana)
+        # Una medición (tendencia + popularidad): solo es duplicado si se recibe
+        # de nuevo la misma medición exacta; dos mediciones de la misma
+        # tendencia en la misma hora son datos distintos
+        medicion = f"{registro['tendencia']}\x1f{registro.get('popularidad')}"
+        return huella_registro(medicion, registro['fuente'], registro['fecha'], minutos_ventana=None)
+
+    def _filtrar_lote(self, lote):
+        nuevas = self.filtro.agregar_lote([self._huella(registro) for registro in lote])
+        self.registros_vistos += len(lote)
+        self.duplicados_descartados += len(lote) - int(nuevas.sum())
+        return [registro for registro, es_nueva in zip(lote, nuevas) if es_nueva]
+
+    def filtrar(self, registros):
+        """
+        Función que recorre los registros (diccionarios con 'texto' o
+        'tendencia' y 'popularidad', 'fuente' y 'fecha') y devuelve solo los nuevos.
+
+        Es un generador: procesa de a lotes y nunca guarda todo el flujo.
+        """
+        lote = []
+        for registro in registros:
+            lote.append(registro)
+            if len(lote) >= self.tamano_lote:
+                yield from self._filtrar_lote(lote)
+                lote = []
+        if lote:
+            yield from self._filtrar_lote(lote)
+        self.filtro.guardar()
+
+
+def probar_deduplicador():
+    """
+    Función para probar el deduplicador.
+    """
+    print("🧹 Probando Deduplicador de CLARIO...")
+    print("=" * 60)
+
+    filtro = FiltroBloom(capacidad=100_000, tasa_falsos_positivos=0.001)
+    print(f"📦 Filtro: {filtro.bits.nbytes / 1024:.1f} KB, {filtro.cantidad_hashes} hashes")
+
+    registros = [
+        {'texto': 'Nuevo drop #Streetwear', 'tendencia': 'Streetwear', 'fuente': 'Twitter', 'fecha': '2024-01-01T10:05:00'},
+        {'texto': '  nuevo DROP  #streetwear', 'tendencia': 'Streetwear', 'fuente': 'Twitter', 'fecha': '2024-01-01T10:40:00'},
+        {'texto': 'Nuevo drop #Streetwear', 'tendencia': 'Streetwear', 'fuente': 'Instagram', 'fecha': '2024-01-01T10:05:00'},
+        {'texto': 'Nuevo drop #Streetwear', 'tendencia': 'Streetwear', 'fuente': 'Twitter', 'fecha': '2024-01-01T12:00:00'},
+    ]
+    deduplicador = Deduplicador(filtro)
+    unicos = list(deduplicador.filtrar(registros))
+    print(f"✅ {len(unicos)} registros únicos, {deduplicador.duplicados_descartados} duplicados descartados")
+
+    # Mediciones sin texto: solo se descarta la misma medición recibida dos veces
+    mediciones = [
+        {'tendencia': 'Vintage', 'popularidad': 70, 'fuente': 'Twitter', 'fecha': '2024-01-01T10:00:00'},
+        {'tendencia': 'Vintage', 'popularidad': 74, 'fuente': 'Twitter', 'fecha': '2024-01-01T10:15:00'},
+        {'tendencia': 'Vintage', 'popularidad': 74, 'fuente': 'Twitter', 'fecha': '2024-01-01T10:15:00'},
+    ]
+    unicos = list(Deduplicador(filtro).filtrar(mediciones))
+    print(f"✅ Mediciones: {len(unicos)} de {len(mediciones)} conservadas")
+
+    print("🎯 Deduplicador probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_deduplicador()
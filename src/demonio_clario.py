@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Modo Demonio
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para ejecutar CLARIO de forma continua, recolectando y analizando sin reiniciar
+"""
+
+# Importar módulos necesarios
+import heapq
+import os
+import pickle
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.analizador_tendencias import AnalizadorTendencias
+from src.deduplicador import Deduplicador, FiltroBloom
+from src.normalizador_tendencias import IndiceTendencias
+from src.procesador_datos import ProcesadorDatos
+from src.scraper_basico import ScraperBasico
+from src.serializador_reportes import guardar_json
+
+
+def recolector_simulado(fuente):
+    """
+    Función que simula una recolección y devuelve registros del momento actual.
+    """
+    generador = np.random.default_rng()
+    ahora = datetime.now().isoformat(timespec='seconds')
+    tendencias = ['Streetwear', 'Vintage', 'Minimalista', 'Colorido', 'Deportivo']
+    return [
+        {'fecha': ahora, 'tendencia': tendencia, 'popularidad': int(generador.integers(50, 100)),
+         'categoria': 'Ropa', 'fuente': fuente}
+        for tendencia in generador.choice(tendencias, size=3, replace=False)
+    ]
+
+
+class DemonioClario:
+    """
+    Clase que mantiene CLARIO corriendo y con su estado "caliente" en memoria.
+
+    ¿Qué es un "demonio"? Es un programa que queda funcionando en segundo
+    plano. En vez de arrancar Python, importar pandas y rehacer todo en
+    cada ejecución, el demonio:
+    1. Recolecta cada fuente cada cierto intervalo (uno distinto por fuente)
+    2. Guarda en memoria los datos, el índice de tendencias y el filtro de duplicados
+    3. Lleva un resumen por tendencia, fuente y día que se actualiza solo
+       con los datos nuevos, y de ahí rehace el reporte cuando llegan datos
+    4. Guarda una "foto" (snapshot) de su estado para continuar tras un reinicio
+
+    Para que la memoria no crezca sin fin, solo se conservan los últimos
+    dias_retencion días de datos (los datos completos quedan en el lago,
+    si se usa uno).
+    """
+
+    def __init__(self, intervalos=None, recolectar=None, carpeta_estado="data/estado_demonio",
+                 archivo_reporte="data/reporte_en_vivo.json", segundos_entre_snapshots=300, refrescar_dashboard=False,
+                 lago=None, dias_retencion=30, capacidad_filtro=2_000_000, urls=None):
+        """
+        Constructor de la clase DemonioClario.
+
+        intervalos: diccionario fuente -> segundos entre recolecciones.
+        recolectar: función fuente -> lista de registros (diccionarios). Si no
+        se pasa, con urls se descargan páginas reales (ver recolectar_paginas)
+        y sin urls se usan datos simulados.
+        urls: diccionario fuente -> lista de URLs a descargar en cada ciclo.
+        lago: LagoDatos opcional donde se guarda todo lo recolectado, tal cual
+        llegó (de ahí lee el dashboard en vivo).
+        dias_retencion: días de datos que se guardan en memoria y se analizan
+        (None = todos).
+        capacidad_filtro: cuántos registros distintos recuerda el filtro de duplicados.
+        """
+        self.nombre = "Demonio CLARIO"
+        self.version = "1.0"
+        self.scraper = ScraperBasico()
+        self.urls = urls or {}
+        self.intervalos = intervalos or {fuente: 60 for fuente in (self.urls or self.scraper.fuentes_disponibles)}
+        if recolectar is None:
+            recolectar = self.recolectar_paginas if self.urls else recolector_simulado
+        self.recolectar = recolectar
+        self.carpeta_estado = carpeta_estado
+        self.archivo_reporte = archivo_reporte
+        self.segundos_entre_snapshots = segundos_entre_snapshots
+        self.refrescar_dashboard = refrescar_dashboard
+        self.lago = lago
+        self.dias_retencion = dias_retencion
+        os.makedirs(carpeta_estado, exist_ok=True)
+
+        # Estado caliente: vive en memoria entre ciclos
+        self.procesador = ProcesadorDatos()
+        self.analizador = AnalizadorTendencias()
+        self.indice = IndiceTendencias()
+        self.parser = None
+        self.pool_navegadores = None
+        # El filtro vive en memoria y se guarda dentro del snapshot: así los
+        # datos y las huellas ya vistas siempre corresponden al mismo momento
+        self.deduplicador = Deduplicador(FiltroBloom(capacidad=capacidad_filtro))
+        self.datos = pd.DataFrame(columns=['fecha', 'tendencia', 'popularidad', 'categoria', 'fuente'])
+        self.resumen = None
+        self.version_datos = 0
+        self.version_analizada = 0
+        self.ultimo_reporte = None
+        self.ultimo_snapshot = time.monotonic()
+
+        self._cola_programada = []
+        self._pendientes = []
+        self._bloqueo = threading.Lock()
+        self._detener = threading.Event()
+        self._bloqueo_pool = threading.Lock()
+        self._ejecutor = ThreadPoolExecutor(max_workers=max(len(self.intervalos), 1))
+
+        self.cargar_snapshot()
+
+    # ---------- Snapshots ----------
+
+    @property
+    def ruta_snapshot(self):
+        return os.path.join(self.carpeta_estado, 'snapshot.pkl')
+
+    def guardar_snapshot(self):
+        """
+        Función que guarda el estado en disco (escritura atómica: primero a
+        un archivo temporal y después se reemplaza el anterior).
+        """
+        estado = {
+            'datos': self.datos,
+            'resumen': self.resumen,
+            'indice': self.indice,
+            'deduplicador': self.deduplicador,
+            'version_datos': self.version_datos,
+            'proximas': {fuente: momento - time.time() for momento, fuente in self._cola_programada},
+        }
+        temporal = self.ruta_snapshot + '.tmp'
+        with open(temporal, 'wb') as f:
+            pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, self.ruta_snapshot)
+        self.ultimo_snapshot = time.monotonic()
+        print(f"💾 Snapshot guardado ({len(self.datos)} filas)")
+
+    def cargar_snapshot(self):
+        """
+        Función que recupera el estado guardado, si existe.
+        """
+        if not os.path.exists(self.ruta_snapshot):
+            return False
+        with open(self.ruta_snapshot, 'rb') as f:
+            estado = pickle.load(f)
+        self.datos = estado['datos']
+        self.resumen = estado.get('resumen')
+        if self.resumen is None and not self.datos.empty:
+            self.resumen = self.resumir(self.datos)
+        self.indice = estado['indice']
+        self.deduplicador = estado.get('deduplicador', self.deduplicador)
+        self.version_datos = estado['version_datos']
+        self._proximas_guardadas = estado['proximas']
+        print(f"♻️ Estado recuperado: {len(self.datos)} filas, {len(self.indice)} tendencias")
+        return True
+
+    # ---------- Recolección ----------
+
+    def obtener_pool(self):
+        """
+        Función que devuelve el PoolNavegadores del demonio (se abre la
+        primera vez que una fuente con JavaScript lo necesita y queda
+        abierto, con sus navegadores calientes, hasta que el demonio termina).
+        """
+        with self._bloqueo_pool:
+            if self.pool_navegadores is None:
+                from src.pool_navegadores import PoolNavegadores
+                self.pool_navegadores = PoolNavegadores(tamano=2).__enter__()
+            return self.pool_navegadores
+
+    def recolectar_paginas(self, fuente):
+        """
+        Función que descarga las URLs de una fuente y las convierte en registros.
+
+        Usa siempre el mismo ScraperBasico (su sesión HTTP mantiene las
+        conexiones abiertas entre ciclos), el mismo pool de navegadores para
+        las fuentes con JavaScript y el mismo parser (selectores ya compilados).
+        """
+        from src.parser_paginas import COLUMNAS_FILAS, ParserPaginas
+
+        if self.parser is None:
+            self.parser = ParserPaginas()
+        pool = self.obtener_pool() if fuente in self.scraper.fuentes_con_javascript else None
+        registros = []
+        for pagina in self.scraper.recolectar_paginas(fuente, self.urls[fuente], pool):
+            if pagina['error']:
+                print(f"⚠️ {pagina['url']}: {pagina['error']}")
+                continue
+            filas = self.parser.analizar_pagina(pagina['html'], fuente, pagina['fecha'])
+            registros.extend(dict(zip(COLUMNAS_FILAS, fila)) for fila in filas)
+        return registros
+
+    # ---------- Resumen incremental ----------
+
+    def resumir(self, datos):
+        """
+        Función que resume filas por tendencia, fuente y día: primer y último
+        valor (con su fecha), suma, cantidad, suma de cuadrados y máximo.
+        """
+        ordenados = datos.sort_values('fecha', kind='stable')
+        return (ordenados.assign(dia=ordenados['fecha'].dt.normalize(), cuadrado=ordenados['popularidad'] ** 2)
+                .groupby(['tendencia', 'fuente', 'dia'], sort=False, observed=True)
+                .agg(desde=('fecha', 'first'), primero=('popularidad', 'first'),
+                     hasta=('fecha', 'last'), ultimo=('popularidad', 'last'),
+                     suma=('popularidad', 'sum'), cantidad=('popularidad', 'count'),
+                     filas=('popularidad', 'size'), suma_cuadrados=('cuadrado', 'sum'),
+                     maximo=('popularidad', 'max'))
+                .reset_index())
+
+    def combinar_resumen(self, nuevo):
+        """
+        Función que suma al resumen guardado el resumen de las filas nuevas.
+
+        Solo se recorren las filas nuevas y el resumen (una fila por
+        tendencia, fuente y día), nunca todos los datos en memoria.
+        """
+        if self.resumen is None or self.resumen.empty:
+            return nuevo
+        claves = ['tendencia', 'fuente', 'dia']
+        juntos = pd.concat([self.resumen, nuevo], ignore_index=True)
+        totales = juntos.groupby(claves, sort=False).agg(
+            suma=('suma', 'sum'), cantidad=('cantidad', 'sum'), filas=('filas', 'sum'),
+            suma_cuadrados=('suma_cuadrados', 'sum'), maximo=('maximo', 'max'))
+        # Ante empates gana lo más viejo para el primero y lo más nuevo para el último
+        primeros = juntos.sort_values('desde', kind='stable').groupby(claves, sort=False)[['desde', 'primero']].first()
+        ultimos = juntos.sort_values('hasta', kind='stable').groupby(claves, sort=False)[['hasta', 'ultimo']].last()
+        return primeros.join(ultimos).join(totales).reset_index()
+
+    # ---------- Ciclo principal ----------
+
+    def programar(self):
+        """
+        Función que arma la agenda inicial: cuándo toca recolectar cada fuente.
+        """
+        ahora = time.time()
+        proximas = getattr(self, '_proximas_guardadas', {})
+        self._cola_programada = [(ahora + max(proximas.get(fuente, 0), 0), fuente) for fuente in self.intervalos]
+        heapq.heapify(self._cola_programada)
+
+    def _recolectar_fuente(self, fuente):
+        try:
+            registros = self.recolectar(fuente)
+        except Exception as e:
+            print(f"❌ Error recolectando {fuente}: {e}")
+            return
+        with self._bloqueo:
+            self._pendientes.append((fuente, registros))
+
+    def incorporar_pendientes(self):
+        """
+        Función que pasa los registros recolectados al estado en memoria.
+
+        Devuelve la cantidad de filas nuevas (ya sin duplicados).
+        """
+        with self._bloqueo:
+            recolecciones, self._pendientes = self._pendientes, []
+        if not recolecciones:
+            return 0
+        if self.lago is not None:
+            for fuente, registros in recolecciones:
+                self.lago.agregar(fuente, registros)
+            self.lago.vaciar()
+        registros = [registro for _, registros in recolecciones for registro in registros]
+        if not registros:
+            return 0
+        nuevos = self.procesador.crear_datos_desde_registros(registros, self.deduplicador)
+        if nuevos.empty:
+            return 0
+        nuevos['fecha'] = pd.to_datetime(nuevos['fecha'])
+        nuevos = self.procesador.normalizar_tendencias(nuevos, self.indice)
+        nuevos['tendencia'] = nuevos['tendencia'].astype(str)
+        self.datos = pd.concat([self.datos, nuevos], ignore_index=True) if len(self.datos) else nuevos
+        self.resumen = self.combinar_resumen(self.resumir(nuevos))
+        self.aplicar_retencion()
+        self.version_datos += 1
+        return len(nuevos)
+
+    def aplicar_retencion(self):
+        """
+        Función que descarta de la memoria los datos más viejos que dias_retencion.
+
+        Se toma como referencia la fecha más reciente de los datos (no el reloj)
+        y se descartan días completos, para que el resumen por día siga
+        coincidiendo con los datos.
+        """
+        if self.dias_retencion is None or self.datos.empty:
+            return 0
+        limite = self.datos['fecha'].max().normalize() - pd.Timedelta(days=self.dias_retencion)
+        vigentes = self.datos['fecha'] >= limite
+        descartadas = int((~vigentes).sum())
+        if descartadas:
+            self.datos = self.datos[vigentes].reset_index(drop=True)
+            self.resumen = self.resumen[self.resumen['dia'] >= limite].reset_index(drop=True)
+        return descartadas
+
+    def refrescar(self):
+        """
+        Función que reescribe el reporte en vivo, solo si hay datos que
+        todavía no se analizaron.
+
+        El reporte sale del resumen por tendencia, fuente y día (que ya
+        incluye los datos nuevos), no de volver a recorrer todas las filas.
+        """
+        if self.version_analizada == self.version_datos or self.datos.empty:
+            return False
+        inicio = time.perf_counter()
+        resumen = self.resumen
+
+        # Crecimiento: primer y último valor de cada tendencia, en orden de aparición
+        por_tendencia = resumen.sort_values('desde', kind='stable').groupby('tendencia', sort=False)
+        extremos = por_tendencia.agg(primero=('primero', 'first'), filas=('filas', 'sum'))
+        extremos['ultimo'] = resumen.sort_values('hasta', kind='stable').groupby('tendencia')['ultimo'].last()
+        crecimiento = {
+            tendencia: self.analizador.describir_crecimiento(fila.primero, fila.ultimo)
+            for tendencia, fila in extremos.iterrows() if fila.filas > 1
+        }
+
+        def promedio(grupo):
+            sumas = resumen.groupby(grupo)[['suma', 'cantidad']].sum()
+            return sumas['suma'] / sumas['cantidad']
+
+        por_mes = promedio(resumen['dia'].dt.month.rename('mes'))
+        suma, cantidad, suma_cuadrados = resumen[['suma', 'cantidad', 'suma_cuadrados']].sum()
+        variabilidad = np.sqrt(max(suma_cuadrados - suma ** 2 / cantidad, 0) / (cantidad - 1)) if cantidad > 1 else np.nan
+        maximo = resumen.loc[resumen['maximo'].idxmax()]
+
+        self.ultimo_reporte = {
+            'fecha_generacion': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            'filas_analizadas': len(self.datos),
+            'analisis_crecimiento': crecimiento,
+            'analisis_estacionalidad': {
+                'mes_mas_popular': por_mes.idxmax(),
+                'mes_menos_popular': por_mes.idxmin(),
+                'popularidad_por_mes': por_mes.to_dict()
+            },
+            'insights': self.analizador.redactar_insights(
+                maximo['tendencia'], maximo['maximo'], self.analizador.primera_emergente(crecimiento.items()),
+                promedio('fuente').idxmax(), variabilidad),
+        }
+        temporal = self.archivo_reporte + '.tmp'
+        guardar_json(self.ultimo_reporte, temporal)
+        os.replace(temporal, self.archivo_reporte)
+
+        if self.refrescar_dashboard:
+            from src.dashboard_simple import DashboardSimple
+            diario = promedio(['dia', 'tendencia']).unstack('tendencia').rename_axis(index='fecha').reset_index()
+            DashboardSimple(mostrar=False).crear_dashboard_completo(diario)
+
+        self.version_analizada = self.version_datos
+        print(f"🔄 Reporte actualizado en {time.perf_counter() - inicio:.2f}s: {self.archivo_reporte}")
+        return True
+
+    def ciclo(self):
+        """
+        Función que hace una vuelta del demonio: lanza las recolecciones que
+        tocan, incorpora lo recolectado y refresca si hubo datos nuevos.
+        """
+        ahora = time.time()
+        while self._cola_programada and self._cola_programada[0][0] <= ahora:
+            _, fuente = heapq.heappop(self._cola_programada)
+            self._ejecutor.submit(self._recolectar_fuente, fuente)
+            heapq.heappush(self._cola_programada, (ahora + self.intervalos[fuente], fuente))
+
+        if self.incorporar_pendientes():
+            self.refrescar()
+        if time.monotonic() - self.ultimo_snapshot >= self.segundos_entre_snapshots:
+            self.guardar_snapshot()
+
+    def detener(self, *args):
+        """
+        Función que pide al demonio que termine (también responde a Ctrl+C y SIGTERM).
+        """
+        self._detener.set()
+
+    def ejecutar(self, segundos_maximos=None, paso_segundos=0.5):
+        """
+        Función que corre el demonio hasta que se lo detenga.
+        """
+        print(f"👹 {self.nombre} iniciado con {len(self.intervalos)} fuentes")
+        anteriores = {}
+        if threading.current_thread() is threading.main_thread():
+            for senal in (signal.SIGINT, signal.SIGTERM):
+                anteriores[senal] = signal.signal(senal, self.detener)
+
+        self.programar()
+        fin = None if segundos_maximos is None else time.monotonic() + segundos_maximos
+        try:
+            while not self._detener.is_set() and (fin is None or time.monotonic() < fin):
+                self.ciclo()
+                hasta_proxima = self._cola_programada[0][0] - time.time() if self._cola_programada else paso_segundos
+                self._detener.wait(min(max(hasta_proxima, 0.05), paso_segundos))
+        finally:
+            try:
+                self._ejecutor.shutdown(wait=True)
+                if self.incorporar_pendientes():
+                    self.refrescar()
+                self.guardar_snapshot()
+                if self.lago is not None:
+                    self.lago.cerrar()
+                if self.pool_navegadores is not None:
+                    self.pool_navegadores.cerrar()
+                self.scraper.sesion.close()
+            finally:
+                # Devolver Ctrl+C y SIGTERM a quien los manejaba antes
+                for senal, manejador in anteriores.items():
+                    signal.signal(senal, manejador)
+            print(f"👋 {self.nombre} detenido")
+
+
+def probar_demonio():
+    """
+    Función para probar el demonio durante unos segundos.
+    """
+    import tempfile
+
+    print("👹 Probando Demonio de CLARIO...")
+    print("=" * 60)
+
+    carpeta = tempfile.mkdtemp()
+    intervalos = {'Twitter': 1, 'Instagram': 2, 'Google Trends': 3}
+    demonio = DemonioClario(intervalos, carpeta_estado=carpeta, archivo_reporte=os.path.join(carpeta, 'reporte.json'))
+    demonio.ejecutar(segundos_maximos=5)
+    print(f"✅ Filas guardadas: {len(demonio.datos)} de {demonio.deduplicador.filtro.elementos} mediciones distintas")
+
+    # Un demonio nuevo sobre la misma carpeta retoma el estado anterior
+    reiniciado = DemonioClario(intervalos, carpeta_estado=carpeta, archivo_reporte=os.path.join(carpeta, 'reporte.json'))
+    print(f"✅ Filas recuperadas tras reiniciar: {len(reiniciado.datos)}")
+
+    print("🎯 Demonio probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_demonio()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Lago de Datos Crudos
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para guardar todo lo recolectado (comprimido) y poder reprocesarlo sin volver a descargar
+"""
+
+# Importar módulos necesarios
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+
+from src.normalizador_tendencias import canonizar_etiqueta
+
+TAMANO_LECTURA = 1024 * 1024
+
+
+class LagoDatos:
+    """
+    Clase que guarda los datos crudos recolectados en un "lago de datos".
+
+    ¿Qué es un "lago de datos"? Es un lugar donde se guarda todo lo que
+    llega tal cual llegó, sin procesar. Si mañana cambia la limpieza o
+    el análisis, se vuelve a leer el lago en vez de volver a descargar.
+
+    Cómo se organiza:
+    1. Los datos se juntan en lotes y cada lote se agrega comprimido
+       (gzip) al final del "segmento" abierto de su fuente
+    2. Nada se modifica nunca: solo se agrega (append-only)
+    3. Cuando un segmento llega al tamaño máximo se abre uno nuevo (rotación)
+    4. Un manifiesto dice qué segmento tiene qué fuente y qué fechas
+    5. Los segmentos más viejos se borran según la retención configurada
+
+    Cada lote es un bloque gzip completo, así que si el programa se corta
+    a mitad de camino, todo lo escrito antes sigue siendo legible. Como
+    primero se escribe el bloque y después el manifiesto, al volver a
+    escribir en un segmento se comparan los bytes del manifiesto con el
+    tamaño real del archivo: los bloques completos que quedaron afuera se
+    suman y un bloque cortado se descarta (ver _reconciliar).
+
+    Solo un proceso debe escribir en el lago; leer se puede desde varios.
+    """
+
+    def __init__(self, directorio="data/lago", tamano_segmento_mb=64, registros_por_lote=1000,
+                 dias_retencion=None, tamano_maximo_mb=None):
+        """
+        Constructor de la clase LagoDatos.
+
+        dias_retencion: se borran los segmentos con datos más viejos que esto.
+        tamano_maximo_mb: se borran los segmentos más viejos mientras el lago ocupe más que esto.
+        """
+        self.nombre = "Lago de Datos CLARIO"
+        self.version = "1.0"
+        self.directorio = directorio
+        self.tamano_segmento = int(tamano_segmento_mb * 1024 * 1024)
+        self.registros_por_lote = registros_por_lote
+        self.dias_retencion = dias_retencion
+        self.tamano_maximo = None if tamano_maximo_mb is None else int(tamano_maximo_mb * 1024 * 1024)
+        os.makedirs(directorio, exist_ok=True)
+
+        self.manifiesto = self._leer_manifiesto()
+        self._abiertos = {}
+        self._lotes = {}
+
+    # ---------- Manifiesto ----------
+
+    @property
+    def ruta_manifiesto(self):
+        return os.path.join(self.directorio, 'manifiesto.json')
+
+    def _leer_manifiesto(self):
+        if not os.path.exists(self.ruta_manifiesto):
+            return []
+        with open(self.ruta_manifiesto, encoding='utf-8') as f:
+            return json.load(f)['segmentos']
+
+    def _guardar_manifiesto(self):
+        temporal = self.ruta_manifiesto + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'segmentos': self.manifiesto}, f, ensure_ascii=False, indent=1)
+        os.replace(temporal, self.ruta_manifiesto)
+
+    def segmentos(self, fuente=None, desde=None, hasta=None):
+        """
+        Función que devuelve las entradas del manifiesto de una fuente y
+        un rango de fechas (los segmentos que pueden tener esos datos).
+        """
+        desde = None if desde is None else _a_texto_fecha(desde)
+        hasta = None if hasta is None else _a_texto_fecha(hasta)
+        return [
+            segmento for segmento in self.manifiesto
+            if segmento['registros']
+            and (fuente is None or segmento['fuente'] == fuente)
+            and (desde is None or segmento['hasta'] >= desde)
+            and (hasta is None or segmento['desde'] <= hasta)
+        ]
+
+    def tamano_total(self):
+        return sum(segmento['bytes'] for segmento in self.manifiesto)
+
+    # ---------- Escritura ----------
+
+    def agregar(self, fuente, carga, fecha=None):
+        """
+        Función que agrega un dato crudo (texto, diccionario o lista) de una fuente.
+        """
+        fecha = _a_texto_fecha(fecha or datetime.now())
+        linea = json.dumps({'fecha': fecha, 'fuente': fuente, 'carga': carga}, ensure_ascii=False, default=str)
+        lote = self._lotes.setdefault(fuente, [])
+        lote.append((fecha, linea))
+        if len(lote) >= self.registros_por_lote:
+            self._escribir_lote(fuente)
+
+    def agregar_lote(self, fuente, cargas, fecha=None):
+        """
+        Función que agrega varios datos crudos de una misma fuente.
+        """
+        for carga in cargas:
+            self.agregar(fuente, carga, fecha)
+
+    def _segmento_abierto(self, fuente):
+        segmento = self._abiertos.get(fuente)
+        if segmento is None:
+            # Al reabrir el lago se sigue agregando al último segmento de la fuente, si tiene lugar
+            anteriores = [s for s in self.manifiesto if s['fuente'] == fuente]
+            segmento = anteriores[-1] if anteriores else None
+            if segmento is not None:
+                self._reconciliar(segmento)
+        if segmento is None or segmento['bytes'] >= self.tamano_segmento:
+            nombre = canonizar_etiqueta(fuente) or 'fuente'
+            segmento = {
+                'archivo': f"{nombre}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.jsonl.gz",
+                'fuente': fuente, 'desde': None, 'hasta': None, 'registros': 0, 'bytes': 0,
+            }
+            self.manifiesto.append(segmento)
+            # Se anota antes de escribir: si el programa se corta, el archivo
+            # no queda fuera del manifiesto y se reconcilia al reabrir
+            self._guardar_manifiesto()
+        self._abiertos[fuente] = segmento
+        return segmento
+
+    def _reconciliar(self, segmento):
+        """
+        Función que ajusta la entrada del manifiesto al tamaño real del archivo.
+
+        Si el programa se cortó entre escribir un bloque y guardar el
+        manifiesto, el archivo tiene más bytes de los anotados: los bloques
+        completos se suman al manifiesto y un bloque cortado se borra,
+        para que lo que se agregue después quede legible.
+        """
+        ruta = os.path.join(self.directorio, segmento['archivo'])
+        tamano = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        if tamano == segmento['bytes']:
+            return
+        if tamano < segmento['bytes']:
+            # El archivo es más corto de lo anotado: se vuelve a contar todo
+            segmento.update(desde=None, hasta=None, registros=0, bytes=0)
+        valido = segmento['bytes']
+        registros_antes = segmento['registros']
+        if tamano:
+            with open(ruta, 'r+b') as f:
+                for fin_bloque, contenido in _bloques_gzip(f, valido):
+                    fechas = [json.loads(linea)['fecha'] for linea in contenido.splitlines()]
+                    segmento['desde'] = min([segmento['desde'] or fechas[0], *fechas])
+                    segmento['hasta'] = max([segmento['hasta'] or fechas[0], *fechas])
+                    segmento['registros'] += len(fechas)
+                    valido = fin_bloque
+                if valido < tamano:
+                    f.truncate(valido)
+        segmento['bytes'] = valido
+        self._guardar_manifiesto()
+        print(f"🩹 Segmento {segmento['archivo']} reconciliado: "
+              f"{segmento['registros'] - registros_antes:+d} registros, {tamano - valido} bytes descartados")
+
+    def _escribir_lote(self, fuente):
+        lote = self._lotes.pop(fuente, None)
+        if not lote:
+            return
+        segmento = self._segmento_abierto(fuente)
+        bloque = gzip.compress(('\n'.join(linea for _, linea in lote) + '\n').encode('utf-8'), compresslevel=6)
+        with open(os.path.join(self.directorio, segmento['archivo']), 'ab') as f:
+            f.write(bloque)
+
+        fechas = [fecha for fecha, _ in lote]
+        segmento['desde'] = min([segmento['desde'] or fechas[0], *fechas])
+        segmento['hasta'] = max([segmento['hasta'] or fechas[0], *fechas])
+        segmento['registros'] += len(lote)
+        segmento['bytes'] += len(bloque)
+        if segmento['bytes'] >= self.tamano_segmento:
+            del self._abiertos[fuente]
+            self.aplicar_retencion(guardar=False)
+        self._guardar_manifiesto()
+
+    def vaciar(self):
+        """
+        Función que escribe en disco los lotes que todavía están en memoria.
+        """
+        for fuente in list(self._lotes):
+            self._escribir_lote(fuente)
+
+    def cerrar(self):
+        """
+        Función que vacía los lotes pendientes y cierra los segmentos abiertos.
+        """
+        self.vaciar()
+        self._abiertos.clear()
+        self.aplicar_retencion()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    def aplicar_retencion(self, guardar=True):
+        """
+        Función que borra los segmentos cerrados que superan la retención
+        por antigüedad o por tamaño total. Devuelve cuántos se borraron.
+        """
+        abiertos = {segmento['archivo'] for segmento in self._abiertos.values()}
+        cerrados = sorted((s for s in self.manifiesto if s['archivo'] not in abiertos), key=lambda s: s['hasta'] or '')
+        borrar = []
+        if self.dias_retencion is not None:
+            limite = _a_texto_fecha(datetime.now() - timedelta(days=self.dias_retencion))
+            borrar += [segmento for segmento in cerrados if (segmento['hasta'] or '') < limite]
+        if self.tamano_maximo is not None:
+            sobrante = self.tamano_total() - sum(segmento['bytes'] for segmento in borrar) - self.tamano_maximo
+            for segmento in cerrados:
+                if sobrante <= 0:
+                    break
+                if segmento not in borrar:
+                    borrar.append(segmento)
+                    sobrante -= segmento['bytes']
+
+        for segmento in borrar:
+            ruta = os.path.join(self.directorio, segmento['archivo'])
+            if os.path.exists(ruta):
+                os.remove(ruta)
+        if borrar:
+            archivos = {segmento['archivo'] for segmento in borrar}
+            self.manifiesto = [segmento for segmento in self.manifiesto if segmento['archivo'] not in archivos]
+            print(f"🗑️ Retención: {len(borrar)} segmentos borrados")
+        if guardar:
+            self._guardar_manifiesto()
+        return len(borrar)
+
+    # ---------- Lectura ----------
+
+    def reproducir(self, fuente=None, desde=None, hasta=None):
+        """
+        Función que recorre los datos crudos guardados en orden, segmento
+        por segmento (generador de diccionarios con 'fecha', 'fuente' y 'carga').
+
+        Cada segmento se lee de a pedazos y bloque por bloque: es una lectura
+        secuencial del disco, y en memoria nunca hay más de un bloque.
+        """
+        self.vaciar()
+        texto_desde = None if desde is None else _a_texto_fecha(desde)
+        texto_hasta = None if hasta is None else _a_texto_fecha(hasta)
+        for segmento in self.segmentos(fuente, desde, hasta):
+            completo = ((texto_desde is None or segmento['desde'] >= texto_desde)
+                        and (texto_hasta is None or segmento['hasta'] <= texto_hasta))
+            with open(os.path.join(self.directorio, segmento['archivo']), 'rb') as f:
+                for _, contenido in _bloques_gzip(f, 0, segmento['bytes']):
+                    for linea in contenido.splitlines():
+                        dato = json.loads(linea)
+                        if completo or ((texto_desde is None or dato['fecha'] >= texto_desde)
+                                        and (texto_hasta is None or dato['fecha'] <= texto_hasta)):
+                            yield dato
+
+    def registros(self, fuente=None, desde=None, hasta=None):
+        """
+        Función que devuelve solo los registros de tendencias (diccionarios
+        con 'tendencia' y 'popularidad') que hay dentro de los datos crudos.
+        Las cargas de texto libre se saltean.
+        """
+        return extraer_registros(self.reproducir(fuente, desde, hasta))
+
+    def novedades(self, posiciones):
+        """
+        Función que devuelve solo los datos crudos agregados desde la última
+        lectura (generador, igual que reproducir).
+
+        posiciones es un diccionario archivo -> bytes ya leídos, que se va
+        actualizando. Como cada lote es un bloque gzip completo, se puede
+        empezar a leer justo donde terminó la lectura anterior.
+        """
+        self.vaciar()
+        if not self._abiertos:
+            # Solo lectura: el manifiesto puede haber cambiado en otro proceso
+            self.manifiesto = self._leer_manifiesto()
+        for segmento in list(self.manifiesto):
+            leidos = posiciones.get(segmento['archivo'], 0)
+            ruta = os.path.join(self.directorio, segmento['archivo'])
+            if segmento['bytes'] <= leidos or not os.path.exists(ruta):
+                continue
+            with open(ruta, 'rb') as f:
+                for fin_bloque, contenido in _bloques_gzip(f, leidos, segmento['bytes']):
+                    posiciones[segmento['archivo']] = fin_bloque
+                    for linea in contenido.splitlines():
+                        yield json.loads(linea)
+
+    def reprocesar(self, procesador, fuente=None, desde=None, hasta=None, deduplicador=None):
+        """
+        Función que vuelve a cargar los registros del lago en un
+        ProcesadorDatos y devuelve el DataFrame limpio.
+        """
+        print(f"🔁 Reprocesando {len(self.segmentos(fuente, desde, hasta))} segmentos del lago...")
+        datos = procesador.crear_datos_desde_registros(self.registros(fuente, desde, hasta), deduplicador)
+        return procesador.limpiar_datos(datos)
+
+
+def extraer_registros(datos_crudos):
+    """
+    Función que saca los registros de tendencias (diccionarios con
+    'tendencia') de una secuencia de datos crudos del lago.
+    """
+    for dato in datos_crudos:
+        carga = dato['carga']
+        for registro in carga if isinstance(carga, list) else [carga]:
+            if isinstance(registro, dict) and 'tendencia' in registro:
+                registro.setdefault('fuente', dato['fuente'])
+                registro.setdefault('fecha', dato['fecha'])
+                yield registro
+
+
+def _bloques_gzip(f, inicio=0, fin=None):
+    """
+    Generador que recorre los bloques gzip de un archivo abierto, desde la
+    posición inicio hasta fin (o hasta el final del archivo).
+
+    Lee de a pedazos de TAMANO_LECTURA y devuelve, por cada bloque completo,
+    (posición donde termina el bloque, contenido descomprimido). Si el último
+    bloque está cortado (escritura interrumpida), no se devuelve.
+    """
+    f.seek(inicio)
+    restante = None if fin is None else fin - inicio
+    comienzo_bloque = inicio
+    descompresor = zlib.decompressobj(wbits=31)  # 31 = formato gzip
+    partes, alimentados, pendiente = [], 0, b''
+    while True:
+        if not pendiente:
+            tamano = TAMANO_LECTURA if restante is None else min(TAMANO_LECTURA, restante)
+            pendiente = f.read(tamano) if tamano > 0 else b''
+            if not pendiente:
+                return
+            if restante is not None:
+                restante -= len(pendiente)
+        try:
+            partes.append(descompresor.decompress(pendiente))
+        except zlib.error:
+            return
+        alimentados += len(pendiente)
+        pendiente = b''
+        if descompresor.eof:
+            sobrante = descompresor.unused_data
+            comienzo_bloque += alimentados - len(sobrante)
+            yield comienzo_bloque, b''.join(partes)
+            descompresor = zlib.decompressobj(wbits=31)
+            partes, alimentados, pendiente = [], 0, sobrante
+
+
+def _a_texto_fecha(fecha):
+    """
+    Convierte una fecha en texto ISO, que se puede comparar como texto.
+    """
+    if isinstance(fecha, str):
+        fecha = datetime.fromisoformat(fecha)
+    return fecha.isoformat(timespec='seconds')
+
+
+def probar_lago_datos():
+    """
+    Función para probar el lago de datos crudos.
+    """
+    import tempfile
+    import time
+
+    import numpy as np
+
+    from src.procesador_datos import ProcesadorDatos
+
+    print("🏞️ Probando Lago de Datos de CLARIO...")
+    print("=" * 60)
+
+    directorio = tempfile.mkdtemp()
+    generador = np.random.default_rng(0)
+    tendencias = ['Streetwear', 'Vintage', 'Minimalista', 'Colorido', 'Deportivo']
+    inicio_mes = datetime(2024, 1, 1)
+
+    inicio = time.perf_counter()
+    with LagoDatos(directorio, tamano_segmento_mb=0.05) as lago:
+        for minuto in range(0, 30 * 24 * 60, 10):
+            fecha = inicio_mes + timedelta(minutes=minuto)
+            for fuente in ['Twitter', 'Instagram', 'Google Trends']:
+                lago.agregar(fuente, [
+                    {'fecha': fecha.isoformat(), 'tendencia': tendencia, 'categoria': 'Ropa',
+                     'popularidad': int(generador.integers(50, 100))}
+                    for tendencia in tendencias
+                ], fecha)
+    print(f"📦 {sum(s['registros'] for s in lago.manifiesto)} cargas en {len(lago.manifiesto)} segmentos "
+          f"({lago.tamano_total() / 1024 / 1024:.1f} MB) en {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    datos = lago.reprocesar(ProcesadorDatos())
+    print(f"⚡ Un mes reprocesado sin red: {len(datos)} filas en {time.perf_counter() - inicio:.2f}s")
+
+    semana = list(lago.reproducir('Twitter', '2024-01-08', '2024-01-14T23:59:59'))
+    print(f"🔎 Twitter, segunda semana: {len(semana)} cargas")
+
+    # Simular un corte entre escribir un bloque y guardar el manifiesto
+    segmento = lago.segmentos('Twitter')[-1]
+    with open(os.path.join(directorio, segmento['archivo']), 'ab') as f:
+        f.write(gzip.compress(json.dumps({'fecha': '2024-01-31T00:00:00', 'fuente': 'Twitter', 'carga': []}).encode()))
+        f.write(gzip.compress(b'{"cortado": tru')[:20])
+    with LagoDatos(directorio, tamano_segmento_mb=0.05) as reabierto:
+        reabierto.agregar('Twitter', [], datetime(2024, 1, 31, 0, 10))
+    print(f"🔎 Twitter tras el corte: {len(list(reabierto.reproducir('Twitter')))} cargas legibles")
+
+    lago = reabierto
+    lago.tamano_maximo = lago.tamano_total() // 2
+    lago.aplicar_retencion()
+    print(f"📉 Tras la retención: {len(lago.manifiesto)} segmentos ({lago.tamano_total() / 1024 / 1024:.1f} MB)")
+
+    print("🎯 Lago de datos probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_lago_datos()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Normalización de Tendencias
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para unificar los distintos nombres de una misma tendencia
+"""
+
+# Importar módulos necesarios
+import json
+import re
+import unicodedata
+from array import array
+
+import numpy as np
+import pandas as pd
+
+PATRON_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+PATRON_NUMEROS = re.compile(r'[0-9]+')
+
+
+def canonizar_etiqueta(etiqueta):
+    """
+    Función que lleva una etiqueta a su forma canónica.
+
+    'Streetwear', 'streetwear', 'Street wear' y '#streetwear' quedan
+    todas como 'streetwear': sin tildes, en minúsculas y sin símbolos.
+
+    Si la etiqueta no tiene letras latinas ni números (por ejemplo '#时尚'
+    o 'мода'), la clave no queda vacía: se usa la etiqueta en minúsculas
+    sin símbolos ni espacios, para que cada una siga siendo distinta.
+    """
+    texto = unicodedata.normalize('NFKD', str(etiqueta).lower())
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    clave = PATRON_NO_ALFANUMERICO.sub('', texto)
+    if clave:
+        return clave
+    minusculas = str(etiqueta).casefold()
+    return ''.join(caracter for caracter in minusculas if caracter.isalnum()) or minusculas.strip()
+
+
+def trigramas(clave):
+    """
+    Función que parte una clave en grupos de 3 letras ("trigramas").
+
+    'vintage' -> {'  v', ' vi', 'vin', 'int', 'nta', 'tag', 'age', 'ge '}
+    """
+    relleno = f"  {clave} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceTendencias:
+    """
+    Clase que asigna un número entero (ID) a cada tendencia conocida.
+
+    ¿Para qué? Para que "Streetwear" y "#streetwear" cuenten como la
+    misma tendencia, y para que los cálculos agrupen por números
+    pequeños en lugar de comparar textos.
+
+    Primero busca la forma canónica exacta (un diccionario, instantáneo).
+    Si no la encuentra, compara trigramas con las tendencias conocidas
+    para aceptar errores de escritura ('Streetwearr'). Si nada se parece
+    lo suficiente, la etiqueta se agrega como tendencia nueva.
+
+    Para no unir tendencias distintas, nunca se unen dos etiquetas con
+    números diferentes ('iPhone 15' y 'iPhone 14', 'Moda 2024' y 'Moda 2023')
+    ni de largos muy distintos ('Seguridad social' y 'Seguridad').
+    """
+
+    def __init__(self, similitud_minima=0.7, proporcion_largo_minima=0.8):
+        """
+        Constructor de la clase IndiceTendencias.
+        """
+        self.similitud_minima = similitud_minima
+        self.proporcion_largo_minima = proporcion_largo_minima
+        self.nombres = []          # ID -> nombre para mostrar
+        self.claves = []           # ID -> forma canónica original
+        self.ids_por_clave = {}    # forma canónica -> ID
+        # Listas de enteros compactas (array) para poder leerlas con NumPy sin copiar
+        self.indice_trigramas = {}  # trigrama -> IDs que lo contienen
+        self.trigramas_por_id = array('i')  # ID -> cantidad de trigramas
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def agregar(self, etiqueta):
+        """
+        Función que registra una tendencia nueva y devuelve su ID.
+        """
+        clave = canonizar_etiqueta(etiqueta)
+        if clave in self.ids_por_clave:
+            return self.ids_por_clave[clave]
+        id_tendencia = len(self.nombres)
+        self.nombres.append(str(etiqueta).lstrip('#').strip())
+        self.claves.append(clave)
+        self.ids_por_clave[clave] = id_tendencia
+        grupos = trigramas(clave)
+        self.trigramas_por_id.append(len(grupos))
+        for grupo in grupos:
+            self.indice_trigramas.setdefault(grupo, array('i')).append(id_tendencia)
+        return id_tendencia
+
+    def buscar_similar(self, clave):
+        """
+        Función que busca la tendencia conocida más parecida a una clave.
+
+        Devuelve (ID, similitud) o (None, 0.0) si ninguna supera el mínimo.
+        La similitud es el índice de Jaccard entre los trigramas.
+        """
+        if not clave:
+            return None, 0.0
+        grupos = trigramas(clave)
+        listas = [np.frombuffer(self.indice_trigramas[grupo], dtype=np.int32)
+                  for grupo in grupos if grupo in self.indice_trigramas]
+        if not listas:
+            return None, 0.0
+
+        # Contar trigramas en común con cada tendencia de una sola vez
+        comunes = np.bincount(np.concatenate(listas), minlength=len(self.nombres))
+        totales = np.frombuffer(self.trigramas_por_id, dtype=np.int32)
+        similitudes = comunes / (len(grupos) + totales - comunes)
+
+        # Revisar los candidatos del más parecido al menos parecido
+        candidatos = np.flatnonzero(similitudes >= self.similitud_minima)
+        for id_candidato in candidatos[np.argsort(-similitudes[candidatos], kind='stable')]:
+            if self.son_compatibles(clave, self.claves[id_candidato]):
+                return int(id_candidato), float(similitudes[id_candidato])
+        return None, 0.0
+
+    def son_compatibles(self, clave, otra_clave):
+        """
+        Función que decide si dos claves parecidas pueden ser la misma tendencia:
+        tienen que tener los mismos números y un largo parecido.
+        """
+        if PATRON_NUMEROS.findall(clave) != PATRON_NUMEROS.findall(otra_clave):
+            return False
+        corta, larga = sorted((len(clave), len(otra_clave)))
+        return corta / larga >= self.proporcion_largo_minima
+
+    def obtener_id(self, etiqueta):
+        """
+        Función que devuelve el ID de una etiqueta, agregándola si es nueva.
+        """
+        clave = canonizar_etiqueta(etiqueta)
+        id_tendencia = self.ids_por_clave.get(clave)
+        if id_tendencia is not None:
+            return id_tendencia
+        if not clave:
+            return self.agregar(etiqueta)
+        id_tendencia, _ = self.buscar_similar(clave)
+        if id_tendencia is None:
+            return self.agregar(etiqueta)
+        # Recordar la variante para que la próxima vez sea una búsqueda exacta
+        self.ids_por_clave[clave] = id_tendencia
+        return id_tendencia
+
+    def asignar_ids(self, datos, columna='tendencia'):
+        """
+        Función que agrega la columna 'tendencia_id' (enteros) a un DataFrame
+        y reemplaza cada etiqueta por su nombre canónico.
+
+        Solo busca una vez cada etiqueta distinta, no una vez por fila.
+        Las filas sin etiqueta (None o NaN) quedan sin ID y sin nombre.
+        """
+        codigos, etiquetas = pd.factorize(datos[columna])
+        # factorize marca las etiquetas vacías con -1: se agrega un -1 al
+        # final para que esas filas no tomen el ID de la última etiqueta
+        ids_etiquetas = np.array([self.obtener_id(etiqueta) for etiqueta in etiquetas] + [-1], dtype=np.int32)
+        ids = ids_etiquetas[codigos]
+
+        # Las categorías salen de los IDs usados; dos IDs con el mismo nombre
+        # para mostrar comparten categoría en lugar de romper el Categorical
+        usados = np.unique(ids[ids >= 0])
+        codigo_por_usado, categorias = pd.factorize(pd.Index([self.nombres[i] for i in usados], dtype=object))
+        codigo_por_id = np.full(len(self.nombres) + 1, -1, dtype=np.int64)
+        codigo_por_id[usados] = codigo_por_usado
+
+        datos = datos.copy()
+        datos['tendencia_id'] = pd.arrays.IntegerArray(ids, ids < 0)
+        datos[columna] = pd.Categorical.from_codes(codigo_por_id[ids], categories=categorias)
+        return datos
+
+    def guardar(self, ruta_archivo):
+        """
+        Función que guarda el índice en un archivo JSON.
+        """
+        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+            json.dump({
+                'similitud_minima': self.similitud_minima,
+                'proporcion_largo_minima': self.proporcion_largo_minima,
+                'nombres': self.nombres,
+                'ids_por_clave': self.ids_por_clave,
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta_archivo):
+        """
+        Función que carga un índice guardado con guardar().
+        """
+        with open(ruta_archivo, encoding='utf-8') as f:
+            contenido = json.load(f)
+        indice = cls(contenido['similitud_minima'], contenido.get('proporcion_largo_minima', 0.8))
+        for nombre in contenido['nombres']:
+            indice.agregar(nombre)
+        indice.ids_por_clave.update(contenido['ids_por_clave'])
+        return indice
+
+
+def probar_normalizador():
+    """
+    Función para probar el normalizador de tendencias.
+    """
+    print("🏷️ Probando Normalizador de Tendencias de CLARIO...")
+    print("=" * 60)
+
+    indice = IndiceTendencias()
+    for etiqueta in ['Streetwear', 'streetwear', 'Street wear', '#streetwear', 'Streetwearr', 'Vintage', '#VINTAGE', 'Minimalista']:
+        print(f"   {etiqueta!r:>15} -> {indice.obtener_id(etiqueta)}")
+    print(f"📊 Tendencias distintas: {len(indice)} ({', '.join(indice.nombres)})")
+
+    # Parecidas pero distintas: no se deben unir
+    for etiqueta in ['iPhone 15', 'iPhone 14', 'Moda 2024', 'Moda 2023', 'Vintage Ropa', '时尚', '#мода']:
+        print(f"   {etiqueta!r:>15} -> {indice.obtener_id(etiqueta)}")
+
+    datos = pd.DataFrame({
+        'tendencia': ['#streetwear', 'Vintage', 'Street wear', 'vintage'],
+        'popularidad': [85, 72, 91, 68],
+    })
+    print(indice.asignar_ids(datos))
+
+    print("🎯 Normalizador probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_normalizador()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Análisis (Parsing) de Páginas
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para convertir páginas HTML recolectadas en filas de datos
+"""
+
+# Importar módulos necesarios
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# Selectores CSS por defecto para encontrar publicaciones y sus métricas
+SELECTORES_POR_DEFECTO = {
+    'publicacion': 'article, .post, .tweet, .noticia',
+    'texto': '.texto, .contenido, p',
+    'metricas': '[data-me-gusta], [data-compartidos], [data-comentarios], .likes, .shares',
+}
+
+# Expresiones regulares compiladas una sola vez
+PATRON_HASHTAG = re.compile(r'#(\w{2,})', re.UNICODE)
+PATRON_NUMERO = re.compile(r'(\d[\d.,]*)\s*([kKmM]?)')
+# Selector "simple": etiqueta opcional seguida de .clases y/o #id (sin espacios ni >)
+PATRON_SELECTOR_SIMPLE = re.compile(r'([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+)*)')
+
+# Columnas que espera ProcesadorDatos
+COLUMNAS_FILAS = ['fecha', 'tendencia', 'popularidad', 'categoria', 'fuente']
+
+
+def convertir_numero(texto):
+    """
+    Función que convierte textos como "1,2k", "12.500", "1,234" o "350" en números.
+
+    Cómo se leen los separadores:
+    - Si hay puntos y comas, el último que aparece es el decimal ("1.234,5")
+    - Si un separador se repite, es de miles ("1.234.567")
+    - Si aparece una vez seguido de 3 dígitos y sin k/M, es de miles ("12.500")
+    - En otro caso es decimal ("1,2k", "3.5")
+    """
+    coincidencia = PATRON_NUMERO.search(texto or '')
+    if not coincidencia:
+        return 0
+    cifras = coincidencia.group(1).rstrip('.,')
+    sufijo = coincidencia.group(2).lower()
+    separadores = [caracter for caracter in cifras if caracter in '.,']
+    if len(set(separadores)) > 1:
+        decimal = separadores[-1]
+    elif len(separadores) == 1:
+        decimal = None if len(cifras) - cifras.index(separadores[0]) - 1 == 3 and not sufijo else separadores[0]
+    else:
+        decimal = None
+    if decimal is None:
+        numero = float(cifras.replace('.', '').replace(',', ''))
+    else:
+        entera, _, fraccion = cifras.rpartition(decimal)
+        numero = float(entera.replace('.', '').replace(',', '') + '.' + fraccion)
+    multiplicador = {'k': 1_000, 'm': 1_000_000}.get(sufijo, 1)
+    return int(round(numero * multiplicador))
+
+
+class FiltroPublicaciones(SoupStrainer):
+    """
+    Filtro que le dice a BeautifulSoup qué etiquetas construir: solo las
+    que coinciden con alguno de los selectores simples de publicaciones
+    (por etiqueta, clase y/o id), con todo su contenido.
+
+    Funciona con BeautifulSoup 4.12 (search_tag) y 4.13+ (allow_tag_creation).
+    """
+
+    def __init__(self, reglas):
+        super().__init__()
+        self.reglas = reglas
+
+    @classmethod
+    def desde_selector(cls, selector):
+        """
+        Crea el filtro a partir de un selector CSS, o devuelve None si algún
+        selector no es simple (por ejemplo "div#x article"): en ese caso
+        filtrar podría dejar afuera a los ancestros que el selector necesita.
+        """
+        reglas = []
+        for parte in selector.split(','):
+            coincidencia = PATRON_SELECTOR_SIMPLE.fullmatch(parte.strip())
+            if not coincidencia or not any(coincidencia.groups()):
+                return None
+            etiqueta, resto = coincidencia.groups()
+            trozos = re.findall(r'([.#])([\w-]+)', resto or '')
+            reglas.append((
+                None if etiqueta in (None, '*') else etiqueta.lower(),
+                {nombre for marca, nombre in trozos if marca == '.'},
+                {nombre for marca, nombre in trozos if marca == '#'},
+            ))
+        return cls(reglas)
+
+    def coincide(self, nombre, atributos):
+        clases = (atributos or {}).get('class') or []
+        if isinstance(clases, str):
+            clases = clases.split()
+        identificador = (atributos or {}).get('id')
+        return any(
+            (etiqueta is None or etiqueta == nombre)
+            and clases_pedidas.issubset(clases)
+            and (not ids_pedidos or identificador in ids_pedidos)
+            for etiqueta, clases_pedidas, ids_pedidos in self.reglas
+        )
+
+    # BeautifulSoup 4.13 o posterior
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.coincide(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # BeautifulSoup 4.12
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, Tag):
+            return markup_name if self.coincide(markup_name.name, markup_name.attrs) else None
+        return markup_name if self.coincide(markup_name, markup_attrs) else None
+
+
+class ParserPaginas:
+    """
+    Clase que extrae menciones de tendencias y métricas de páginas HTML.
+
+    ¿Qué es "parsear"? Es como leer una página web y subrayar solo lo
+    que nos interesa: los hashtags y cuántos "me gusta" tiene cada
+    publicación. El resultado son filas listas para ProcesadorDatos.
+
+    Usa el analizador "lxml" (mucho más rápido que el de Python puro),
+    solo construye el árbol de las etiquetas que contienen publicaciones
+    y compila los selectores CSS una única vez.
+    """
+
+    def __init__(self, selectores=None, categoria='General', backend='lxml'):
+        """
+        Constructor de la clase ParserPaginas.
+        """
+        self.nombre = "Parser de Páginas CLARIO"
+        self.version = "1.0"
+        self.categoria = categoria
+        self.backend = backend
+        selectores = {**SELECTORES_POR_DEFECTO, **(selectores or {})}
+        self.selectores = {clave: soupsieve.compile(valor) for clave, valor in selectores.items()}
+        # Solo se construyen en memoria las etiquetas que pueden ser publicaciones
+        self.filtro = FiltroPublicaciones.desde_selector(selectores['publicacion'])
+
+    def analizar_pagina(self, html, fuente, fecha=None):
+        """
+        Función que convierte una página HTML en una lista de filas.
+
+        Cada fila es una tupla (fecha, tendencia, popularidad, categoria, fuente).
+        La popularidad de una mención es la suma de las métricas de su publicación.
+        """
+        fecha = fecha or datetime.now().strftime('%Y-%m-%d')
+        sopa = BeautifulSoup(html, self.backend, parse_only=self.filtro)
+
+        filas = []
+        for publicacion in self.selectores['publicacion'].select(sopa):
+            bloques_texto = self.selectores['texto'].select(publicacion) or [publicacion]
+            # Si un bloque está dentro de otro (un <p> dentro de .contenido), su
+            # texto ya está incluido: se descarta para no contar dos veces
+            elegidos = {id(bloque) for bloque in bloques_texto}
+            bloques_texto = [bloque for bloque in bloques_texto
+                             if not any(id(padre) in elegidos for padre in bloque.parents)]
+            texto = ' '.join(bloque.get_text(' ', strip=True) for bloque in bloques_texto)
+            # Cada hashtag cuenta una vez por publicación
+            hashtags = list(dict.fromkeys(PATRON_HASHTAG.findall(texto)))
+            if not hashtags:
+                continue
+
+            popularidad = 0
+            for metrica in self.selectores['metricas'].select(publicacion):
+                valores_data = [valor for atributo, valor in metrica.attrs.items() if atributo.startswith('data-')]
+                popularidad += sum(convertir_numero(valor) for valor in valores_data) or convertir_numero(metrica.get_text())
+
+            for hashtag in hashtags:
+                filas.append((fecha, hashtag, popularidad, self.categoria, fuente))
+        return filas
+
+    def a_dataframe(self, filas):
+        """
+        Función que convierte las filas en un DataFrame con tipos correctos.
+        """
+        datos = pd.DataFrame.from_records(filas, columns=COLUMNAS_FILAS)
+        datos['fecha'] = pd.to_datetime(datos['fecha'])
+        datos['popularidad'] = datos['popularidad'].astype('int64')
+        datos['categoria'] = datos['categoria'].astype('category')
+        datos['fuente'] = datos['fuente'].astype('category')
+        return datos
+
+
+# Cada proceso del pool tiene su propio parser (los selectores se compilan una vez)
+_parser_del_proceso = None
+
+
+def _iniciar_proceso(selectores, categoria, backend):
+    global _parser_del_proceso
+    _parser_del_proceso = ParserPaginas(selectores, categoria, backend)
+
+
+def _analizar_en_proceso(pagina):
+    return _parser_del_proceso.analizar_pagina(pagina['html'], pagina['fuente'], pagina.get('fecha'))
+
+
+class PoolParsers:
+    """
+    Clase que reparte el parseo de páginas entre varios procesos.
+
+    ¿Por qué procesos y no hilos? Descargar páginas es "esperar a la red"
+    y los hilos sirven; parsear es "trabajo de CPU" y en Python solo
+    aprovecha varios núcleos si se usan procesos separados. Los
+    recolectores siguen descargando mientras este pool parsea.
+    """
+
+    def __init__(self, procesos=None, selectores=None, categoria='General', backend='lxml'):
+        """
+        Constructor de la clase PoolParsers.
+        """
+        self.procesos = procesos or os.cpu_count()
+        self.parser = ParserPaginas(selectores, categoria, backend)
+        self._argumentos = (selectores, categoria, backend)
+        self._ejecutor = None
+
+    def __enter__(self):
+        self._ejecutor = ProcessPoolExecutor(
+            max_workers=self.procesos,
+            initializer=_iniciar_proceso,
+            initargs=self._argumentos,
+        )
+        return self
+
+    def __exit__(self, *exc):
+        self._ejecutor.shutdown()
+        self._ejecutor = None
+        return False
+
+    def enviar(self, pagina):
+        """
+        Función que encola una página (dict con 'html', 'fuente' y 'fecha')
+        y devuelve un "future" con sus filas. Pensada para llamarse desde los recolectores.
+        """
+        return self._ejecutor.submit(_analizar_en_proceso, pagina)
+
+    def analizar_paginas(self, paginas, tamano_lote=16):
+        """
+        Función que parsea muchas páginas en paralelo y devuelve un DataFrame.
+        """
+        filas = []
+        for filas_pagina in self._ejecutor.map(_analizar_en_proceso, paginas, chunksize=tamano_lote):
+            filas.extend(filas_pagina)
+        return self.parser.a_dataframe(filas)
+
+
+def generar_corpus_ejemplo(directorio="data/corpus_html", cantidad=200):
+    """
+    Función que guarda un corpus local de páginas HTML para medir el rendimiento.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    tendencias = ['Streetwear', 'Vintage', 'Minimalista', 'Colorido', 'Deportivo']
+    for i in range(cantidad):
+        publicaciones = ''.join(
+            f'<article class="post"><p class="texto">Look del día #{tendencias[(i + j) % 5]} #moda</p>'
+            f'<span data-me-gusta="{(i * 7 + j) % 500}"></span><span class="shares">{j}k</span></article>'
+            for j in range(50)
+        )
+        html = f'<html><head><title>Página {i}</title></head><body><nav>menú</nav>{publicaciones}</body></html>'
+        with open(os.path.join(directorio, f"pagina_{i:05d}.html"), 'w', encoding='utf-8') as f:
+            f.write(html)
+    return directorio
+
+
+def medir_rendimiento(directorio="data/corpus_html", procesos=None):
+    """
+    Función que mide cuántas páginas por segundo se parsean sobre un corpus local.
+    """
+    paginas = []
+    for nombre in sorted(os.listdir(directorio)):
+        with open(os.path.join(directorio, nombre), encoding='utf-8') as f:
+            paginas.append({'html': f.read(), 'fuente': 'Instagram', 'fecha': '2024-01-01'})
+
+    inicio = time.perf_counter()
+    with PoolParsers(procesos=procesos) as pool:
+        datos = pool.analizar_paginas(paginas)
+    duracion = time.perf_counter() - inicio
+
+    paginas_por_segundo = len(paginas) / duracion
+    print(f"⚡ {len(paginas)} páginas en {duracion:.2f}s: {paginas_por_segundo:.1f} páginas/seg ({len(datos)} filas)")
+    return paginas_por_segundo
+
+
+def probar_parser():
+    """
+    Función para probar el parser de páginas.
+    """
+    import tempfile
+
+    print("🧩 Probando Parser de Páginas de CLARIO...")
+    print("=" * 60)
+
+    parser = ParserPaginas(categoria='Ropa')
+    html = ('<article><p>Nuevo drop #Streetwear #Vintage</p><span data-me-gusta="1,2k"></span></article>'
+            '<article><p>Sin hashtags</p></article>')
+    filas = parser.analizar_pagina(html, 'Instagram', '2024-01-01')
+    print(parser.a_dataframe(filas))
+    print()
+
+    # El corpus de prueba va a una carpeta temporal, no a data/
+    directorio = generar_corpus_ejemplo(tempfile.mkdtemp())
+    medir_rendimiento(directorio, procesos=1)
+    medir_rendimiento(directorio)
+
+    print("🎯 Parser de páginas probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_parser()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Pipeline Multicategoría
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para analizar varias categorías (moda, alimentos, política) en una sola pasada
+"""
+
+# Importar módulos necesarios
+import os
+from datetime import datetime
+
+import numpy as np
+
+from src.analizador_tendencias import AnalizadorTendencias
+from src.dashboard_simple import DashboardSimple
+from src.normalizador_tendencias import canonizar_etiqueta
+from src.procesador_datos import ProcesadorDatos
+from src.serializador_reportes import guardar_json
+
+
+class PipelineMulticategoria:
+    """
+    Clase que ejecuta el pipeline de CLARIO para todas las categorías juntas.
+
+    ¿Por qué no correr el pipeline una vez por categoría? Porque se
+    limpiarían y recorrerían los mismos datos muchas veces. Acá los
+    datos se limpian una vez, se agrupan por categoría en un solo paso
+    y de esos agregados compartidos salen los reportes y dashboards
+    de cada categoría.
+    """
+
+    def __init__(self, carpeta_salida="data", umbral_crecimiento=10):
+        """
+        Constructor de la clase PipelineMulticategoria.
+        """
+        self.nombre = "Pipeline Multicategoría CLARIO"
+        self.version = "1.0"
+        self.carpeta_salida = carpeta_salida
+        self.umbral_crecimiento = umbral_crecimiento
+        self.procesador = ProcesadorDatos()
+        self.analizador = AnalizadorTendencias()
+
+    def agregar(self, datos):
+        """
+        Función que calcula todos los agregados de todas las categorías a la vez.
+
+        Los datos se recorren una sola vez: un único groupby por categoría,
+        tendencia, fuente y fecha calcula suma, cantidad, suma de cuadrados,
+        máximo, primer y último valor. Todo lo demás (por tendencia, por
+        mes, por fuente, por categoría y la tabla diaria) sale de ese
+        agregado, que es mucho más chico que los datos.
+        """
+        print("🧮 Calculando agregados compartidos de todas las categorías...")
+
+        # Ordenar por fecha para que "primero" y "último" sigan el tiempo
+        ordenados = datos.sort_values('fecha', kind='stable', ignore_index=True)
+        base = (ordenados.assign(cuadrado=ordenados['popularidad'] ** 2)
+                .groupby(['categoria', 'tendencia', 'fuente', 'fecha'], sort=False, observed=True)
+                .agg(primero=('popularidad', 'first'), ultimo=('popularidad', 'last'),
+                     suma=('popularidad', 'sum'), cantidad=('popularidad', 'count'),
+                     filas=('popularidad', 'size'), suma_cuadrados=('cuadrado', 'sum'),
+                     maximo=('popularidad', 'max')))
+        claves = base.index.to_frame(index=False)
+        base = base.reset_index(drop=True)
+        categorias = claves['categoria']
+
+        def promedio(*grupos):
+            sumas = base.groupby(list(grupos), observed=True)[['suma', 'cantidad']].sum()
+            return sumas['suma'] / sumas['cantidad']
+
+        # Las filas de base siguen el orden por fecha: first/last dan el primer y último valor
+        por_tendencia = base.groupby([categorias, claves['tendencia']], sort=False, observed=True).agg(
+            first=('primero', 'first'), last=('ultimo', 'last'), size=('filas', 'sum'))
+
+        # Variabilidad (desvío estándar) a partir de suma, suma de cuadrados y cantidad
+        totales = base.groupby(categorias, observed=True)[['suma', 'suma_cuadrados', 'cantidad']].sum()
+        varianza = (totales['suma_cuadrados'] - totales['suma'] ** 2 / totales['cantidad']) / (totales['cantidad'] - 1)
+        por_categoria = claves.groupby('categoria', observed=True).agg(
+            desde=('fecha', 'min'), hasta=('fecha', 'max'),
+            total_tendencias=('tendencia', 'nunique'), fuentes=('fuente', 'unique'))
+        por_categoria['variabilidad'] = np.sqrt(varianza.clip(lower=0))
+
+        # La fila con mayor popularidad de cada categoría, por posición (no por etiqueta)
+        maximos = base['maximo'].to_numpy()
+        indices = base.groupby(categorias, observed=True).indices
+        posiciones = [indices[c][np.argmax(maximos[indices[c]])] for c in por_categoria.index]
+        por_categoria['tendencia_maxima'] = claves['tendencia'].to_numpy()[posiciones]
+        por_categoria['popularidad_maxima'] = maximos[posiciones]
+
+        return {
+            'por_tendencia': por_tendencia,
+            'por_mes': promedio(categorias, claves['fecha'].dt.month.rename('mes')),
+            'por_fuente': promedio(categorias, claves['fuente']),
+            'por_categoria': por_categoria,
+            'diario': promedio(categorias, claves['fecha'], claves['tendencia']).unstack('tendencia'),
+        }
+
+    def resultados_categoria(self, agregados, categoria):
+        """
+        Función que arma los resultados de una categoría (con la misma forma
+        que devuelve AnalizadorTendencias) a partir de los agregados compartidos.
+        """
+        crecimiento = {
+            tendencia: self.analizador.describir_crecimiento(fila['first'], fila['last'])
+            for tendencia, fila in agregados['por_tendencia'].loc[categoria].iterrows()
+            if fila['size'] > 1
+        }
+        emergentes = {
+            tendencia: valores for tendencia, valores in crecimiento.items()
+            if valores['crecimiento_porcentual'] > self.umbral_crecimiento
+        }
+
+        por_mes = agregados['por_mes'].loc[categoria]
+        estacionalidad = {
+            'mes_mas_popular': por_mes.idxmax(),
+            'mes_menos_popular': por_mes.idxmin(),
+            'popularidad_por_mes': por_mes.to_dict()
+        }
+
+        resumen = agregados['por_categoria'].loc[categoria]
+        insights = self.analizador.redactar_insights(
+            resumen['tendencia_maxima'], resumen['popularidad_maxima'],
+            next(iter(emergentes), None),
+            agregados['por_fuente'].loc[categoria].idxmax(),
+            resumen['variabilidad'],
+        )
+
+        return {
+            'fecha_generacion': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            'categoria': categoria,
+            'resumen_ejecutivo': {
+                'total_tendencias': resumen['total_tendencias'],
+                'periodo_analisis': f"{resumen['desde'].strftime('%d/%m/%Y')} - {resumen['hasta'].strftime('%d/%m/%Y')}",
+                'fuentes_analizadas': list(resumen['fuentes'])
+            },
+            'analisis_crecimiento': crecimiento,
+            'tendencias_emergentes': emergentes,
+            'analisis_estacionalidad': estacionalidad,
+            'insights': insights
+        }
+
+    def ejecutar(self, datos, crear_dashboards=True):
+        """
+        Función que ejecuta el pipeline completo para todas las categorías.
+
+        Devuelve un diccionario categoría -> {'reporte', 'archivo_reporte', 'dashboard'}.
+        """
+        print(f"🗂️ Ejecutando pipeline para {datos['categoria'].nunique()} categorías...")
+
+        datos_limpios = self.procesador.limpiar_datos(datos)
+        agregados = self.agregar(datos_limpios)
+
+        resultados = {}
+        for categoria in agregados['por_categoria'].index:
+            carpeta = os.path.join(self.carpeta_salida, canonizar_etiqueta(categoria))
+            os.makedirs(carpeta, exist_ok=True)
+
+            reporte = self.resultados_categoria(agregados, categoria)
+            archivo_reporte = os.path.join(carpeta, f"reporte_tendencias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            guardar_json(reporte, archivo_reporte)
+            print(f"✅ Reporte de '{categoria}' guardado en: {archivo_reporte}")
+
+            dashboard = None
+            if crear_dashboards:
+                datos_dashboard = agregados['diario'].loc[categoria].dropna(axis=1, how='all').reset_index()
+                dashboard = DashboardSimple(carpeta, mostrar=False).crear_dashboard_completo(datos_dashboard, categoria)
+
+            resultados[categoria] = {
+                'reporte': reporte,
+                'archivo_reporte': archivo_reporte,
+                'dashboard': dashboard
+            }
+        return resultados
+
+
+def probar_pipeline_multicategoria():
+    """
+    Función para probar el pipeline multicategoría.
+    """
+    print("🗂️ Probando Pipeline Multicategoría de CLARIO...")
+    print("=" * 60)
+
+    pipeline = PipelineMulticategoria()
+    datos = pipeline.procesador.crear_datos_ejemplo_multicategoria()
+    resultados = pipeline.ejecutar(datos)
+
+    for categoria, resultado in resultados.items():
+        print(f"📁 {categoria}:")
+        for insight in resultado['reporte']['insights']:
+            print(f"   {insight}")
+
+    print("🎯 Pipeline multicategoría probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_pipeline_multicategoria()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Pool de Navegadores
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para reutilizar navegadores headless en fuentes que necesitan JavaScript
+"""
+
+# Importar módulos necesarios
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import psutil
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# Recursos que no hacen falta para leer el contenido de la página
+RECURSOS_BLOQUEADOS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg',
+]
+
+
+def crear_navegador_headless():
+    """
+    Función que abre un Chrome sin ventana que no descarga imágenes, fuentes ni videos.
+    """
+    opciones = webdriver.ChromeOptions()
+    opciones.add_argument('--headless=new')
+    opciones.add_argument('--disable-gpu')
+    opciones.add_argument('--no-sandbox')
+    opciones.add_argument('--disable-dev-shm-usage')
+    opciones.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.media_stream': 2,
+    })
+    navegador = webdriver.Chrome(options=opciones)
+    navegador.execute_cdp_cmd('Network.enable', {})
+    navegador.execute_cdp_cmd('Network.setBlockedURLs', {'urls': RECURSOS_BLOQUEADOS})
+    return navegador
+
+
+class SesionNavegador:
+    """
+    Clase que representa un navegador abierto, cuántas páginas lleva
+    visitadas y cuánta memoria usaba al abrirse.
+    """
+
+    def __init__(self, navegador):
+        """
+        Constructor de la clase SesionNavegador.
+        """
+        self.navegador = navegador
+        self.paginas_visitadas = 0
+        self.memoria_inicial_mb = self.memoria_mb()
+
+    def memoria_mb(self):
+        """
+        Función que devuelve la memoria (RSS, en MB) del proceso del driver
+        y de todos sus hijos: el navegador y sus pestañas.
+
+        Devuelve 0 si no se conoce el proceso (por ejemplo, un navegador remoto).
+        """
+        servicio = getattr(self.navegador, 'service', None)
+        proceso = getattr(servicio, 'process', None)
+        if proceso is None:
+            return 0
+        try:
+            principal = psutil.Process(proceso.pid)
+            procesos = [principal, *principal.children(recursive=True)]
+        except psutil.Error:
+            return 0
+        bytes_usados = 0
+        for hijo in procesos:
+            try:
+                bytes_usados += hijo.memory_info().rss
+            except psutil.Error:
+                pass  # una pestaña que se cerró mientras se medía
+        return bytes_usados / (1024 * 1024)
+
+    def crecimiento_memoria_mb(self):
+        """
+        Función que dice cuánto creció la memoria desde que se abrió el navegador.
+        """
+        return self.memoria_mb() - self.memoria_inicial_mb
+
+    def cerrar(self):
+        try:
+            self.navegador.quit()
+        except WebDriverException:
+            pass
+
+
+class PoolNavegadores:
+    """
+    Clase que mantiene abiertos unos pocos navegadores y los presta a las tareas.
+
+    ¿Por qué un "pool"? Abrir un navegador tarda segundos. En lugar de
+    abrir uno por página, se abren N al principio y cada tarea toma uno
+    prestado de una cola y lo devuelve al terminar. Un navegador se
+    reemplaza por uno nuevo cuando visitó max_paginas páginas o cuando
+    la memoria de su proceso creció más de limite_crecimiento_mb desde
+    que se abrió.
+    """
+
+    def __init__(self, tamano=4, max_paginas=100, limite_crecimiento_mb=512,
+                 crear_navegador=crear_navegador_headless, timeout_pagina=30):
+        """
+        Constructor de la clase PoolNavegadores.
+        """
+        self.nombre = "Pool de Navegadores CLARIO"
+        self.version = "1.0"
+        self.tamano = tamano
+        self.max_paginas = max_paginas
+        self.limite_crecimiento_mb = limite_crecimiento_mb
+        self.crear_navegador = crear_navegador
+        self.timeout_pagina = timeout_pagina
+        self.sesiones_recicladas = 0
+        self._cola = queue.Queue()
+        self._bloqueo = threading.Lock()
+
+    def _nueva_sesion(self):
+        navegador = self.crear_navegador()
+        navegador.set_page_load_timeout(self.timeout_pagina)
+        return SesionNavegador(navegador)
+
+    def __enter__(self):
+        # Abrir los navegadores en paralelo: cada uno tarda en arrancar
+        with ThreadPoolExecutor(max_workers=self.tamano) as ejecutor:
+            for sesion in ejecutor.map(lambda _: self._nueva_sesion(), range(self.tamano)):
+                self._cola.put(sesion)
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    def cerrar(self):
+        """
+        Función que cierra todos los navegadores del pool.
+        """
+        while not self._cola.empty():
+            sesion = self._cola.get_nowait()
+            if sesion is not None:
+                sesion.cerrar()
+
+    def _necesita_reciclar(self, sesion):
+        if sesion.paginas_visitadas >= self.max_paginas:
+            return True
+        return sesion.crecimiento_memoria_mb() > self.limite_crecimiento_mb
+
+    def _devolver(self, sesion, reciclar, intentos=3):
+        """
+        Devuelve la sesión a la cola (o una nueva, si hay que reciclarla).
+
+        Nunca lanza errores: si no se puede abrir un navegador nuevo, se
+        devuelve un lugar vacío (None) que se vuelve a intentar llenar
+        cuando alguien lo tome. Así el pool nunca se achica.
+        """
+        if reciclar:
+            sesion.cerrar()
+            sesion = None
+            for intento in range(intentos):
+                try:
+                    sesion = self._nueva_sesion()
+                    break
+                except Exception as e:
+                    print(f"⚠️ No se pudo abrir un navegador nuevo (intento {intento + 1}): {e}")
+                    time.sleep(0.5 * 2 ** intento)
+            with self._bloqueo:
+                self.sesiones_recicladas += 1
+        self._cola.put(sesion)
+
+    def _tomar(self):
+        sesion = self._cola.get()
+        if sesion is None:
+            try:
+                sesion = self._nueva_sesion()
+            except Exception:
+                # El lugar vacío vuelve a la cola para que lo intente otra tarea
+                self._cola.put(None)
+                raise
+        return sesion
+
+    def obtener_html(self, url):
+        """
+        Función que pide un navegador prestado, carga la URL y devuelve el HTML ya renderizado.
+        """
+        sesion = self._tomar()
+        reciclar = False
+        try:
+            sesion.navegador.get(url)
+            sesion.paginas_visitadas += 1
+            html = sesion.navegador.page_source
+            reciclar = self._necesita_reciclar(sesion)
+            return html
+        except WebDriverException:
+            # Un navegador que falló no se vuelve a usar
+            reciclar = True
+            raise
+        finally:
+            self._devolver(sesion, reciclar)
+
+    def recolectar(self, urls, fuente):
+        """
+        Función que descarga muchas URLs usando todos los navegadores del pool.
+
+        Devuelve páginas en el formato que espera PoolParsers. Si una URL
+        falla, el resto se descarga igual: esa página queda con html vacío
+        y el motivo en 'error' (None en las que salieron bien).
+        """
+        fecha = datetime.now().strftime('%Y-%m-%d')
+
+        def descargar(url):
+            try:
+                return {'html': self.obtener_html(url), 'fuente': fuente, 'fecha': fecha, 'url': url, 'error': None}
+            except Exception as e:
+                return {'html': '', 'fuente': fuente, 'fecha': fecha, 'url': url, 'error': f"{type(e).__name__}: {e}"}
+
+        with ThreadPoolExecutor(max_workers=self.tamano) as ejecutor:
+            return list(ejecutor.map(descargar, urls))
+
+
+def probar_pool_navegadores():
+    """
+    Función para probar el pool de navegadores con páginas estáticas locales.
+    """
+    import functools
+    import http.server
+    import os
+    import tempfile
+
+    print("🌐 Probando Pool de Navegadores de CLARIO...")
+    print("=" * 60)
+
+    # Servir páginas estáticas desde una carpeta temporal
+    carpeta = tempfile.mkdtemp()
+    for i in range(20):
+        with open(os.path.join(carpeta, f"pagina_{i}.html"), 'w', encoding='utf-8') as f:
+            f.write(f'<html><body><article><p>Post {i} #Streetwear</p><img src="foto.png"></article></body></html>')
+    manejador = functools.partial(http.server.SimpleHTTPRequestHandler, directory=carpeta)
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{servidor.server_port}/pagina_{i}.html" for i in range(20)]
+
+    for tamano in (1, 2):
+        inicio = time.perf_counter()
+        with PoolNavegadores(tamano=tamano, max_paginas=5) as pool:
+            paginas = pool.recolectar(urls, 'Instagram')
+        duracion = time.perf_counter() - inicio
+        print(f"⚡ Pool de {tamano}: {len(paginas) / duracion * 60:.0f} páginas/min "
+              f"({pool.sesiones_recicladas} navegadores reciclados)")
+
+    servidor.shutdown()
+    print("🎯 Pool de navegadores probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_pool_navegadores()
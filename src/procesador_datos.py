@@ -60,6 +60,63 @@ class ProcesadorDatos:
         print("✅ Datos de ejemplo creados exitosamente")
         return df_moda
     
+    def crear_datos_desde_registros(self, registros, deduplicador=None):
+        """
+        Función que convierte registros recolectados en un DataFrame.
+        
+        Si se pasa un Deduplicador, los registros repetidos se descartan
+        antes de crear la tabla, así pandas nunca los llega a ver.
+        """
+        print("📥 Creando datos desde registros recolectados...")
+        
+        if deduplicador is not None:
+            registros = deduplicador.filtrar(registros)
+        
+        columnas = ['fecha', 'tendencia', 'popularidad', 'categoria', 'fuente']
+        datos = pd.DataFrame.from_records(
+            ({columna: registro.get(columna) for columna in columnas} for registro in registros),
+            columns=columnas
+        )
+        
+        if deduplicador is not None:
+            print(f"🧹 Duplicados descartados: {deduplicador.duplicados_descartados}")
+        print(f"✅ {len(datos)} registros cargados")
+        return datos
+    
+    def crear_datos_ejemplo_multicategoria(self, dias=60):
+        """
+        Función que crea datos de ejemplo de varias categorías a la vez:
+        moda, alimentos y política (como describe el README).
+        """
+        print("📊 Creando datos de ejemplo de varias categorías...")
+        
+        tendencias_por_categoria = {
+            'Ropa': ['Streetwear', 'Vintage', 'Minimalista', 'Deportivo'],
+            'Alimentos': ['Plant-based', 'Café de especialidad', 'Snacks saludables'],
+            'Política': ['Economía', 'Seguridad', 'Educación', 'Medio ambiente']
+        }
+        fuentes = ['Instagram', 'Twitter', 'Google Trends', 'Noticias']
+        fechas = pd.date_range('2024-01-01', periods=dias, freq='D')
+        generador = np.random.default_rng(2024)
+        
+        filas = []
+        for categoria, tendencias in tendencias_por_categoria.items():
+            for tendencia in tendencias:
+                base = generador.uniform(50, 85)
+                pendiente = generador.normal(0, 0.3)
+                for dia, fecha in enumerate(fechas):
+                    filas.append({
+                        'fecha': fecha.strftime('%Y-%m-%d'),
+                        'tendencia': tendencia,
+                        'popularidad': int(np.clip(base + pendiente * dia + generador.normal(0, 5), 0, 100)),
+                        'categoria': categoria,
+                        'fuente': fuentes[dia % len(fuentes)]
+                    })
+        
+        datos = pd.DataFrame(filas)
+        print(f"✅ {len(datos)} filas creadas en {len(tendencias_por_categoria)} categorías")
+        return datos
+    
     def limpiar_datos(self, datos):
         """
         Función que limpia y organiza los datos.
@@ -92,6 +149,23 @@ class ProcesadorDatos:
         print("✅ Limpieza de datos completada")
         return datos_limpios
     
+    def normalizar_tendencias(self, datos, indice):
+        """
+        Función que unifica los nombres de las tendencias usando un IndiceTendencias.
+        
+        ¿Por qué? Porque 'Streetwear', '#streetwear' y 'Street wear' son la
+        misma tendencia. Agrega la columna 'tendencia_id' (números enteros)
+        para que los análisis agrupen por números en vez de por textos.
+        """
+        print("🏷️ Normalizando nombres de tendencias...")
+        
+        etiquetas_antes = datos['tendencia'].nunique()
+        datos_normalizados = indice.asignar_ids(datos)
+        etiquetas_despues = datos_normalizados['tendencia_id'].nunique()
+        
+        print(f"📊 Etiquetas distintas: {etiquetas_antes} -> {etiquetas_despues} tendencias")
+        return datos_normalizados
+    
     def analizar_datos_basicos(self, datos):
         """
         Función que hace análisis básicos de los datos.
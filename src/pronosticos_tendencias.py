@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Pronósticos de Tendencias
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para pronosticar la popularidad de todas las tendencias a la vez
+"""
+
+# Importar módulos necesarios
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from src.correlaciones_tendencias import pivotar_matriz
+
+MODELOS_DISPONIBLES = ["lineal", "holt_winters", "ingenuo_estacional"]
+
+
+def rellenar_huecos(matriz):
+    """
+    Función que completa los NaN de cada fila con el último valor conocido
+    (y los del principio con el primero), sin recorrer fila por fila.
+    """
+    matriz = np.array(matriz, dtype=np.float64)
+    validos = ~np.isnan(matriz)
+    columnas = np.where(validos, np.arange(matriz.shape[1]), 0)
+    np.maximum.accumulate(columnas, axis=1, out=columnas)
+    matriz = np.take_along_axis(matriz, columnas, axis=1)
+    primeros = np.where(validos.any(axis=1), validos.argmax(axis=1), 0)
+    valor_inicial = matriz[np.arange(len(matriz)), primeros][:, None]
+    return np.where(np.isnan(matriz), valor_inicial, matriz)
+
+
+def pronostico_lineal(matriz, horizonte, z):
+    """
+    Recta de mínimos cuadrados para cada fila, calculada con sumas vectorizadas.
+    """
+    largo = matriz.shape[1]
+    tiempo = np.arange(largo, dtype=np.float64)
+    tiempo_centrado = tiempo - tiempo.mean()
+    suma_cuadrados = (tiempo_centrado ** 2).sum() or 1.0
+    promedio = matriz.mean(axis=1, keepdims=True)
+    pendiente = ((matriz - promedio) @ tiempo_centrado)[:, None] / suma_cuadrados
+    ajuste = promedio + pendiente * tiempo_centrado
+    sigma = np.sqrt(((matriz - ajuste) ** 2).sum(axis=1, keepdims=True) / max(largo - 2, 1))
+
+    futuro = np.arange(largo, largo + horizonte) - tiempo.mean()
+    pronostico = promedio + pendiente * futuro
+    ancho = z * sigma * np.sqrt(1 + 1 / largo + futuro ** 2 / suma_cuadrados)
+    return pronostico, pronostico - ancho, pronostico + ancho
+
+
+def pronostico_holt_winters(matriz, horizonte, z, periodo=7, alfas=(0.2, 0.5, 0.8), beta=0.1, gamma=0.1):
+    """
+    Suavizado exponencial de Holt-Winters (aditivo) para todas las filas a la vez.
+
+    El bucle recorre el tiempo, no las series: en cada paso se actualizan
+    nivel, pendiente y estacionalidad de todas las tendencias juntas.
+    Para cada serie se elige el alfa con menor error de un paso.
+    """
+    cantidad, largo = matriz.shape
+    if largo < 2 * periodo:
+        periodo, gamma = 1, 0.0
+
+    nivel_inicial = matriz[:, :periodo].mean(axis=1)
+    if largo >= 2 * periodo:
+        pendiente_inicial = (matriz[:, periodo:2 * periodo].mean(axis=1) - nivel_inicial) / periodo
+    else:
+        pendiente_inicial = np.zeros(cantidad)
+    estacion_inicial = matriz[:, :periodo] - nivel_inicial[:, None] if periodo > 1 else np.zeros((cantidad, 1))
+
+    mejor_error = np.full(cantidad, np.inf)
+    mejor = {}
+    for alfa in alfas:
+        nivel, pendiente, estacion = nivel_inicial.copy(), pendiente_inicial.copy(), estacion_inicial.copy()
+        errores = np.zeros(cantidad)
+        for t in range(largo):
+            indice = t % periodo
+            valor = matriz[:, t]
+            error = valor - (nivel + pendiente + estacion[:, indice])
+            errores += error ** 2
+            nivel_nuevo = alfa * (valor - estacion[:, indice]) + (1 - alfa) * (nivel + pendiente)
+            pendiente = beta * (nivel_nuevo - nivel) + (1 - beta) * pendiente
+            estacion[:, indice] = gamma * (valor - nivel_nuevo) + (1 - gamma) * estacion[:, indice]
+            nivel = nivel_nuevo
+
+        pasos = np.arange(1, horizonte + 1)
+        pronostico = nivel[:, None] + pendiente[:, None] * pasos + estacion[:, (largo + pasos - 1) % periodo]
+        sigma = np.sqrt(errores / largo)[:, None]
+        # Aproximación del error que se acumula al pronosticar h pasos hacia adelante
+        ancho = z * sigma * np.sqrt(1 + (pasos - 1) * alfa ** 2)
+
+        es_mejor = errores < mejor_error
+        mejor_error = np.where(es_mejor, errores, mejor_error)
+        for clave, valor in (('pronostico', pronostico), ('ancho', ancho)):
+            mejor[clave] = np.where(es_mejor[:, None], valor, mejor.get(clave, valor))
+
+    return mejor['pronostico'], mejor['pronostico'] - mejor['ancho'], mejor['pronostico'] + mejor['ancho']
+
+
+def pronostico_ingenuo_estacional(matriz, horizonte, z, periodo=7):
+    """
+    Repite el valor del mismo día del último período ("el próximo lunes
+    será como el último lunes").
+    """
+    largo = matriz.shape[1]
+    periodo = min(periodo, largo)
+    pasos = np.arange(1, horizonte + 1)
+    pronostico = matriz[:, largo - periodo + (pasos - 1) % periodo]
+    if largo > periodo:
+        diferencias = matriz[:, periodo:] - matriz[:, :-periodo]
+        sigma = np.sqrt((diferencias ** 2).mean(axis=1, keepdims=True))
+    else:
+        sigma = np.zeros((len(matriz), 1))
+    ancho = z * sigma * np.sqrt((pasos - 1) // periodo + 1)
+    return pronostico, pronostico - ancho, pronostico + ancho
+
+
+def _pronosticar_lote(argumentos):
+    modelo, matriz, horizonte, z, periodo = argumentos
+    if modelo == "lineal":
+        return pronostico_lineal(matriz, horizonte, z)
+    if modelo == "holt_winters":
+        return pronostico_holt_winters(matriz, horizonte, z, periodo)
+    return pronostico_ingenuo_estacional(matriz, horizonte, z, periodo)
+
+
+class PronosticadorTendencias:
+    """
+    Clase que pronostica los próximos días de todas las tendencias juntas.
+
+    ¿Qué es un "pronóstico"? Es una estimación de cómo seguirá una
+    tendencia, con un intervalo ("entre 70 y 80") que indica cuánta
+    confianza tenemos.
+
+    No se crea un modelo por tendencia: cada modelo es un conjunto de
+    operaciones sobre la matriz tendencia × tiempo. Con muchas series
+    la matriz se parte en lotes que se reparten entre varios procesos.
+    """
+
+    def __init__(self, horizonte=7, nivel_confianza=0.95, periodo_estacional=7,
+                 procesos=None, tamano_lote=20_000):
+        """
+        Constructor de la clase PronosticadorTendencias.
+        """
+        self.nombre = "Pronosticador de Tendencias CLARIO"
+        self.version = "1.0"
+        self.horizonte = horizonte
+        self.nivel_confianza = nivel_confianza
+        self.periodo_estacional = periodo_estacional
+        self.procesos = procesos or os.cpu_count()
+        self.tamano_lote = tamano_lote
+        self._z = NormalDist().inv_cdf(0.5 + nivel_confianza / 2)
+
+    def pronosticar_matriz(self, matriz, modelo="holt_winters"):
+        """
+        Función que pronostica cada fila de una matriz (tendencias × tiempo).
+
+        Devuelve tres arreglos (tendencias × horizonte): pronóstico,
+        límite inferior y límite superior.
+        """
+        if modelo not in MODELOS_DISPONIBLES:
+            raise ValueError(f"Modelo no soportado: {modelo}. Opciones: {', '.join(MODELOS_DISPONIBLES)}")
+
+        matriz = rellenar_huecos(matriz)
+        lotes = [
+            (modelo, matriz[inicio:inicio + self.tamano_lote], self.horizonte, self._z, self.periodo_estacional)
+            for inicio in range(0, len(matriz), self.tamano_lote)
+        ]
+        if self.procesos > 1 and len(lotes) > 1:
+            with ProcessPoolExecutor(max_workers=self.procesos) as ejecutor:
+                resultados = list(ejecutor.map(_pronosticar_lote, lotes))
+        else:
+            resultados = [_pronosticar_lote(lote) for lote in lotes]
+        return tuple(np.concatenate(partes) for partes in zip(*resultados))
+
+    def pronosticar(self, datos, modelo="holt_winters"):
+        """
+        Función que pronostica todas las tendencias de un DataFrame limpio.
+
+        Devuelve un DataFrame con una fila por tendencia y día futuro.
+        """
+        matriz, nombres, fechas = pivotar_matriz(datos)
+        pronostico, inferior, superior = self.pronosticar_matriz(matriz, modelo)
+        fechas_futuras = pd.date_range(fechas[-1] + pd.Timedelta(days=1), periods=self.horizonte, freq='D')
+        return pd.DataFrame({
+            'tendencia': np.repeat(np.asarray(nombres, dtype=object), self.horizonte),
+            'fecha': np.tile(fechas_futuras, len(nombres)),
+            'pronostico': pronostico.ravel(),
+            'limite_inferior': inferior.ravel(),
+            'limite_superior': superior.ravel(),
+            'modelo': modelo,
+        })
+
+    def pronosticar_almacen(self, almacen, tendencias=None, desde=None, modelo="holt_winters"):
+        """
+        Función que pronostica tendencias leídas de un AlmacenSeries, sin
+        pasar por un DataFrame. desde limita cuánta historia se usa.
+
+        Devuelve (pronóstico, inferior, superior, nombres).
+        """
+        matriz, nombres, _ = almacen.matriz(tendencias, desde=desde)
+        return (*self.pronosticar_matriz(matriz, modelo), nombres)
+
+
+def probar_pronosticos():
+    """
+    Función para probar el pronosticador de tendencias.
+    """
+    print("🔮 Probando Pronosticador de Tendencias de CLARIO...")
+    print("=" * 60)
+
+    pronosticador = PronosticadorTendencias(horizonte=7)
+
+    datos = pd.DataFrame({
+        'fecha': np.tile(pd.date_range('2024-01-01', periods=60, freq='D'), 2),
+        'tendencia': ['Streetwear'] * 60 + ['Vintage'] * 60,
+        'popularidad': np.r_[np.linspace(60, 90, 60), 70 + 10 * np.sin(np.arange(60) * 2 * np.pi / 7)],
+    })
+    for modelo in MODELOS_DISPONIBLES:
+        print(f"📈 Modelo {modelo}:")
+        resultado = pronosticador.pronosticar(datos, modelo).groupby('tendencia').head(2)
+        print(resultado.round({'pronostico': 1, 'limite_inferior': 1, 'limite_superior': 1}).to_string(index=False))
+        print()
+
+    # Rendimiento: muchas series a la vez
+    generador = np.random.default_rng(0)
+    matriz = 70 + generador.normal(0, 5, (100_000, 90)).cumsum(axis=1) / 10
+    for modelo in MODELOS_DISPONIBLES:
+        inicio = time.perf_counter()
+        pronosticador.pronosticar_matriz(matriz, modelo)
+        print(f"⚡ {modelo}: {len(matriz)} series en {time.perf_counter() - inicio:.2f}s")
+
+    print("🎯 Pronosticador probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_pronosticos()
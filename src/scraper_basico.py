@@ -35,6 +35,10 @@ class ScraperBasico:
             "Instagram",
             "Noticias"
         ]
+        # Fuentes que solo muestran su contenido después de ejecutar JavaScript
+        self.fuentes_con_javascript = ["Instagram"]
+        # Sesión HTTP reutilizable (mantiene las conexiones abiertas)
+        self.sesion = requests.Session()
     
     def obtener_fecha_actual(self):
         """
@@ -69,6 +73,34 @@ class ScraperBasico:
         time.sleep(2)  # Espera 2 segundos
         print(f"✅ Datos recolectados exitosamente de: {fuente}")
         return f"Datos de {fuente} - {self.obtener_fecha_actual()}"
+    
+    def recolectar_paginas(self, fuente, urls, pool_navegadores=None):
+        """
+        Función que descarga páginas reales de una fuente.
+        
+        Las fuentes que necesitan JavaScript (como Instagram) se descargan
+        con un PoolNavegadores ya abierto; el resto con una simple petición HTTP.
+        Devuelve una lista de páginas (diccionarios con 'html', 'fuente',
+        'fecha', 'url' y 'error'). Si una URL falla, el resto se descarga
+        igual: esa página queda con html vacío y el motivo en 'error'
+        (None en las que salieron bien), por los dos caminos.
+        """
+        if fuente in self.fuentes_con_javascript:
+            if pool_navegadores is None:
+                raise ValueError(f"La fuente '{fuente}' necesita un PoolNavegadores")
+            return pool_navegadores.recolectar(urls, fuente)
+        
+        fecha = datetime.now().strftime('%Y-%m-%d')
+        paginas = []
+        for url in urls:
+            try:
+                respuesta = self.sesion.get(url, timeout=30)
+                respuesta.raise_for_status()
+                paginas.append({'html': respuesta.text, 'fuente': fuente, 'fecha': fecha, 'url': url, 'error': None})
+            except requests.RequestException as e:
+                paginas.append({'html': '', 'fuente': fuente, 'fecha': fecha, 'url': url,
+                                'error': f"{type(e).__name__}: {e}"})
+        return paginas
 
 def probar_scraper():
     """
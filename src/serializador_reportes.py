@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Serialización de Reportes
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para guardar reportes en JSON respetando los tipos de NumPy y pandas
+"""
+
+# Importar módulos necesarios
+import gzip
+import json
+import math
+from json import encoder as codificador_json
+
+import numpy as np
+import pandas as pd
+
+
+def a_tipo_nativo(valor):
+    """
+    Función que convierte valores de NumPy/pandas a tipos nativos de Python.
+
+    ¿Por qué hace falta? El módulo json no sabe qué es un "numpy.int64".
+    Con default=str lo guardaba como texto ("-15" en vez de -15).
+    Las fechas se guardan en formato ISO y cualquier otro tipo, como texto.
+    """
+    if valor is pd.NaT or valor is pd.NA:
+        return None
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return None if not np.isfinite(valor) else float(valor)
+    if isinstance(valor, np.bool_):
+        return bool(valor)
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(valor).isoformat()
+    if isinstance(valor, pd.Series):
+        return valor.to_dict()
+    if isinstance(valor, pd.DataFrame):
+        return valor.to_dict(orient='records')
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()  # datetime, date y time de Python
+    return str(valor)
+
+
+def _numero_o_null(valor, _repr=float.__repr__):
+    """
+    Escribe un float como lo hace json, pero NaN e infinito como null.
+    """
+    return _repr(valor) if math.isfinite(valor) else 'null'
+
+
+class CodificadorReporte(json.JSONEncoder):
+    """
+    Codificador JSON que entiende escalares y arreglos de NumPy y pandas.
+
+    NaN e infinito (también los float64 de NumPy, que json trata como
+    float común) se escriben como null: json los escribiría como NaN e
+    Infinity, que no es JSON válido y muchos lectores no aceptan.
+
+    Primero se intenta el codificador rápido de json (escrito en C), que
+    avisa con un error si encuentra NaN o infinito; solo en ese caso se
+    vuelve a codificar con la versión en Python que los cambia por null.
+    No se recorre ni se copia el reporte antes de codificarlo.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs['allow_nan'] = False
+        super().__init__(*args, **kwargs)
+
+    def default(self, valor):
+        return a_tipo_nativo(valor)
+
+    def iterencode(self, valor, _one_shot=False):
+        if _one_shot and self.indent is None and codificador_json.c_make_encoder is not None:
+            try:
+                return super().iterencode(valor, _one_shot)
+            except ValueError:
+                pass  # había NaN o infinito: se usa la versión en Python
+        escapar = codificador_json.encode_basestring_ascii if self.ensure_ascii else codificador_json.encode_basestring
+        iterador = codificador_json._make_iterencode(
+            {} if self.check_circular else None, self.default, escapar, self.indent, _numero_o_null,
+            self.key_separator, self.item_separator, self.sort_keys, self.skipkeys, _one_shot,
+        )
+        return iterador(valor, 0)
+
+
+def guardar_json(reporte, ruta_archivo, compacto=False):
+    """
+    Función que guarda un reporte completo como un único documento JSON.
+
+    Con compacto=True no se agregan sangrías ni espacios (más rápido y liviano).
+    """
+    opciones = {'separators': (',', ':')} if compacto else {'indent': 2}
+    with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        json.dump(reporte, f, ensure_ascii=False, cls=CodificadorReporte, **opciones)
+    return ruta_archivo
+
+
+class EscritorReporte:
+    """
+    Clase que escribe un reporte en formato JSON Lines, línea por línea.
+
+    ¿Qué es "JSON Lines"? Es un archivo donde cada línea es un JSON
+    independiente. Así un reporte con 100.000 tendencias se escribe a
+    medida que se calcula, sin armar nunca un diccionario gigante.
+
+    Si la ruta termina en ".gz" el archivo se comprime con gzip.
+    """
+
+    def __init__(self, ruta_archivo):
+        """
+        Constructor de la clase EscritorReporte.
+        """
+        self.ruta_archivo = ruta_archivo
+        self.lineas_escritas = 0
+        self._codificador = CodificadorReporte(ensure_ascii=False, separators=(',', ':'))
+        self._archivo = None
+
+    def __enter__(self):
+        if self.ruta_archivo.endswith('.gz'):
+            self._archivo = gzip.open(self.ruta_archivo, 'wt', encoding='utf-8')
+        else:
+            self._archivo = open(self.ruta_archivo, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, *exc):
+        self._archivo.close()
+        return False
+
+    def _escribir_linea(self, registro):
+        self._archivo.write(self._codificador.encode(registro))
+        self._archivo.write('\n')
+        self.lineas_escritas += 1
+
+    def escribir_valor(self, seccion, valor):
+        """
+        Escribe una sección completa (por ejemplo, la lista de insights) en una línea.
+        """
+        self._escribir_linea({'seccion': seccion, 'valor': valor})
+
+    def escribir_seccion(self, seccion, pares):
+        """
+        Escribe una sección con una línea por cada par (clave, valor).
+
+        pares puede ser un generador: solo se mantiene en memoria una línea a la vez.
+        """
+        for clave, valor in pares:
+            self._escribir_linea({'seccion': seccion, 'clave': clave, 'valor': valor})
+
+
+def leer_reporte_jsonl(ruta_archivo):
+    """
+    Función que reconstruye un reporte JSON Lines como diccionario.
+    """
+    abrir = gzip.open if ruta_archivo.endswith('.gz') else open
+    reporte = {}
+    with abrir(ruta_archivo, 'rt', encoding='utf-8') as f:
+        for linea in f:
+            registro = json.loads(linea)
+            if 'clave' in registro:
+                reporte.setdefault(registro['seccion'], {})[registro['clave']] = registro['valor']
+            else:
+                reporte[registro['seccion']] = registro['valor']
+    return reporte
+
+
+def probar_serializador():
+    """
+    Función para probar la serialización de reportes.
+    """
+    print("💾 Probando Serializador de Reportes de CLARIO...")
+    print("=" * 60)
+
+    reporte = {
+        'crecimiento_absoluto': np.int64(-15),
+        'mes_mas_popular': np.int32(1),
+        'popularidad': np.array([85, 72, 91]),
+        'fecha': pd.Timestamp('2024-01-01'),
+    }
+    print(json.dumps(reporte, cls=CodificadorReporte))
+
+    ruta = guardar_json(reporte, "data/reporte_prueba.json", compacto=True)
+    print(f"✅ Reporte compacto guardado en: {ruta}")
+
+    with EscritorReporte("data/reporte_prueba.jsonl.gz") as escritor:
+        escritor.escribir_seccion('analisis_crecimiento', ((f"tendencia_{i}", {'crecimiento_absoluto': np.int64(i)}) for i in range(5)))
+    print(f"✅ {escritor.lineas_escritas} líneas escritas en: {escritor.ruta_archivo}")
+    print(leer_reporte_jsonl(escritor.ruta_archivo))
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_serializador()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLARIO - Módulo de Conteo Aproximado de Menciones
+Autor: Tu Nombre
+Fecha: 2024
+Descripción: Módulo para encontrar las tendencias más mencionadas con memoria acotada
+"""
+
+# Importar módulos necesarios
+import copy
+import hashlib
+import heapq
+import itertools
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def _hashes(claves):
+    """
+    Calcula dos hashes de 64 bits por clave (para el doble hashing).
+    """
+    digestos = b''.join(hashlib.blake2b(str(clave).encode('utf-8'), digest_size=16).digest() for clave in claves)
+    valores = np.frombuffer(digestos, dtype=np.uint64).reshape(-1, 2)
+    return valores[:, 0:1], valores[:, 1:2] | np.uint64(1)
+
+
+class CountMinSketch:
+    """
+    Clase que cuenta cuántas veces aparece cada clave, de forma aproximada.
+
+    ¿Qué es un "Count-Min Sketch"? Es una tabla chica de contadores.
+    Cada clave suma en una casilla por fila, y para saber cuánto vale
+    se toma el mínimo de sus casillas. Nunca cuenta de menos, y cuenta
+    de más como máximo epsilon × total, con probabilidad 1 - delta.
+    La memoria no depende de cuántas claves distintas haya.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        """
+        Constructor de la clase CountMinSketch.
+        """
+        self.epsilon = epsilon
+        self.delta = delta
+        self.ancho = int(math.ceil(math.e / epsilon))
+        self.profundidad = int(math.ceil(math.log(1 / delta)))
+        self.tabla = np.zeros((self.profundidad, self.ancho), dtype=np.int64)
+        self.total = 0
+        self._filas = np.arange(self.profundidad, dtype=np.uint64)
+
+    def _columnas(self, claves):
+        hash_1, hash_2 = _hashes(claves)
+        return ((hash_1 + self._filas * hash_2) % np.uint64(self.ancho)).astype(np.int64)
+
+    def agregar_lote(self, claves, cantidades):
+        """
+        Función que suma las cantidades de muchas claves de una sola vez.
+        """
+        columnas = self._columnas(claves)
+        cantidades = np.asarray(cantidades, dtype=np.int64)
+        for fila in range(self.profundidad):
+            np.add.at(self.tabla[fila], columnas[:, fila], cantidades)
+        self.total += int(cantidades.sum())
+
+    def estimar(self, claves):
+        """
+        Función que estima la cantidad de cada clave.
+        """
+        columnas = self._columnas(claves)
+        return self.tabla[np.arange(self.profundidad), columnas].min(axis=1)
+
+    def combinar(self, otro):
+        """
+        Función que suma otro sketch con la misma configuración a este.
+        """
+        if self.tabla.shape != otro.tabla.shape:
+            raise ValueError("Solo se pueden combinar sketches con el mismo epsilon y delta")
+        self.tabla += otro.tabla
+        self.total += otro.total
+        return self
+
+
+class SpaceSaving:
+    """
+    Clase que sigue a las k claves más frecuentes con solo k contadores.
+
+    ¿Cómo funciona? Guarda k candidatos. Cuando llega una clave nueva y
+    no hay lugar, reemplaza al candidato con menor cuenta y hereda su
+    cuenta como "error" máximo. Toda clave que aparezca más de total/k
+    veces está garantizada en la lista.
+
+    Para encontrar rápido al candidato con menor cuenta se usa un
+    montículo (heapq): cada cambio de cuenta agrega una entrada nueva y
+    las viejas se descartan cuando llegan a la punta. Así cada reemplazo
+    cuesta O(log k) en lugar de recorrer los k contadores.
+    """
+
+    def __init__(self, k=100):
+        """
+        Constructor de la clase SpaceSaving.
+        """
+        self.k = k
+        self.contadores = {}  # clave -> [cuenta, error]
+        self._monticulo = []  # (cuenta, orden, clave); puede tener entradas viejas
+        self._orden = itertools.count()
+
+    def _anotar(self, clave):
+        heapq.heappush(self._monticulo, (self.contadores[clave][0], next(self._orden), clave))
+        if len(self._monticulo) > 4 * self.k:
+            self._rehacer_monticulo()
+
+    def _rehacer_monticulo(self):
+        self._monticulo = [(cuenta, next(self._orden), clave) for clave, (cuenta, _) in self.contadores.items()]
+        heapq.heapify(self._monticulo)
+
+    def _punta(self):
+        # Descartar entradas de claves que ya no están o cuya cuenta cambió
+        while True:
+            cuenta, _, clave = self._monticulo[0]
+            actual = self.contadores.get(clave)
+            if actual is not None and actual[0] == cuenta:
+                return cuenta, clave
+            heapq.heappop(self._monticulo)
+
+    def agregar(self, clave, cantidad=1):
+        if clave in self.contadores:
+            self.contadores[clave][0] += cantidad
+        elif len(self.contadores) < self.k:
+            self.contadores[clave] = [cantidad, 0]
+        else:
+            cuenta_minima, clave_minima = self._punta()
+            heapq.heappop(self._monticulo)
+            del self.contadores[clave_minima]
+            self.contadores[clave] = [cuenta_minima + cantidad, cuenta_minima]
+        self._anotar(clave)
+
+    def minimo(self):
+        if len(self.contadores) < self.k:
+            return 0
+        return self._punta()[0]
+
+    def combinar(self, otro):
+        """
+        Función que une dos resúmenes (de otro proceso o de otra ventana).
+
+        Una clave que falta en un resumen pudo valer hasta el mínimo de ese
+        resumen; se suma ese valor como cuenta y como error.
+        """
+        minimo_propio, minimo_otro = self.minimo(), otro.minimo()
+        combinados = {}
+        for clave in set(self.contadores) | set(otro.contadores):
+            cuenta_1, error_1 = self.contadores.get(clave, (minimo_propio, minimo_propio))
+            cuenta_2, error_2 = otro.contadores.get(clave, (minimo_otro, minimo_otro))
+            combinados[clave] = [cuenta_1 + cuenta_2, error_1 + error_2]
+        mejores = sorted(combinados.items(), key=lambda par: par[1][0], reverse=True)[:self.k]
+        self.contadores = dict(mejores)
+        self._rehacer_monticulo()
+        return self
+
+
+class TopKTendencias:
+    """
+    Clase que combina Count-Min (cuánto) y Space-Saving (quiénes) para
+    obtener las k tendencias más mencionadas de un flujo.
+    """
+
+    def __init__(self, k=100, epsilon=0.001, delta=0.01):
+        """
+        Constructor de la clase TopKTendencias.
+        """
+        self.k = k
+        self.conteo = CountMinSketch(epsilon, delta)
+        self.candidatos = SpaceSaving(k)
+
+    def agregar_lote(self, claves, cantidades):
+        claves = list(claves)
+        cantidades = list(cantidades)
+        self.conteo.agregar_lote(claves, cantidades)
+        for clave, cantidad in zip(claves, cantidades):
+            self.candidatos.agregar(clave, int(cantidad))
+
+    def combinar(self, otro):
+        self.conteo.combinar(otro.conteo)
+        self.candidatos.combinar(otro.candidatos)
+        return self
+
+    def top(self, n=None):
+        """
+        Función que devuelve [(tendencia, menciones_estimadas, error_maximo)]
+        ordenado de mayor a menor.
+        """
+        claves = list(self.candidatos.contadores)
+        if not claves:
+            return []
+        estimaciones = self.conteo.estimar(claves)
+        error_maximo = int(math.ceil(self.conteo.epsilon * self.conteo.total))
+        resultado = sorted(zip(claves, estimaciones.tolist()), key=lambda par: par[1], reverse=True)
+        return [(clave, cuenta, error_maximo) for clave, cuenta in resultado[:n or self.k]]
+
+
+class ContadorMenciones:
+    """
+    Clase que mantiene un TopKTendencias por fuente y ventana de tiempo.
+
+    Los contadores de distintos procesos o de ventanas pasadas se pueden
+    combinar para responder, por ejemplo, "top 10 de Twitter este mes".
+
+    Cada sketch ocupa unos 100 KB, así que no se guarda uno por hora para
+    siempre: las ventanas más viejas que horas_detalle se juntan en una
+    por día, y los días más viejos que dias_retencion se descartan
+    (None = no descartar nunca). En la parte compactada solo se puede
+    consultar por días completos: top_k rechaza un desde/hasta que no
+    sea medianoche ahí, en lugar de contar el día entero sin avisar.
+    """
+
+    def __init__(self, k=100, epsilon=0.001, delta=0.01, minutos_ventana=60,
+                 horas_detalle=48, dias_retencion=90):
+        """
+        Constructor de la clase ContadorMenciones.
+        """
+        self.k = k
+        self.epsilon = epsilon
+        self.delta = delta
+        self.minutos_ventana = minutos_ventana
+        self.horas_detalle = horas_detalle
+        self.dias_retencion = dias_retencion
+        self.sketches = {}  # (fuente, inicio_ventana) -> TopKTendencias
+        self.compactado_hasta = None  # antes de este momento solo hay un sketch por día
+
+    def _sketch(self, clave):
+        if clave not in self.sketches:
+            self.sketches[clave] = TopKTendencias(self.k, self.epsilon, self.delta)
+        return self.sketches[clave]
+
+    def registrar_lote(self, datos):
+        """
+        Función que cuenta las menciones de un lote (DataFrame con
+        'tendencia', 'fuente' y 'fecha'; 'menciones' es opcional).
+
+        Primero se agrupa el lote, así cada sketch recibe una suma por tendencia.
+        """
+        lote = pd.DataFrame({
+            'tendencia': datos['tendencia'],
+            'fuente': datos['fuente'],
+            'ventana': pd.to_datetime(datos['fecha']).dt.floor(f'{self.minutos_ventana}min'),
+            'menciones': datos['menciones'] if 'menciones' in datos else 1,
+        })
+        sumas = lote.groupby(['fuente', 'ventana', 'tendencia'], observed=True)['menciones'].sum()
+        for (fuente, ventana), grupo in sumas.groupby(level=['fuente', 'ventana'], observed=True):
+            self._sketch((fuente, ventana)).agregar_lote(
+                grupo.index.get_level_values('tendencia'), grupo.values
+            )
+        self.compactar()
+
+    def combinar(self, otro):
+        """
+        Función que incorpora los sketches de otro contador (por ejemplo, de otro proceso).
+
+        Se guardan copias: si el otro contador sigue contando, este no cambia.
+        """
+        for clave, sketch in otro.sketches.items():
+            if clave in self.sketches:
+                self.sketches[clave].combinar(sketch)
+            else:
+                self.sketches[clave] = copy.deepcopy(sketch)
+        self.compactar()
+        return self
+
+    def compactar(self):
+        """
+        Función que junta las ventanas viejas en una por día y borra las vencidas.
+
+        Se toma como "ahora" la ventana más reciente registrada (no el reloj),
+        así se puede reprocesar un historial viejo con el mismo resultado.
+        """
+        if not self.sketches:
+            return
+        ultima = max(ventana for _, ventana in self.sketches)
+        limite_detalle = None if self.horas_detalle is None else ultima - pd.Timedelta(hours=self.horas_detalle)
+        limite_retencion = None if self.dias_retencion is None else ultima.floor('D') - pd.Timedelta(days=self.dias_retencion)
+        if limite_detalle is not None and (self.compactado_hasta is None or limite_detalle > self.compactado_hasta):
+            self.compactado_hasta = limite_detalle
+
+        for fuente, ventana in list(self.sketches):
+            if limite_retencion is not None and ventana < limite_retencion:
+                del self.sketches[(fuente, ventana)]
+            elif limite_detalle is not None and ventana < limite_detalle:
+                dia = ventana.floor('D')
+                if dia != ventana:
+                    sketch = self.sketches.pop((fuente, ventana))
+                    if (fuente, dia) in self.sketches:
+                        self.sketches[(fuente, dia)].combinar(sketch)
+                    else:
+                        self.sketches[(fuente, dia)] = sketch
+
+    def top_k(self, n=10, fuente=None, desde=None, hasta=None):
+        """
+        Función que devuelve las n tendencias más mencionadas, filtrando
+        opcionalmente por fuente y por rango de ventanas.
+        """
+        for limite in (desde, hasta):
+            if limite is None or self.compactado_hasta is None:
+                continue
+            limite = pd.Timestamp(limite)
+            if limite < self.compactado_hasta and limite != limite.floor('D'):
+                raise ValueError(f"Antes de {self.compactado_hasta} los datos están compactados por día: "
+                                 f"el desde/hasta tiene que ser a medianoche (se recibió {limite})")
+        total = TopKTendencias(self.k, self.epsilon, self.delta)
+        for (fuente_sketch, ventana), sketch in self.sketches.items():
+            if fuente is not None and fuente_sketch != fuente:
+                continue
+            if desde is not None and ventana < pd.Timestamp(desde):
+                continue
+            if hasta is not None and ventana >= pd.Timestamp(hasta):
+                continue
+            total.combinar(sketch)
+        return total.top(n)
+
+
+def probar_sketches():
+    """
+    Función para probar el conteo aproximado de menciones.
+    """
+    print("📡 Probando Conteo Aproximado de Menciones de CLARIO...")
+    print("=" * 60)
+
+    # Flujo simulado: pocas tendencias muy mencionadas y muchísimos hashtags raros
+    generador = np.random.default_rng(42)
+    cantidad = 200_000
+    populares = np.array(['Streetwear', 'Vintage', 'Minimalista', 'Deportivo'])
+    raros = np.char.add('hashtag_', generador.integers(0, 100_000, cantidad).astype(str))
+    tendencias = np.where(generador.random(cantidad) < 0.3, populares[generador.integers(0, 4, cantidad)], raros)
+    datos = pd.DataFrame({
+        'tendencia': tendencias,
+        'fuente': generador.choice(['Twitter', 'Instagram'], cantidad),
+        'fecha': datetime(2024, 1, 1) + pd.to_timedelta(generador.integers(0, 48 * 60, cantidad), unit='min'),
+    })
+
+    # Dos "procesos" cuentan la mitad cada uno y después se combinan
+    parte_1, parte_2 = ContadorMenciones(k=50), ContadorMenciones(k=50)
+    parte_1.registrar_lote(datos.iloc[:cantidad // 2])
+    parte_2.registrar_lote(datos.iloc[cantidad // 2:])
+    contador = parte_1.combinar(parte_2)
+
+    exacto = datos['tendencia'].value_counts()
+    print("🏆 Top 5 aproximado:")
+    for tendencia, menciones, error in contador.top_k(5):
+        print(f"   {tendencia}: {menciones} (±{error}, exacto: {exacto.get(tendencia, 0)})")
+    print("🐦 Top 3 en Twitter:", [tendencia for tendencia, _, _ in contador.top_k(3, fuente='Twitter')])
+
+    # Con 24 horas de detalle, el primer día queda en un solo sketch por fuente
+    compacto = ContadorMenciones(k=50, horas_detalle=24)
+    compacto.registrar_lote(datos)
+    print(f"🗜️ Sketches guardados: {len(contador.sketches)} por hora -> {len(compacto.sketches)} compactados")
+    print("🏆 Top 3 compactado:", [tendencia for tendencia, _, _ in compacto.top_k(3)])
+
+    print("🎯 Conteo aproximado probado exitosamente!")
+
+
+# Punto de entrada para pruebas
+if __name__ == "__main__":
+    probar_sketches()
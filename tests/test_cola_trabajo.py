@@ -0,0 +1,113 @@
+"""
+Pruebas de las colas de trabajo con los backends locales (en memoria y SQLite).
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.cola_trabajo import ColaEnMemoria, ColaSQLite, Trabajador
+
+
+@pytest.fixture(params=['memoria', 'sqlite'])
+def crear_cola(request, tmp_path):
+    def crear(**opciones):
+        if request.param == 'memoria':
+            return ColaEnMemoria(**opciones)
+        return ColaSQLite(str(tmp_path / 'cola.db'), **opciones)
+    return crear
+
+
+def test_encolar_la_misma_clave_no_duplica(crear_cola):
+    cola = crear_cola()
+    cola.encolar('sumar', {'a': 1}, clave='tarea-1')
+    cola.encolar('sumar', {'a': 2}, clave='tarea-1')
+    assert cola.contar()['pendiente'] == 1
+    assert cola.reclamar('w').carga == {'a': 1}
+
+
+def test_alquiler_vencido_se_vuelve_a_dar(crear_cola):
+    cola = crear_cola()
+    cola.encolar('sumar', {}, clave='t')
+    primera = cola.reclamar('caido', segundos_alquiler=0.05)
+    assert cola.reclamar('otro') is None  # todavía alquilada
+    time.sleep(0.1)
+
+    segunda = cola.reclamar('otro')
+    assert segunda.id == 't' and segunda.intentos == 2
+    # El trabajador caído ya no puede completar con su token viejo
+    assert not cola.completar(primera, 'tarde')
+    assert cola.completar(segunda, 'ok')
+    assert cola.completar(segunda, 'otra vez') is False
+    assert cola.resultados() == {'t': 'ok'}
+
+
+def test_alquiler_vencido_en_el_ultimo_intento_queda_fallida(crear_cola):
+    cola = crear_cola(max_intentos=2)
+    cola.encolar('sumar', {}, clave='t')
+    for _ in range(2):
+        assert cola.reclamar('caido', segundos_alquiler=0.01) is not None
+        time.sleep(0.03)
+
+    assert cola.reclamar('otro') is None
+    assert cola.contar() == {'pendiente': 0, 'en_curso': 0, 'completada': 0, 'fallida': 1}
+    assert cola.vacia()
+
+
+def test_fallas_se_reintentan_hasta_max_intentos(crear_cola):
+    cola = crear_cola(max_intentos=3, segundos_espera_reintento=0.01)
+    cola.encolar('romper', {}, clave='t')
+    intentos = []
+    while not cola.vacia():
+        tarea = cola.reclamar('w')
+        if tarea is None:
+            time.sleep(0.01)
+            continue
+        intentos.append(tarea.intentos)
+        assert cola.fallar(tarea, 'se rompió')
+
+    assert intentos == [1, 2, 3]
+    assert cola.contar()['fallida'] == 1
+
+
+def test_reclamos_concurrentes_no_repiten_tareas(crear_cola):
+    cola = crear_cola()
+    for i in range(200):
+        cola.encolar('sumar', {'n': i}, clave=f"t{i}")
+
+    reclamadas = []
+    bloqueo = threading.Lock()
+
+    def trabajar(nombre):
+        while True:
+            tarea = cola.reclamar(nombre)
+            if tarea is None:
+                return
+            with bloqueo:
+                reclamadas.append(tarea.id)
+            cola.completar(tarea, tarea.carga['n'] * 2)
+
+    hilos = [threading.Thread(target=trabajar, args=(f"w{i}",)) for i in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert sorted(reclamadas) == sorted(f"t{i}" for i in range(200))
+    assert cola.contar()['completada'] == 200
+    assert sum(cola.resultados('sumar').values()) == sum(range(200)) * 2
+
+
+def test_trabajador_usa_el_manejador_de_cada_tipo(crear_cola):
+    cola = crear_cola(max_intentos=1)
+    cola.encolar('doble', {'n': 4}, clave='a')
+    cola.encolar('romper', {}, clave='b')
+
+    def romper(carga):
+        raise RuntimeError("falla a propósito")
+
+    hechas = Trabajador(cola, {'doble': lambda carga: carga['n'] * 2, 'romper': romper}).ejecutar()
+    assert hechas == 1
+    assert cola.resultados() == {'a': 8}
+    assert cola.contar()['fallida'] == 1
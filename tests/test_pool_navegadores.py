@@ -0,0 +1,149 @@
+"""
+Pruebas del pool de navegadores y de ScraperBasico.recolectar_paginas.
+
+No abren un Chrome de verdad: un navegador falso lee páginas estáticas
+de una carpeta temporal (servidas también por HTTP para el camino sin JavaScript).
+"""
+
+import functools
+import http.server
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from src.pool_navegadores import PoolNavegadores, SesionNavegador
+from src.scraper_basico import ScraperBasico
+
+
+class NavegadorFalso:
+    """
+    Navegador que "carga" archivos locales; falla con las URLs que contienen 'roto'.
+    """
+
+    def __init__(self, registro, pid=None):
+        self.registro = registro
+        self.page_source = ''
+        self.cerrado = False
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=pid)) if pid else None
+        registro['abiertos'] += 1
+
+    def set_page_load_timeout(self, segundos):
+        pass
+
+    def get(self, url):
+        if 'roto' in url:
+            raise WebDriverException(f"no se pudo cargar {url}")
+        with open(url, encoding='utf-8') as f:
+            self.page_source = f.read()
+
+    def quit(self):
+        self.cerrado = True
+        self.registro['cerrados'] += 1
+
+
+@pytest.fixture
+def paginas(tmp_path):
+    rutas = []
+    for i in range(6):
+        ruta = tmp_path / f"pagina_{i}.html"
+        ruta.write_text(f'<html><body><article><p>Post {i} #Streetwear</p></article></body></html>', encoding='utf-8')
+        rutas.append(str(ruta))
+    return rutas
+
+
+@pytest.fixture
+def registro():
+    return {'abiertos': 0, 'cerrados': 0}
+
+
+def test_recicla_despues_de_max_paginas(paginas, registro):
+    with PoolNavegadores(tamano=1, max_paginas=2, crear_navegador=lambda: NavegadorFalso(registro)) as pool:
+        resultado = pool.recolectar(paginas, 'Instagram')
+
+    assert [pagina['error'] for pagina in resultado] == [None] * 6
+    assert 'Post 5' in resultado[5]['html']
+    # 6 páginas de a 2 por navegador: se recicla 3 veces
+    assert pool.sesiones_recicladas == 3
+    assert registro['abiertos'] == 4
+    assert registro['cerrados'] == 4
+
+
+def test_recicla_cuando_crece_la_memoria(paginas, registro, monkeypatch):
+    memorias = iter([100, 100, 700, 100, 100, 100, 100, 100])
+    monkeypatch.setattr(SesionNavegador, 'memoria_mb', lambda self: next(memorias))
+    with PoolNavegadores(tamano=1, max_paginas=100, limite_crecimiento_mb=512,
+                         crear_navegador=lambda: NavegadorFalso(registro)) as pool:
+        pool.recolectar(paginas[:3], 'Instagram')
+
+    # Solo la segunda página supera el crecimiento permitido (700 - 100 > 512)
+    assert pool.sesiones_recicladas == 1
+
+
+def test_memoria_se_mide_en_el_proceso_del_driver(registro):
+    sesion = SesionNavegador(NavegadorFalso(registro, pid=os.getpid()))
+    assert sesion.memoria_mb() > 0
+    assert SesionNavegador(NavegadorFalso(registro)).memoria_mb() == 0
+
+
+def test_una_url_rota_no_afecta_a_las_demas(paginas, registro):
+    urls = paginas[:2] + ['/no/existe/roto.html'] + paginas[2:4]
+    with PoolNavegadores(tamano=2, crear_navegador=lambda: NavegadorFalso(registro)) as pool:
+        resultado = pool.recolectar(urls, 'Instagram')
+        # El navegador que falló se reemplazó: el pool sigue completo
+        assert pool._cola.qsize() == 2
+
+    errores = [pagina['error'] for pagina in resultado]
+    assert errores[2].startswith('WebDriverException')
+    assert resultado[2]['html'] == ''
+    assert errores[:2] + errores[3:] == [None] * 4
+    assert pool.sesiones_recicladas == 1
+
+
+def test_el_pool_no_se_achica_si_falla_el_reciclado(paginas, registro):
+    fallas = {'restantes': 0}
+
+    def crear():
+        if fallas['restantes']:
+            fallas['restantes'] -= 1
+            raise WebDriverException("Chrome no arrancó")
+        return NavegadorFalso(registro)
+
+    with PoolNavegadores(tamano=1, max_paginas=1, crear_navegador=crear) as pool:
+        fallas['restantes'] = 3  # los 3 intentos de reciclar fallan: queda un lugar vacío
+        primera = pool.recolectar(paginas[:1], 'Instagram')
+        assert pool._cola.qsize() == 1
+        segunda = pool.recolectar(paginas[1:3], 'Instagram')
+
+    assert primera[0]['error'] is None
+    assert [pagina['error'] for pagina in segunda] == [None, None]
+
+
+@pytest.fixture
+def servidor(tmp_path, paginas):
+    manejador = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(tmp_path))
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_port}"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_recolectar_paginas_por_http_y_por_pool_devuelven_lo_mismo(servidor, paginas, registro):
+    scraper = ScraperBasico()
+    por_http = scraper.recolectar_paginas('Twitter', [f"{servidor}/pagina_0.html", f"{servidor}/no_existe.html"])
+    with PoolNavegadores(tamano=1, crear_navegador=lambda: NavegadorFalso(registro)) as pool:
+        por_pool = scraper.recolectar_paginas('Instagram', [paginas[0], '/no/existe/roto.html'], pool)
+
+    for resultado in (por_http, por_pool):
+        assert [set(pagina) for pagina in resultado] == [{'html', 'fuente', 'fecha', 'url', 'error'}] * 2
+        assert 'Post 0' in resultado[0]['html'] and resultado[0]['error'] is None
+        assert resultado[1]['html'] == '' and resultado[1]['error']
+    assert por_http[1]['error'].startswith('HTTPError')
+
+
+def test_fuente_con_javascript_sin_pool():
+    with pytest.raises(ValueError):
+        ScraperBasico().recolectar_paginas('Instagram', ['http://127.0.0.1/'])